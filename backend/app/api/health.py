@@ -0,0 +1,32 @@
+"""Liveness and readiness probes, answered from memory."""
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.services.health_service import OK, health_monitor
+
+router = APIRouter()
+
+
+@router.get("/health/live")
+async def live():
+    """The process is up and its event loop is answering."""
+    return {"status": "alive"}
+
+
+@router.get("/health/ready")
+async def ready():
+    """Cached dependency status; 503 while a critical dependency is failing."""
+    is_ready, report = health_monitor.readiness()
+    return JSONResponse(report, status_code=200 if is_ready else 503)
+
+
+@router.get("/health")
+async def health_check():
+    """Summary kept for existing monitors; served from the cached checks."""
+    is_ready, _ = health_monitor.readiness()
+    supabase = health_monitor.status("supabase")
+    return {
+        "status": "healthy" if is_ready else "unhealthy",
+        "supabase": "connected" if supabase == OK else (supabase or "unknown"),
+    }
@@ -0,0 +1,126 @@
+"""Prometheus scrape endpoint and the collectors it reports."""
+
+from fastapi import APIRouter, Response
+
+from app.infrastructure.geo_index import geo_index
+from app.infrastructure.github_scheduler import github_scheduler
+from app.infrastructure.leaderboard import leaderboard
+from app.infrastructure.metrics import registry
+from app.infrastructure.seen_set import seen_set
+from app.services.chat_hub import chat_hub
+from app.services.chat_service import ChatService, message_writer
+from app.services.health_service import CHECKS, OK, health_monitor
+from app.services.matching_service import pool_refresh_queue
+from app.services.profile_service import enrichment_queue, profile_cache
+from app.services.swipe_service import like_index, swipe_writer
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_QUEUES = (enrichment_queue, pool_refresh_queue)
+_WRITERS = (swipe_writer, message_writer)
+
+
+def _cache_lookups():
+    yield "devdate_cache_lookups_total", {"cache": "profiles", "result": "hit"}, profile_cache.hits
+    yield "devdate_cache_lookups_total", {"cache": "profiles", "result": "miss"}, profile_cache.misses
+    stats = ChatService.participant_cache_stats()
+    yield "devdate_cache_lookups_total", {"cache": "chat_participants", "result": "hit"}, stats["hits"]
+    yield "devdate_cache_lookups_total", {"cache": "chat_participants", "result": "miss"}, stats["misses"]
+    stats = geo_index.stats()
+    yield "devdate_cache_lookups_total", {"cache": "geo_index", "result": "hit"}, stats["hits"]
+    yield "devdate_cache_lookups_total", {"cache": "geo_index", "result": "miss"}, stats["misses"]
+
+
+def _queue_depths():
+    for queue in _QUEUES:
+        yield "devdate_queue_depth", {"queue": queue.name}, queue.depth
+    for writer in _WRITERS:
+        yield "devdate_queue_depth", {"queue": f"{writer.name}-writer"}, writer.depth()
+
+
+def _writer_rows():
+    for writer in _WRITERS:
+        yield "devdate_batch_writer_rows_total", {"writer": writer.name, "result": "flushed"}, writer.flushed_rows
+        yield "devdate_batch_writer_rows_total", {"writer": writer.name, "result": "failed"}, writer.failed_rows
+
+
+def _in_memory_state():
+    chat = chat_hub.metrics()
+    geo = geo_index.stats()
+    yield "devdate_state", {"item": "chat_connections"}, chat["connections"]
+    yield "devdate_state", {"item": "chat_conversations"}, chat["conversations"]
+    yield "devdate_state", {"item": "chat_dropped_slow_consumers"}, chat["dropped_slow_consumers"]
+    yield "devdate_state", {"item": "geo_cells"}, geo["cells"]
+    yield "devdate_state", {"item": "geo_profiles"}, geo["profiles"]
+    yield "devdate_state", {"item": "leaderboard_profiles"}, len(leaderboard)
+    yield "devdate_state", {"item": "like_index_users"}, len(like_index)
+    yield "devdate_state", {"item": "seen_set_bytes"}, seen_set.memory_bytes()
+
+
+def _github_waiting():
+    for priority, depth in github_scheduler.metrics()["queue_depth"].items():
+        yield "devdate_github_scheduler_waiting", {"priority": priority}, depth
+
+
+def _github_granted():
+    for priority, granted in github_scheduler.metrics()["granted"].items():
+        yield "devdate_github_scheduler_granted_total", {"priority": priority}, granted
+
+
+def _github_rate_limited():
+    yield "devdate_github_rate_limited_total", {}, github_scheduler.rate_limited
+
+
+def _github_quota_remaining():
+    for credential in github_scheduler.metrics()["credentials"]:
+        yield "devdate_github_quota_remaining", {"credential": credential["label"]}, max(credential["remaining"], 0)
+
+
+def _github_quota_limit():
+    for credential in github_scheduler.metrics()["credentials"]:
+        yield "devdate_github_quota_limit", {"credential": credential["label"]}, credential["limit"]
+
+
+def _health_checks():
+    for name in CHECKS:
+        yield "devdate_health_check_ok", {"check": name}, int(health_monitor.status(name) == OK)
+
+
+registry.add_collector(
+    "devdate_cache_lookups_total", "counter", "Cache lookups by cache and result.", _cache_lookups
+)
+registry.add_collector("devdate_queue_depth", "gauge", "Items waiting in background queues.", _queue_depths)
+registry.add_collector(
+    "devdate_batch_writer_rows_total", "counter", "Rows written by batch writers.", _writer_rows
+)
+registry.add_collector("devdate_state", "gauge", "Sizes of in-process indexes and hubs.", _in_memory_state)
+registry.add_collector(
+    "devdate_github_scheduler_waiting", "gauge",
+    "Callers waiting for a GitHub credential, by priority.", _github_waiting,
+)
+registry.add_collector(
+    "devdate_github_scheduler_granted_total", "counter",
+    "GitHub credentials handed out, by priority.", _github_granted,
+)
+registry.add_collector(
+    "devdate_github_rate_limited_total", "counter",
+    "GitHub responses that were rate limited.", _github_rate_limited,
+)
+registry.add_collector(
+    "devdate_github_quota_remaining", "gauge",
+    "GitHub requests left in the current window, per credential.", _github_quota_remaining,
+)
+registry.add_collector(
+    "devdate_github_quota_limit", "gauge",
+    "GitHub rate limit per window, per credential.", _github_quota_limit,
+)
+registry.add_collector(
+    "devdate_health_check_ok", "gauge", "1 if the last background health check passed.", _health_checks
+)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(registry.render(), media_type=CONTENT_TYPE)
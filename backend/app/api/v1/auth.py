@@ -39,15 +39,12 @@ async def auth_callback(body: AuthCallbackRequest):
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    # Kick off GitHub enrichment in the background (non-blocking best-effort)
+    # Kick off GitHub enrichment in the background (retried by the job queue)
     user_info = session_data["user"]
-    try:
-        await ProfileService.enrich_from_github(
-            user_id=user_info["id"],
-            github_username=user_info["github_username"],
-        )
-    except Exception:
-        pass  # Non-critical: enrichment can retry later
+    ProfileService.enqueue_enrichment(
+        user_id=user_info["id"],
+        github_username=user_info["github_username"],
+    )
 
     return session_data
 
@@ -1,18 +1,112 @@
-from fastapi import APIRouter
+"""Chat API routes — REST history plus the real-time WebSocket."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, status
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+
+from app.core.config import settings
+from app.core.security import get_current_user, get_current_user_id
+from app.core.serialization import trusted_response
+from app.domain.schemas import (
+    ChatMessageCreateRequest,
+    ChatMessageResponse,
+    ConversationSummaryResponse,
+    MessagePageResponse,
+)
+from app.services.chat_hub import Connection
+from app.services.chat_service import ChatService
 
 router = APIRouter()
 
-@router.get("/conversations")
-async def get_conversations():
-    """Get all conversations for the user"""
-    return {"message": "Get conversations endpoint - to be implemented"}
 
-@router.get("/conversations/{conversation_id}/messages")
-async def get_messages(conversation_id: str):
-    """Get messages for a specific conversation"""
-    return {"message": f"Get messages for {conversation_id} - to be implemented"}
+@router.websocket("/ws")
+async def chat_socket(websocket: WebSocket, token: str | None = Query(default=None)):
+    """Real-time chat. Authenticates once, with `?token=` or a Bearer header.
+
+    Browsers can't set headers on WebSocket handshakes, hence the query
+    parameter; see ChatService for the frame protocol.
+    """
+    if token is None:
+        scheme, _, value = websocket.headers.get("authorization", "").partition(" ")
+        token = value if scheme.lower() == "bearer" and value else None
+    try:
+        if token is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        user = await get_current_user(
+            HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        )
+    except HTTPException as e:
+        unavailable = e.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        await websocket.close(
+            code=status.WS_1013_TRY_AGAIN_LATER
+            if unavailable
+            else status.WS_1008_POLICY_VIOLATION
+        )
+        return
+
+    expires_at = jwt.get_unverified_claims(token).get("exp")
+    await websocket.accept()
+    await ChatService.handle_socket(Connection(websocket, user["id"], expires_at=expires_at))
+
+
+@router.get("/conversations", response_model=list[ConversationSummaryResponse])
+async def get_conversations(
+    limit: int = Query(default=50, ge=1, le=200),
+    user_id: str = Depends(get_current_user_id),
+):
+    """Get the user's conversations with last-message previews and unread counts."""
+    conversations = await ChatService.list_conversations(user_id, limit=limit)
+    return trusted_response(ConversationSummaryResponse, conversations)
+
+
+@router.get(
+    "/conversations/{conversation_id}/messages", response_model=MessagePageResponse
+)
+async def get_messages(
+    conversation_id: str,
+    limit: int | None = Query(default=None, ge=1, le=settings.CHAT_HISTORY_MAX_PAGE_SIZE),
+    before: str | None = Query(default=None, description="older_cursor of a previous page"),
+    after: str | None = Query(default=None, description="newer_cursor of a previous page"),
+    user_id: str = Depends(get_current_user_id),
+):
+    """Get one page of history (latest first page), oldest message first."""
+    try:
+        items, older, newer = await ChatService.get_messages(
+            conversation_id, user_id, limit=limit, before=before, after=after
+        )
+    except PermissionError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return trusted_response(
+        MessagePageResponse, {"items": items, "older_cursor": older, "newer_cursor": newer}
+    )
+
+
+@router.post(
+    "/conversations/{conversation_id}/messages",
+    response_model=ChatMessageResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def send_message(
+    conversation_id: str,
+    body: ChatMessageCreateRequest,
+    user_id: str = Depends(get_current_user_id),
+):
+    """Send a message; returns once it is stored and delivered to live sockets."""
+    if not await ChatService.is_participant(conversation_id, user_id):
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return await ChatService.send_message(
+        conversation_id, user_id, body.content, body.client_id
+    )
+
 
-@router.post("/conversations/{conversation_id}/messages")
-async def send_message(conversation_id: str):
-    """Send a message in a conversation"""
-    return {"message": f"Send message to {conversation_id} - to be implemented"}
+@router.post(
+    "/conversations/{conversation_id}/read", status_code=status.HTTP_204_NO_CONTENT
+)
+async def mark_read(conversation_id: str, user_id: str = Depends(get_current_user_id)):
+    """Mark the conversation as read up to now (resets its unread count)."""
+    try:
+        await ChatService.mark_read(conversation_id, user_id)
+    except PermissionError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1,32 @@
+"""Leaderboard API routes."""
+
+from fastapi import APIRouter, Depends, Query
+
+from app.core.config import settings
+from app.core.security import get_current_user_id
+from app.core.serialization import trusted_response
+from app.domain.schemas import LeaderboardPositionResponse, LeaderboardResponse
+from app.services.leaderboard_service import LeaderboardService
+
+router = APIRouter()
+
+
+@router.get("/", response_model=LeaderboardResponse)
+async def get_leaderboard(
+    limit: int = Query(default=20, ge=1, le=settings.LEADERBOARD_MAX_PAGE_SIZE),
+    offset: int = Query(default=0, ge=0),
+    tech: str | None = Query(default=None, description="Rank within one technology"),
+):
+    """Top profiles by XP, globally or for one technology."""
+    return trusted_response(LeaderboardResponse, await LeaderboardService.top(limit, offset, tech))
+
+
+@router.get("/me", response_model=LeaderboardPositionResponse)
+async def get_my_position(
+    tech: str | None = Query(default=None, description="Rank within one technology"),
+    user_id: str = Depends(get_current_user_id),
+):
+    """The current user's position on the board."""
+    return trusted_response(
+        LeaderboardPositionResponse, await LeaderboardService.position(user_id, tech)
+    )
@@ -1,13 +1,33 @@
-from fastapi import APIRouter
+"""Match API routes."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.security import get_current_user_id
+from app.core.serialization import trusted_response
+from app.domain.schemas import MatchCandidateResponse, SwipeRequest, SwipeResponse
+from app.services.matching_service import MatchingService
+from app.services.swipe_service import SwipeService
 
 router = APIRouter()
 
-@router.get("/")
-async def get_matches():
-    """Get potential matches for the user"""
-    return {"message": "Get matches endpoint - to be implemented"}
 
-@router.post("/swipe")
-async def swipe():
-    """Swipe left or right on a profile"""
-    return {"message": "Swipe endpoint - to be implemented"}
+@router.get("/", response_model=list[MatchCandidateResponse])
+async def get_matches(
+    limit: int = Query(default=20, ge=1, le=100),
+    user_id: str = Depends(get_current_user_id),
+):
+    """Get potential matches for the user, best first."""
+    try:
+        matches = await MatchingService.get_matches(user_id, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return trusted_response(MatchCandidateResponse, matches)
+
+
+@router.post("/swipe", response_model=SwipeResponse)
+async def swipe(body: SwipeRequest, user_id: str = Depends(get_current_user_id)):
+    """Like or pass on a profile; `match` is set when the like is mutual."""
+    try:
+        return await SwipeService.swipe(user_id, body.target_id, body.direction)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
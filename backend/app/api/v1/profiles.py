@@ -1,22 +1,32 @@
 """Profile API routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import Literal, Optional
 
-from app.core.security import get_current_user, get_current_user_id
-from app.domain.schemas import ProfileResponse, ProfileUpdateRequest, MessageResponse
+from app.core.config import settings
+from app.core.http_cache import PRIVATE_CACHE_CONTROL, conditional_response, public_cache_control
+from app.core.security import get_current_user, get_current_user_id, get_optional_user_id
+from app.core.serialization import trusted_response
+from app.domain.schemas import (
+    DiscoverPageResponse,
+    EnrichmentJobResponse,
+    ProfileBatchRequest,
+    ProfileBatchResponse,
+    ProfileResponse,
+    ProfileUpdateRequest,
+)
 from app.services.profile_service import ProfileService
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=ProfileResponse)
-async def get_my_profile(user_id: str = Depends(get_current_user_id)):
-    """Get the authenticated user's full profile."""
+async def get_my_profile(request: Request, user_id: str = Depends(get_current_user_id)):
+    """Get the authenticated user's full profile (304 if If-None-Match matches)."""
     profile = await ProfileService.get_profile(user_id)
     if profile is None:
         raise HTTPException(status_code=404, detail="Profile not found")
-    return ProfileResponse(**profile)
+    return conditional_response(request, ProfileResponse, profile, PRIVATE_CACHE_CONTROL)
 
 
 @router.put("/me", response_model=ProfileResponse)
@@ -34,31 +44,73 @@ async def update_my_profile(
     return ProfileResponse(**updated)
 
 
+@router.post("/batch", response_model=ProfileBatchResponse)
+async def get_profiles_batch(body: ProfileBatchRequest):
+    """Get several profiles in one call, e.g. for a match or conversation list.
+
+    `items` follows the request order (ids, then usernames), with null for
+    unknown keys.
+    """
+    if len(body.ids) + len(body.usernames) > settings.PROFILE_BATCH_MAX:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.PROFILE_BATCH_MAX} profiles per request",
+        )
+    profiles = await ProfileService.get_profiles_many(body.ids, body.usernames)
+    return trusted_response(ProfileBatchResponse, {"items": profiles})
+
+
 @router.get("/{username}", response_model=ProfileResponse)
-async def get_profile_by_username(username: str):
-    """Get a public profile by GitHub username."""
+async def get_profile_by_username(request: Request, username: str):
+    """Get a public profile by GitHub username; cacheable by CDNs, with ETags."""
     profile = await ProfileService.get_profile_by_username(username)
     if profile is None:
         raise HTTPException(status_code=404, detail="Profile not found")
-    return ProfileResponse(**profile)
+    return conditional_response(request, ProfileResponse, profile, public_cache_control())
 
 
-@router.get("/", response_model=list[ProfileResponse])
+@router.get("/", response_model=DiscoverPageResponse)
 async def discover_profiles(
-    tech: Optional[str] = Query(default=None, description="Filter by technology"),
+    tech: list[str] = Query(default=[], description="Filter by technology (repeatable)"),
+    match: Literal["all", "any"] = Query(default="all", description="Require all or any of the techs"),
     limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    lat: Optional[float] = Query(default=None, ge=-90, le=90),
+    lng: Optional[float] = Query(default=None, ge=-180, le=180),
+    radius_km: float = Query(default=50, gt=0, le=500),
+    include_repos: bool = Query(default=False, description="Include github_repos on each card"),
+    viewer_id: Optional[str] = Depends(get_optional_user_id),
 ):
-    """Discover developer profiles. Optionally filter by tech stack."""
-    profiles = await ProfileService.discover(tech=tech, limit=limit)
-    return [ProfileResponse(**p) for p in profiles]
+    """Discover developer profiles, newest first or nearest first with lat/lng.
 
+    Signed-in viewers don't see their own profile or ones they already swiped.
+    """
+    if (lat is None) != (lng is None):
+        raise HTTPException(status_code=400, detail="lat and lng must be given together")
 
-@router.post("/me/enrich", response_model=MessageResponse)
+    try:
+        profiles, next_cursor = await ProfileService.discover(
+            techs=tech or None,
+            match_all=match == "all",
+            limit=limit,
+            cursor=cursor,
+            near=(lat, lng, radius_km) if lat is not None else None,
+            include_repos=include_repos,
+            viewer_id=viewer_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return trusted_response(
+        DiscoverPageResponse, {"items": profiles, "next_cursor": next_cursor}
+    )
+
+
+@router.post("/me/enrich", response_model=EnrichmentJobResponse, status_code=202)
 async def enrich_my_profile(
     user: dict = Depends(get_current_user),
     user_id: str = Depends(get_current_user_id),
 ):
-    """Re-fetch GitHub repos and languages to update the profile."""
+    """Queue a re-fetch of GitHub repos and languages for the profile."""
     meta = user.get("user_metadata", {})
     username = meta.get("user_name")
     if not username:
@@ -67,8 +119,17 @@ async def enrich_my_profile(
             detail="GitHub username not found in auth metadata",
         )
 
-    await ProfileService.enrich_from_github(
+    job = ProfileService.enqueue_enrichment(
         user_id=user_id,
         github_username=username,
     )
-    return MessageResponse(message=f"Profile enriched from GitHub (@{username})")
+    return EnrichmentJobResponse(**job.to_dict())
+
+
+@router.get("/me/enrich", response_model=EnrichmentJobResponse)
+async def get_enrichment_status(user_id: str = Depends(get_current_user_id)):
+    """Report the state of the latest GitHub enrichment job."""
+    job = ProfileService.get_enrichment_job(user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="No enrichment job found")
+    return EnrichmentJobResponse(**job.to_dict())
@@ -9,12 +9,136 @@ class Settings(BaseSettings):
     SUPABASE_URL: str
     SUPABASE_KEY: str
     SUPABASE_SERVICE_KEY: Optional[str] = None
+    SUPABASE_MAX_CONCURRENCY: int = 16
+    SUPABASE_QUERY_TIMEOUT_SECONDS: float = 10.0
+    # Shared HTTP pool behind every Supabase client (see supabase_client.py)
+    SUPABASE_HTTP_MAX_CONNECTIONS: int = 32
+    SUPABASE_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 16
+    SUPABASE_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    SUPABASE_HTTP_TIMEOUT_SECONDS: float = 10.0
+    SUPABASE_WARM_ON_STARTUP: bool = True
     
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+
+    # Supabase token verification
+    # "local" checks signature + expiry in-process; "strict" asks Supabase every time.
+    AUTH_VERIFY_MODE: str = "local"
+    SUPABASE_JWT_SECRET: Optional[str] = None
+    SUPABASE_JWKS_URL: Optional[str] = None
+    SUPABASE_JWT_AUDIENCE: str = "authenticated"
+    AUTH_JWKS_CACHE_SECONDS: int = 600
+    AUTH_TOKEN_CACHE_SECONDS: int = 60
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = 10_000
+    AUTH_REVOCATION_CHECK_SECONDS: int = 300
     
+    # GitHub API
+    GITHUB_API_URL: str = "https://api.github.com"
+    GITHUB_HTTP2: bool = True
+    GITHUB_TIMEOUT_SECONDS: float = 10.0
+    GITHUB_MAX_CONNECTIONS: int = 20
+    GITHUB_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    GITHUB_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    GITHUB_ETAG_CACHE_MAX_ENTRIES: int = 5_000
+    # Comma-separated pool of tokens; requests rotate across them.
+    GITHUB_TOKENS: str = ""
+    GITHUB_BURST: int = 10
+    GITHUB_BULK_RESERVE_FRACTION: float = 0.2
+    GITHUB_MAX_WAIT_SECONDS: float = 30.0
+    GITHUB_RATE_LIMIT_RETRIES: int = 2
+
+    # GitHub enrichment
+    ENRICH_REPO_LIMIT: int = 10
+    ENRICH_REPO_SCAN: int = 20
+    ENRICH_LANGUAGE_BYTES: bool = False
+    ENRICH_LANGUAGE_CONCURRENCY: int = 4
+    ENRICH_WORKERS: int = 4
+    ENRICH_MAX_ATTEMPTS: int = 5
+    ENRICH_BACKOFF_BASE_SECONDS: float = 2.0
+    ENRICH_BACKOFF_MAX_SECONDS: float = 300.0
+    ENRICH_JOB_HISTORY: int = 10_000
+    # Scheduled re-enrichment (refresh_enrichment.py)
+    ENRICH_REFRESH_MAX_AGE_HOURS: float = 72.0
+    ENRICH_REFRESH_PAGE_SIZE: int = 200
+    ENRICH_REFRESH_CONCURRENCY: int = 8
+    ENRICH_REFRESH_CHECKPOINT: str = ".enrichment_refresh.json"
+
+    # Caching ("memory" or "redis")
+    CACHE_BACKEND: str = "memory"
+    REDIS_URL: Optional[str] = None
+    PROFILE_CACHE_TTL_SECONDS: float = 60.0
+    PROFILE_CACHE_MAX_ENTRIES: int = 10_000
+    PROFILE_BATCH_MAX: int = 100
+    PROFILE_HTTP_MAX_AGE: int = 30  # browser/app cache for public profile reads
+    PROFILE_CDN_MAX_AGE: int = 120  # shared (CDN) cache; bounds staleness after an edit
+
+    # Matching
+    MATCH_POOL_SIZE: int = 500
+    MATCH_POOL_FETCH: int = 300
+    MATCH_POOL_MAX_USERS: int = 5_000
+    MATCH_POOL_REFRESH_SECONDS: int = 300
+    MATCH_POOL_REBUILD_SECONDS: int = 3600
+    MATCH_RADIUS_KM: float = 50.0
+    MATCH_WEIGHT_TECH: float = 0.6
+    MATCH_WEIGHT_GEO: float = 0.25
+    MATCH_WEIGHT_XP: float = 0.15
+    MATCH_TECH_METRIC: str = "jaccard"  # or "cosine" (weighted by GitHub bytes)
+
+    # Geo index (in-memory grid behind nearby discovery)
+    # 0.05° cells keep a MATCH_RADIUS_KM (50 km) query under
+    # GEO_MAX_QUERY_CELLS up to ~80° latitude; smaller cells push the
+    # default radius back to the RPC north of ~35°.
+    GEO_CELL_DEGREES: float = 0.05
+    GEO_MAX_CELLS: int = 50_000
+    GEO_MAX_QUERY_CELLS: int = 2_500
+    GEO_CELL_TTL_SECONDS: float = 300.0
+
+    # Health probes (readiness is served from the last background check)
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 10.0
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 3.0
+    HEALTH_STALE_AFTER_SECONDS: float = 30.0
+    HEALTH_QUEUE_DEPTH_WARN: int = 1_000
+
+    # Leaderboards (global and per technology, kept in memory)
+    LEADERBOARD_CATCH_UP_SECONDS: float = 30.0
+    LEADERBOARD_RECONCILE_SECONDS: float = 3600.0
+    LEADERBOARD_MAX_PAGE_SIZE: int = 100
+
+    # Swipes
+    SWIPE_BATCH_SIZE: int = 500
+    SWIPE_FLUSH_SECONDS: float = 0.02  # swipe requests wait for their batch
+    SWIPE_MAX_PENDING: int = 50_000
+    SWIPE_INDEX_MAX_USERS: int = 100_000
+
+    # Seen-sets (per-user Bloom filters of swiped profiles)
+    SEEN_FALSE_POSITIVE_RATE: float = 0.01
+    SEEN_INITIAL_CAPACITY: int = 512
+    SEEN_MAX_USERS: int = 50_000
+    SEEN_PERSIST_SECONDS: float = 30.0
+    SEEN_REFRESH_SECONDS: float = 120.0
+
+    # Chat (WebSockets); PUBSUB_BACKEND is "memory" or "redis"
+    PUBSUB_BACKEND: str = "memory"
+    CHAT_SEND_QUEUE_SIZE: int = 256
+    CHAT_HEARTBEAT_SECONDS: float = 25.0
+    CHAT_MAX_MESSAGE_CHARS: int = 4000
+    CHAT_PARTICIPANT_CACHE_SECONDS: float = 300.0
+    CHAT_HISTORY_PAGE_SIZE: int = 50
+    CHAT_HISTORY_MAX_PAGE_SIZE: int = 200
+    CHAT_WRITE_BATCH_SIZE: int = 200
+    CHAT_WRITE_DELAY_SECONDS: float = 0.02
+
+    # Responses: skip re-validating repository rows on list endpoints
+    TRUSTED_SERIALIZATION: bool = True
+
+    # Observability: GET /metrics, and a sampled log of slow requests with
+    # a breakdown of where their time went
+    METRICS_ENABLED: bool = True
+    SLOW_REQUEST_SECONDS: float = 1.0
+    SLOW_REQUEST_SAMPLE_RATE: float = 1.0
+
     # Environment
     ENVIRONMENT: str = "development"
     
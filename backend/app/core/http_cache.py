@@ -0,0 +1,88 @@
+"""Conditional GETs for single-resource reads: ETag, Last-Modified and 304.
+
+A resource's strong ETag is a hash of its id and `updated_at` (the
+`set_updated_at` trigger bumps it on every write), plus a representation
+tag for anything else that changes the bytes. A matching `If-None-Match`
+(or, without one, an `If-Modified-Since` no older than `updated_at`) is
+answered with an empty 304 before the body is serialized.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import blake2b
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.serialization import trusted_response
+
+# Bump when a cached resource's JSON shape changes, so clients holding an
+# old ETag get the new representation instead of a 304.
+_REPRESENTATION = "1"
+
+
+def etag_for(resource_id: str, updated_at: str | None) -> str:
+    raw = f"{_REPRESENTATION}:{settings.TRUSTED_SERIALIZATION:d}:{resource_id}:{updated_at}"
+    return '"' + blake2b(raw.encode(), digest_size=12).hexdigest() + '"'
+
+
+def _parse_timestamp(value: str | datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    try:
+        parsed = value if isinstance(value, datetime) else datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since (RFC 9110 §13.2.2)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: a W/ prefix on the client's copy still matches.
+        tags = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+        return etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have whole-second precision.
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def conditional_response(
+    request: Request, model: type[BaseModel], row: dict, cache_control: str
+) -> Response:
+    """200 with validators for `row`, or a bodiless 304 if the client's copy is current."""
+    etag = etag_for(row["id"], row.get("updated_at"))
+    last_modified = _parse_timestamp(row.get("updated_at"))
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    response = trusted_response(model, row)
+    response.headers.update(headers)
+    return response
+
+
+def public_cache_control() -> str:
+    """Shared-cache policy for public reads; CDN copies stay within PROFILE_CDN_MAX_AGE."""
+    return (
+        f"public, max-age={settings.PROFILE_HTTP_MAX_AGE}, "
+        f"s-maxage={settings.PROFILE_CDN_MAX_AGE}, "
+        f"stale-while-revalidate={settings.PROFILE_CDN_MAX_AGE}"
+    )
+
+
+# Per-user data: any cache may keep it but must revalidate (cheap with a 304).
+PRIVATE_CACHE_CONTROL = "private, no-cache"
@@ -0,0 +1,95 @@
+"""Per-request instrumentation: latency histograms and the slow-request log."""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.infrastructure.metrics import RequestTrace, current_trace, registry
+
+logger = logging.getLogger("app.slow_requests")
+
+_in_flight = registry.gauge(
+    "devdate_http_requests_in_flight",
+    "HTTP requests currently being served.",
+)
+_requests = registry.counter(
+    "devdate_http_requests_total",
+    "HTTP requests by route template and status code.",
+    ("method", "route", "status"),
+)
+_latency = registry.histogram(
+    "devdate_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route"),
+)
+
+
+def _route_template(scope: Scope) -> str:
+    """The matched route as a template, e.g. "/api/v1/profiles/{username}".
+
+    Read off the route rather than rebuilt from the path, so "/profiles/me"
+    is never labelled "/profiles/{username}". FastAPI versions that include
+    routers lazily put the router's own route in the scope and the
+    prefixed template on the effective route context.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "<unmatched>"
+    effective = scope.get("fastapi", {}).get("effective_route_context")
+    return getattr(effective, "path_format", None) or route.path_format
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streaming responses are timed to the last byte.
+
+    Routes are labelled by template ("/api/v1/profiles/{username}"), never
+    by raw path, to keep label cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace()
+        token = current_trace.set(trace)
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        _in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - trace.started
+            _in_flight.dec()
+            current_trace.reset(token)
+            route = _route_template(scope)
+            method = scope["method"]
+            _requests.labels(method, route, str(status)).inc()
+            _latency.labels(method, route).observe(elapsed)
+            if (
+                elapsed >= settings.SLOW_REQUEST_SECONDS
+                and random.random() < settings.SLOW_REQUEST_SAMPLE_RATE
+            ):
+                logger.warning(
+                    "slow request %s %s -> %s in %.0fms: %s calls=%s",
+                    method,
+                    route,
+                    status,
+                    elapsed * 1000,
+                    trace.breakdown(),
+                    [(name, round(s * 1000, 1)) for name, s in trace.calls],
+                )
@@ -0,0 +1,35 @@
+"""Opaque keyset cursors shared by the paginated endpoints.
+
+A cursor is the urlsafe-base64 JSON of the last row's sort key ("c" for
+created_at, "d" for distance) plus its id ("i"). Values are validated on
+decode because they end up in PostgREST filters.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import uuid
+from datetime import datetime
+
+
+def encode_cursor(position: dict) -> str:
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str) -> dict:
+    """Decode and validate a cursor; raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(position, dict) or set(position) != {sort_key, "i"}:
+            raise ValueError
+        position["i"] = str(uuid.UUID(position["i"]))
+        if sort_key == "c":
+            position["c"] = datetime.fromisoformat(position["c"]).isoformat()
+        else:
+            position["d"] = float(position["d"])
+    except (ValueError, TypeError, AttributeError):
+        raise ValueError("Invalid cursor")
+    return position
@@ -2,61 +2,298 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import httpx
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 
 from app.core.config import settings
-from app.infrastructure.supabase_client import supabase
+from app.infrastructure.supabase_client import clients
+from app.infrastructure.supabase_repository import run_sync
+
+logger = logging.getLogger(__name__)
 
-# Supabase uses its own JWT secret (the project's JWT secret, not our SECRET_KEY).
-# However, we can verify tokens by calling Supabase's auth.get_user(token).
-# This is the most reliable approach because it also checks token revocation.
+# Supabase signs access tokens with the project's JWT secret (HS256) or, on
+# newer projects, with an asymmetric key published as a JWKS. In "local" mode
+# we verify signature + expiry in-process and only ask Supabase occasionally
+# whether the session was revoked. "strict" mode keeps the old behaviour of
+# calling auth.get_user(token) on every request.
 
 _bearer_scheme = HTTPBearer(auto_error=False)
 
+_ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "ES256", "ES384", "ES512"}
+
+# After a revocation check fails for transport reasons, wait this long
+# before asking Supabase again instead of retrying on every request.
+_REVOCATION_RETRY_SECONDS = 30
+
+
+class _AuthUnavailable(Exception):
+    """Supabase could not say whether the token is valid (timeout, 5xx...)."""
+
+
+@dataclass
+class _CachedToken:
+    user: dict
+    expires_at: float  # the token's own `exp` claim (epoch seconds)
+    verified_until: float  # skip local re-verification until then
+    remote_checked_at: float  # last time Supabase confirmed the session
+
+
+class _TokenCache:
+    """Bounded LRU of recently validated tokens, keyed by token hash."""
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[bytes, _CachedToken] = OrderedDict()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> _CachedToken | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: bytes, entry: _CachedToken) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: bytes) -> None:
+        self._entries.pop(key, None)
+
+
+class _JWKSCache:
+    """Caches the project's JWKS and refetches on expiry or unknown `kid`."""
+
+    def __init__(self, url: str, ttl_seconds: int):
+        self._url = url
+        self._ttl = ttl_seconds
+        self._keys: dict[str, dict] = {}
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get_key(self, kid: str | None) -> dict | None:
+        stale = time.monotonic() - self._fetched_at > self._ttl
+        if stale or kid not in self._keys:
+            await self._refresh(force=not stale)
+        if kid is None and len(self._keys) == 1:
+            return next(iter(self._keys.values()))
+        return self._keys.get(kid)  # type: ignore[arg-type]
+
+    async def _refresh(self, force: bool) -> None:
+        async with self._lock:
+            # Another coroutine may have refreshed while we waited.
+            if not force and time.monotonic() - self._fetched_at <= self._ttl:
+                return
+            # Rate-limit forced refreshes (unknown kid) to one per 30s.
+            if force and time.monotonic() - self._fetched_at < 30:
+                return
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                resp = await client.get(self._url)
+                resp.raise_for_status()
+                keys = resp.json().get("keys", [])
+            self._keys = {k.get("kid", ""): k for k in keys}
+            self._fetched_at = time.monotonic()
+
+
+_token_cache = _TokenCache(settings.AUTH_TOKEN_CACHE_MAX_ENTRIES)
+_jwks_cache = _JWKSCache(
+    settings.SUPABASE_JWKS_URL
+    or f"{settings.SUPABASE_URL}/auth/v1/.well-known/jwks.json",
+    settings.AUTH_JWKS_CACHE_SECONDS,
+)
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _is_auth_rejection(exc: Exception) -> bool:
+    """True if Supabase actually rejected the token, not just failed to answer."""
+    # The SDK is imported lazily (see supabase_client); it is loaded by the
+    # time get_user has raised.
+    from supabase_auth.errors import AuthApiError, AuthError, AuthRetryableError
+
+    if isinstance(exc, AuthRetryableError):
+        return False
+    if isinstance(exc, AuthApiError):
+        return exc.status < 500
+    return isinstance(exc, AuthError)
+
+
+async def _verify_remote(token: str) -> dict:
+    """Ask Supabase to validate the token (handles expiration and revocation).
+
+    Raises a 401 when Supabase rejects the token and _AuthUnavailable when
+    it cannot be reached or fails server-side.
+    """
+    try:
+        user_response = await run_sync(
+            lambda: clients.anon.auth.get_user(token), target="get_user"
+        )
+    except Exception as e:
+        if _is_auth_rejection(e):
+            raise _unauthorized(f"Token validation failed: {str(e)}")
+        raise _AuthUnavailable(str(e)) from e
+
+    user = user_response.user if user_response else None
+    if user is None:
+        raise _unauthorized("Invalid or expired token")
+
+    return {
+        "id": user.id,
+        "email": user.email,
+        "user_metadata": user.user_metadata,
+    }
+
+
+async def _decode_local(token: str) -> dict | None:
+    """Verify signature and expiry in-process.
+
+    Returns the claims, or None if no local key is available for the
+    token's algorithm (the caller then falls back to a remote check).
+    """
+    try:
+        header = jwt.get_unverified_header(token)
+    except JWTError:
+        raise _unauthorized("Invalid or expired token")
+
+    alg = header.get("alg")
+    if alg == "HS256":
+        if not settings.SUPABASE_JWT_SECRET:
+            return None
+        key: str | dict = settings.SUPABASE_JWT_SECRET
+    elif alg in _ASYMMETRIC_ALGORITHMS:
+        try:
+            jwk = await _jwks_cache.get_key(header.get("kid"))
+        except httpx.HTTPError:
+            return None
+        if jwk is None:
+            raise _unauthorized("Invalid or expired token")
+        key = jwk
+    else:
+        raise _unauthorized("Invalid or expired token")
+
+    try:
+        return jwt.decode(
+            token,
+            key,
+            algorithms=[alg],
+            audience=settings.SUPABASE_JWT_AUDIENCE,
+        )
+    except JWTError:
+        raise _unauthorized("Invalid or expired token")
+
+
+async def _verify_local(token: str) -> dict:
+    """Local verification backed by the validated-token cache."""
+    now = time.time()
+    cache_key = _TokenCache.key(token)
+    entry = _token_cache.get(cache_key)
+
+    if entry is None or entry.verified_until <= now:
+        claims = await _decode_local(token)
+        if claims is None:
+            # No local key for this token: cache Supabase's answer instead.
+            try:
+                user = await _verify_remote(token)
+            except HTTPException:
+                _token_cache.discard(cache_key)
+                raise
+            except _AuthUnavailable:
+                if entry is None:
+                    raise
+                logger.warning("Auth re-check unavailable; keeping cached token")
+                entry.verified_until = now + _REVOCATION_RETRY_SECONDS
+                return entry.user
+            try:
+                expires_at = float(jwt.get_unverified_claims(token)["exp"])
+            except (JWTError, KeyError, TypeError, ValueError):
+                return user
+            entry = _CachedToken(
+                user=user,
+                expires_at=expires_at,
+                verified_until=now + settings.AUTH_TOKEN_CACHE_SECONDS,
+                remote_checked_at=now,
+            )
+            _token_cache.put(cache_key, entry)
+            return user
+
+        user = {
+            "id": claims["sub"],
+            "email": claims.get("email"),
+            "user_metadata": claims.get("user_metadata", {}),
+        }
+        entry = _CachedToken(
+            user=user,
+            expires_at=float(claims["exp"]),
+            verified_until=now + settings.AUTH_TOKEN_CACHE_SECONDS,
+            # A freshly signed token is trusted until the first revocation check.
+            remote_checked_at=entry.remote_checked_at if entry else now,
+        )
+        _token_cache.put(cache_key, entry)
+
+    if now - entry.remote_checked_at >= settings.AUTH_REVOCATION_CHECK_SECONDS:
+        try:
+            await _verify_remote(token)
+        except HTTPException:
+            _token_cache.discard(cache_key)
+            raise
+        except _AuthUnavailable as e:
+            # Not a revocation: keep the entry and ask again shortly.
+            logger.warning("Auth revocation check unavailable: %s", e)
+            entry.remote_checked_at = (
+                now - settings.AUTH_REVOCATION_CHECK_SECONDS + _REVOCATION_RETRY_SECONDS
+            )
+        else:
+            entry.remote_checked_at = now
+
+    return entry.user
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(_bearer_scheme),
 ) -> dict:
     """FastAPI dependency that extracts and validates the Supabase JWT.
 
-    Returns the user dict from Supabase (contains id, email, user_metadata, etc.).
-    Raises 401 if the token is missing or invalid.
+    Returns the user dict (contains id, email, user_metadata).
+    Raises 401 if the token is missing or invalid, and 503 if Supabase
+    cannot be reached to validate a token we have not seen before.
     """
     if credentials is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing authorization token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized("Missing authorization token")
 
     token = credentials.credentials
 
     try:
-        # Ask Supabase to validate the token and return the user.
-        # This handles expiration, revocation, etc.
-        user_response = supabase.auth.get_user(token)
-        user = user_response.user
-
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired token",
-            )
-
-        return {
-            "id": user.id,
-            "email": user.email,
-            "user_metadata": user.user_metadata,
-        }
-
-    except HTTPException:
-        raise
-    except Exception as e:
+        if settings.AUTH_VERIFY_MODE == "strict":
+            return await _verify_remote(token)
+        return await _verify_local(token)
+    except _AuthUnavailable as e:
+        logger.warning("Token validation unavailable: %s", e)
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Token validation failed: {str(e)}",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service unavailable, retry",
         )
 
 
@@ -65,3 +302,16 @@ async def get_current_user_id(
 ) -> str:
     """Convenience dependency that returns just the user UUID string."""
     return user["id"]
+
+
+async def get_optional_user_id(
+    credentials: HTTPAuthorizationCredentials | None = Depends(_bearer_scheme),
+) -> str | None:
+    """Like get_current_user_id, but None for anonymous requests.
+
+    A token that is present but invalid still gets a 401.
+    """
+    if credentials is None:
+        return None
+    return (await get_current_user(credentials))["id"]
+
@@ -0,0 +1,115 @@
+"""Fast JSON responses for rows the repository layer already shaped.
+
+Rows from the repositories come straight from Postgres columns whose types
+already match the response models. Building a model per row and letting
+FastAPI validate and serialize it again against `response_model` costs
+most of a list endpoint's CPU. `trusted_response` projects the rows onto
+the model's fields in one pass, with no validation: unknown keys are
+dropped, and missing or null values take the field default. It then
+encodes the result with orjson.
+
+Routes keep `response_model` for the OpenAPI schema. Returning a Response
+bypasses FastAPI's own serialization. With TRUSTED_SERIALIZATION off,
+payloads are validated through the model instead, which is useful when
+changing a query or a model.
+"""
+
+from __future__ import annotations
+
+import functools
+import types
+import typing
+from typing import Any, Callable
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+_MISSING = object()
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson (datetimes, UUIDs and NumPy scalars too)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _nested_model(annotation: Any) -> tuple[type[BaseModel] | None, bool, bool]:
+    """(model, is_list, nullable) for a field annotation."""
+    nullable = False
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, types.UnionType):
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        nullable = len(args) < len(typing.get_args(annotation))
+        annotation = args[0] if len(args) == 1 else Any
+        origin = typing.get_origin(annotation)
+    if origin is list:
+        (item,) = typing.get_args(annotation) or (Any,)
+        nested, _, _ = _nested_model(item)  # unwraps Optional items
+        return nested, True, nullable
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False, nullable
+    return None, False, nullable
+
+
+class TrustedSerializer:
+    """Projects dicts onto a model's fields (recursively) without validation."""
+
+    def __init__(self, model: type[BaseModel]):
+        if not model.__pydantic_complete__:
+            model.model_rebuild()  # resolve forward references first
+        self.model = model
+        self._fields: list[tuple[str, Any, Callable[[], Any] | None, bool, Callable | None]] = []
+        for name, field in model.model_fields.items():
+            nested, is_list, nullable = _nested_model(field.annotation)
+            default = _MISSING if field.is_required() else field.default
+            factory = field.default_factory
+            convert = None
+            if nested is not None:
+                inner = serializer_for(nested)
+                convert = inner.dump_many if is_list else inner.dump
+            self._fields.append((name, default, factory, nullable, convert))
+
+    def dump(self, row: dict) -> dict:
+        out = {}
+        for name, default, factory, nullable, convert in self._fields:
+            value = row.get(name)
+            if value is None:
+                if nullable and name in row:
+                    out[name] = None
+                elif factory is not None:
+                    out[name] = factory()
+                elif default is not _MISSING:
+                    out[name] = default
+                else:
+                    out[name] = None
+                continue
+            out[name] = convert(value) if convert is not None else value
+        return out
+
+    def dump_many(self, rows: list[dict | None]) -> list[dict | None]:
+        return [None if row is None else self.dump(row) for row in rows]
+
+
+@functools.lru_cache(maxsize=None)
+def serializer_for(model: type[BaseModel]) -> TrustedSerializer:
+    return TrustedSerializer(model)
+
+
+def trusted_response(
+    model: type[BaseModel], data: dict | list[dict], status_code: int = 200
+) -> ORJSONResponse:
+    """JSON response for `data` (one row or a list of rows) shaped as `model`."""
+    if not settings.TRUSTED_SERIALIZATION:
+        if isinstance(data, list):
+            content = [model.model_validate(row).model_dump(mode="json") for row in data]
+        else:
+            content = model.model_validate(data).model_dump(mode="json")
+    elif isinstance(data, list):
+        content = serializer_for(model).dump_many(data)
+    else:
+        content = serializer_for(model).dump(data)
+    return ORJSONResponse(content, status_code=status_code)
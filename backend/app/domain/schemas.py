@@ -59,6 +59,23 @@ class ProfileResponse(BaseModel):
     updated_at: Optional[datetime] = None
 
 
+class DiscoverPageResponse(BaseModel):
+    """One page of the discovery feed; pass next_cursor to get the next."""
+    items: list[ProfileResponse]
+    next_cursor: Optional[str] = None
+
+
+class ProfileBatchRequest(BaseModel):
+    """Look up several profiles at once, by id and/or GitHub username."""
+    ids: list[str] = Field(default_factory=list)
+    usernames: list[str] = Field(default_factory=list)
+
+
+class ProfileBatchResponse(BaseModel):
+    """One entry per requested key (ids first, then usernames); null if unknown."""
+    items: list[Optional[ProfileResponse]]
+
+
 class ProfileUpdateRequest(BaseModel):
     """Fields the user can update on their own profile."""
     display_name: Optional[str] = None
@@ -68,6 +85,69 @@ class ProfileUpdateRequest(BaseModel):
     location_lng: Optional[float] = None
 
 
+class EnrichmentJobResponse(BaseModel):
+    """State of a background GitHub enrichment job."""
+    status: str
+    attempts: int = 0
+    last_error: Optional[str] = None
+    enqueued_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+# ═══════════════════════════════════════════════════════════════
+#  MATCHES
+# ═══════════════════════════════════════════════════════════════
+
+class MatchCandidateResponse(BaseModel):
+    """A ranked potential match."""
+    profile: ProfileResponse
+    score: float
+
+
+class SwipeRequest(BaseModel):
+    """Like or pass on a profile. Repeating a swipe is harmless."""
+    target_id: str
+    direction: str = Field(..., pattern="^(like|pass)$")
+
+
+class SwipeResponse(BaseModel):
+    target_id: str
+    direction: str
+    match: Optional[ConnectionResponse] = None  # set when the like is mutual
+
+
+# ═══════════════════════════════════════════════════════════════
+#  LEADERBOARDS
+# ═══════════════════════════════════════════════════════════════
+
+class LeaderboardEntryResponse(BaseModel):
+    """One leaderboard row; tied XP shares a position."""
+    position: int
+    id: str
+    github_username: str
+    display_name: Optional[str] = None
+    avatar_url: Optional[str] = None
+    tech_stack: list[str] = Field(default_factory=list)
+    xp: int = 0
+    rank: str = "Intern"
+
+
+class LeaderboardResponse(BaseModel):
+    """A page of the global board, or of one technology's board."""
+    items: list[LeaderboardEntryResponse]
+    total: int
+    tech: Optional[str] = None
+
+
+class LeaderboardPositionResponse(BaseModel):
+    """Where a user stands; position is null if they aren't on the board."""
+    position: Optional[int] = None
+    total: int
+    xp: int = 0
+    rank: str = "Intern"
+    tech: Optional[str] = None
+
+
 # ═══════════════════════════════════════════════════════════════
 #  CONNECTIONS
 # ═══════════════════════════════════════════════════════════════
@@ -94,6 +174,40 @@ class ConnectionResponse(BaseModel):
     updated_at: Optional[datetime] = None
 
 
+# ═══════════════════════════════════════════════════════════════
+#  CHAT
+# ═══════════════════════════════════════════════════════════════
+
+class ChatMessageCreateRequest(BaseModel):
+    """Send a message; `client_id` makes client retries idempotent."""
+    content: str = Field(..., min_length=1, max_length=4000)
+    client_id: Optional[str] = Field(default=None, max_length=64)
+
+
+class ChatMessageResponse(BaseModel):
+    id: str
+    conversation_id: str
+    sender_id: str
+    content: str
+    created_at: datetime
+    client_id: Optional[str] = None
+
+
+class MessagePageResponse(BaseModel):
+    """Messages in chronological order plus cursors for both directions."""
+    items: list[ChatMessageResponse]
+    older_cursor: Optional[str] = None  # pass as `before`; null when at the start
+    newer_cursor: Optional[str] = None  # pass as `after` to catch up
+
+
+class ConversationSummaryResponse(BaseModel):
+    """Inbox row: the other participant, latest message and unread count."""
+    conversation_id: str
+    other_user_id: str
+    last_message: Optional[ChatMessageResponse] = None
+    unread_count: int = 0
+
+
 # ═══════════════════════════════════════════════════════════════
 #  PROJECTS (placeholder for Phase 2+)
 # ═══════════════════════════════════════════════════════════════
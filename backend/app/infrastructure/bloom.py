@@ -0,0 +1,156 @@
+"""Scalable Bloom filter over string ids, vectorized with NumPy.
+
+Each id is hashed once (BLAKE2b, 128 bits split into h1/h2) and probed at
+k positions h1 + i*h2 (Kirsch–Mitzenmacher double hashing). A filter starts
+small and, as it fills, adds layers with 4x the capacity and half the error
+rate (Almeida et al., "Scalable Bloom Filters"). The overall false-positive
+rate stays under the configured bound however many ids are added, and a
+light user costs under a kilobyte.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+from hashlib import blake2b
+
+import numpy as np
+
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<BdH")  # version, error_rate, layer count
+_LAYER = struct.Struct("<IIdI")  # capacity, count, error_rate, byte length
+
+
+def hash_ids(ids: list[str]) -> np.ndarray:
+    """(n, 2) uint64 hash pairs, one row per id."""
+    if not ids:
+        return np.zeros((0, 2), dtype=np.uint64)
+    digests = b"".join(blake2b(i.encode(), digest_size=16).digest() for i in ids)
+    return np.frombuffer(digests, dtype=np.uint64).reshape(-1, 2)
+
+
+class BloomFilter:
+    """Fixed-capacity Bloom filter sized for `capacity` ids at `error_rate`."""
+
+    __slots__ = ("capacity", "error_rate", "count", "k", "m", "bits", "_probes")
+
+    def __init__(self, capacity: int, error_rate: float, bits: bytes | None = None, count: int = 0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.count = count
+        m = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.m = max(64, (m + 63) // 64 * 64)
+        self.k = max(1, round(self.m / capacity * math.log(2)))
+        if bits is None:
+            self.bits = np.zeros(self.m // 8, dtype=np.uint8)
+        else:
+            self.bits = np.frombuffer(bits, dtype=np.uint8).copy()
+        self._probes = np.arange(self.k, dtype=np.uint64)
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        # uint64 arithmetic wraps, which is fine for hashing.
+        pos = hashes[:, :1] + self._probes * hashes[:, 1:]
+        return pos % np.uint64(self.m)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        pos = self._positions(hashes)
+        found = (self.bits[pos >> np.uint64(3)] >> (pos & np.uint64(7)).astype(np.uint8)) & 1
+        return found.all(axis=1)
+
+    def add(self, hashes: np.ndarray) -> None:
+        pos = self._positions(hashes).ravel()
+        np.bitwise_or.at(
+            self.bits,
+            pos >> np.uint64(3),
+            np.left_shift(1, (pos & np.uint64(7)).astype(np.uint8)).astype(np.uint8),
+        )
+        self.count += len(hashes)
+
+    def estimated_error_rate(self) -> float:
+        """False-positive probability at the current fill."""
+        return (1.0 - math.exp(-self.k * self.count / self.m)) ** self.k
+
+
+class ScalableBloomFilter:
+    """Bloom filter that grows by adding layers; FP rate stays <= error_rate."""
+
+    GROWTH = 4  # capacity multiplier per layer (fewer layers to probe)
+    TIGHTENING = 0.5  # error-rate multiplier per layer
+
+    def __init__(self, error_rate: float = 0.01, initial_capacity: int = 256):
+        self.error_rate = error_rate
+        self.initial_capacity = initial_capacity
+        # Layer errors p0 * r^i sum to p0 / (1 - r) = error_rate.
+        self.layers: list[BloomFilter] = [
+            BloomFilter(initial_capacity, error_rate * (1 - self.TIGHTENING))
+        ]
+
+    def __len__(self) -> int:
+        return sum(layer.count for layer in self.layers)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(layer.bits.nbytes for layer in self.layers)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """Boolean mask: True where the id may have been added."""
+        found = np.zeros(len(hashes), dtype=bool)
+        for layer in self.layers:
+            pending = ~found
+            if not pending.any():
+                break
+            found[pending] = layer.contains(hashes[pending])
+        return found
+
+    def add(self, hashes: np.ndarray) -> int:
+        """Add ids not already (probably) present; returns how many were new."""
+        new = hashes[~self.contains(hashes)]
+        if len(new):
+            new = np.unique(new, axis=0)
+        added = 0
+        while added < len(new):
+            layer = self.layers[-1]
+            if layer.count >= layer.capacity:
+                layer = BloomFilter(
+                    layer.capacity * self.GROWTH, layer.error_rate * self.TIGHTENING
+                )
+                self.layers.append(layer)
+            take = min(len(new) - added, layer.capacity - layer.count)
+            layer.add(new[added : added + take])
+            added += take
+        return added
+
+    def estimated_error_rate(self) -> float:
+        miss = 1.0
+        for layer in self.layers:
+            miss *= 1.0 - layer.estimated_error_rate()
+        return 1.0 - miss
+
+    def to_bytes(self) -> bytes:
+        parts = [_HEADER.pack(_FORMAT_VERSION, self.error_rate, len(self.layers))]
+        for layer in self.layers:
+            parts.append(
+                _LAYER.pack(layer.capacity, layer.count, layer.error_rate, layer.bits.nbytes)
+            )
+            parts.append(layer.bits.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> ScalableBloomFilter:
+        version, error_rate, n_layers = _HEADER.unpack_from(data, 0)
+        if version != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported Bloom filter format {version}")
+        offset = _HEADER.size
+        layers = []
+        for _ in range(n_layers):
+            capacity, count, layer_error, length = _LAYER.unpack_from(data, offset)
+            offset += _LAYER.size
+            layers.append(
+                BloomFilter(capacity, layer_error, data[offset : offset + length], count)
+            )
+            offset += length
+        bloom = cls.__new__(cls)
+        bloom.error_rate = error_rate
+        bloom.initial_capacity = layers[0].capacity
+        bloom.layers = layers
+        return bloom
@@ -0,0 +1,235 @@
+"""Pluggable key/value cache with an in-process LRU and a Redis backend."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Protocol
+
+from app.core.config import settings
+
+
+class CacheBackend(Protocol):
+    """Minimal async cache interface shared by all backends."""
+
+    name: str
+    hits: int
+    misses: int
+
+    async def get(self, key: str) -> Any | None: ...
+
+    async def get_many(self, keys: list[str]) -> list[Any | None]: ...
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+    async def ping(self) -> bool: ...
+
+
+class MemoryCache:
+    """Process-local LRU with per-entry TTL and a size bound.
+
+    Values are stored by reference; callers must not mutate what they get.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10_000, default_ttl: float = 60.0):
+        self._max_entries = max_entries
+        self._default_ttl = default_ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    async def get_many(self, keys: list[str]) -> list[Any | None]:
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + (ttl or self._default_ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def ping(self) -> bool:
+        return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache:
+    """Cache on any redis.asyncio-compatible client (values stored as JSON).
+
+    Pass a client explicitly to use a stand-in such as fakeredis in tests.
+    """
+
+    name = "redis"
+
+    def __init__(self, client: Any, prefix: str = "devdate:", default_ttl: float = 60.0):
+        self._client = client
+        self._prefix = prefix
+        self._default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Any | None:
+        raw = await self._client.get(self._prefix + key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def get_many(self, keys: list[str]) -> list[Any | None]:
+        if not keys:
+            return []
+        raws = await self._client.mget([self._prefix + k for k in keys])
+        found = sum(raw is not None for raw in raws)
+        self.hits += found
+        self.misses += len(raws) - found
+        return [None if raw is None else json.loads(raw) for raw in raws]
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        await self._client.set(
+            self._prefix + key,
+            json.dumps(value, default=str),
+            ex=max(1, int(ttl or self._default_ttl)),
+        )
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._client.delete(*(self._prefix + k for k in keys))
+
+    async def ping(self) -> bool:
+        return bool(await self._client.ping())
+
+
+class SingleFlight:
+    """Coalesces concurrent loads of the same key into one call."""
+
+    def __init__(self) -> None:
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # this caller was cancelled, not the leader
+                return await self.do(key, loader)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a failure nobody waited on isn't logged.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+
+class BatchLoader:
+    """Coalesces single-key loads into batched `load_many` calls (DataLoader).
+
+    Keys requested during the same event-loop pass, by any number of
+    callers, are deduplicated and fetched together in chunks of at most
+    `max_batch`. `load_many` returns {key: value}; absent keys resolve to
+    None. Nothing is memoized; pair it with a cache.
+    """
+
+    def __init__(
+        self,
+        load_many: Callable[[list[str]], Awaitable[dict[str, Any]]],
+        max_batch: int = 100,
+    ):
+        self._load_many = load_many
+        self._max_batch = max_batch
+        self._pending: dict[str, asyncio.Future] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+
+    def _future(self, key: str) -> asyncio.Future:
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            future = self._pending[key] = loop.create_future()
+        return future
+
+    async def load(self, key: str) -> Any | None:
+        return await asyncio.shield(self._future(key))
+
+    async def load_many(self, keys: list[str]) -> list[Any | None]:
+        futures = [self._future(key) for key in keys]
+        return list(await asyncio.shield(asyncio.gather(*futures)))
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        keys = list(pending)
+        for start in range(0, len(keys), self._max_batch):
+            chunk = {k: pending[k] for k in keys[start : start + self._max_batch]}
+            task = asyncio.ensure_future(self._run(chunk))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, chunk: dict[str, asyncio.Future]) -> None:
+        self.batches += 1
+        try:
+            found = await self._load_many(list(chunk))
+        except asyncio.CancelledError:
+            for future in chunk.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in chunk.values():
+                if not future.done():
+                    future.set_exception(e)
+                    future.exception()  # don't log failures nobody awaited
+            return
+        for key, future in chunk.items():
+            if not future.done():
+                future.set_result(found.get(key))
+
+
+def build_cache(max_entries: int, default_ttl: float) -> CacheBackend:
+    """Create the backend selected by CACHE_BACKEND ("memory" or "redis")."""
+    if settings.CACHE_BACKEND == "redis":
+        if not settings.REDIS_URL:
+            raise ValueError("REDIS_URL is not configured in .env")
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the `redis` package") from e
+        return RedisCache(redis.from_url(settings.REDIS_URL), default_ttl=default_ttl)
+    return MemoryCache(max_entries=max_entries, default_ttl=default_ttl)
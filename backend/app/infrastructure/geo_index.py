@@ -0,0 +1,402 @@
+"""In-memory grid index of profile locations for radius queries.
+
+Located profiles are bucketed into fixed lat/lng cells (GEO_CELL_DEGREES
+on a side). A "within R km of X" query gathers the cells overlapping the
+circle's bounding box and measures great-circle distances for all their
+points in one NumPy pass, so it never leaves the process.
+
+Cells are loaded lazily. A query that touches a cell this process has not
+loaded yet returns None, and the caller falls back to the PostGIS RPC
+while the missing cells load in the background. Loaded cells are kept
+current by `upsert`/`remove` from this process's profile writes and are
+reloaded every GEO_CELL_TTL_SECONDS to pick up other workers' writes.
+
+Distances are measured on the mean-radius sphere, the same model the
+`nearby_profiles_page` RPC uses, so keyset cursors from either source are
+interchangeable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from app.core.config import settings
+from app.infrastructure.supabase_repository import ProfileRepository
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_M = 6_371_008.7714  # PostGIS sphere (WGS84 mean radius)
+_LOAD_PAGE = 5000
+
+CellKey = tuple[int, int]
+
+
+class _Cell:
+    """Points in one grid cell; rows are swap-removed to stay dense."""
+
+    __slots__ = ("ids", "techs", "points", "slots", "loaded_at")
+
+    def __init__(self, loaded_at: float):
+        self.ids: list[str] = []
+        self.techs: list[frozenset[str]] = []
+        # One row per profile: latitude (rad), longitude (rad), cos(latitude).
+        self.points = np.empty((4, 3), dtype=np.float64)
+        self.slots: dict[str, int] = {}
+        self.loaded_at = loaded_at
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def put(self, profile_id: str, lat: float, lng: float, techs: frozenset[str]) -> None:
+        slot = self.slots.get(profile_id)
+        if slot is None:
+            slot = len(self.ids)
+            if slot == len(self.points):
+                self.points = np.resize(self.points, (2 * slot, 3))
+            self.slots[profile_id] = slot
+            self.ids.append(profile_id)
+            self.techs.append(techs)
+        else:
+            self.techs[slot] = techs
+        phi = math.radians(lat)
+        self.points[slot] = (phi, math.radians(lng), math.cos(phi))
+
+    def discard(self, profile_id: str) -> None:
+        slot = self.slots.pop(profile_id, None)
+        if slot is None:
+            return
+        last = len(self.ids) - 1
+        if slot != last:
+            moved = self.ids[last]
+            self.ids[slot] = moved
+            self.techs[slot] = self.techs[last]
+            self.points[slot] = self.points[last]
+            self.slots[moved] = slot
+        self.ids.pop()
+        self.techs.pop()
+
+
+class GeoGridIndex:
+    """Grid of lazily loaded cells answering nearest-first radius queries."""
+
+    def __init__(
+        self,
+        cell_degrees: float = 0.05,
+        max_cells: int = 50_000,
+        max_query_cells: int = 2_500,
+        ttl: float = 300.0,
+    ):
+        self._cell_degrees = cell_degrees
+        self._max_cells = max_cells
+        self._max_query_cells = max_query_cells
+        self._ttl = ttl
+        self._cells: OrderedDict[CellKey, _Cell] = OrderedDict()
+        self._cell_of: dict[str, CellKey] = {}
+        self._loading: set[CellKey] = set()
+        self._tasks: dict[asyncio.Task, float] = {}  # in-flight loads -> start time
+        # Local writes made while a load was in flight, re-applied on top of
+        # the rows it fetched: profile_id -> (time, lat, lng, techs).
+        self._touched: dict[str, tuple[float, float | None, float | None, frozenset[str]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, lat: float, lng: float) -> CellKey:
+        return (math.floor(lat / self._cell_degrees), math.floor(lng / self._cell_degrees))
+
+    def __len__(self) -> int:
+        return len(self._cell_of)
+
+    # ── Writes ───────────────────────────────────────────────────
+
+    def upsert(
+        self,
+        profile_id: str,
+        lat: float | None,
+        lng: float | None,
+        techs: list[str] | None = None,
+    ) -> None:
+        """Record a profile's current location (None removes it)."""
+        tech_set = frozenset(techs or ())
+        if self._tasks:
+            self._touched[profile_id] = (time.monotonic(), lat, lng, tech_set)
+        self._place(profile_id, lat, lng, tech_set)
+
+    def remove(self, profile_id: str) -> None:
+        self.upsert(profile_id, None, None)
+
+    def _place(
+        self, profile_id: str, lat: float | None, lng: float | None, techs: frozenset[str]
+    ) -> None:
+        old = self._cell_of.pop(profile_id, None)
+        new = self._key(lat, lng) if lat is not None and lng is not None else None
+        if old is not None and old != new and old in self._cells:
+            self._cells[old].discard(profile_id)
+        if new is None:
+            return
+        cell = self._cells.get(new)
+        if cell is None:
+            return  # not loaded; the cell's load will fetch the new location
+        cell.put(profile_id, lat, lng, techs)
+        self._cell_of[profile_id] = new
+
+    # ── Queries ──────────────────────────────────────────────────
+
+    def _cover(
+        self, lat: float, lng: float, radius_m: float
+    ) -> tuple[int, int, int, int] | None:
+        """Cell index box (lat0, lng0, lat1, lng1) around the circle, or None
+        if the grid can't serve it."""
+        angle = radius_m / EARTH_RADIUS_M
+        dlat = math.degrees(angle)
+        if lat - dlat <= -90 or lat + dlat >= 90:
+            return None  # the box would contain a pole
+        ratio = math.sin(angle) / math.cos(math.radians(lat))
+        if ratio >= 1:
+            return None
+        dlng = math.degrees(math.asin(ratio))
+        if lng - dlng < -180 or lng + dlng > 180:
+            return None  # crosses the antimeridian
+        lat0, lng0 = self._key(lat - dlat, lng - dlng)
+        lat1, lng1 = self._key(lat + dlat, lng + dlng)
+        if (lat1 - lat0 + 1) * (lng1 - lng0 + 1) > self._max_query_cells:
+            return None
+        return lat0, lng0, lat1, lng1
+
+    @staticmethod
+    def _ring(center: CellKey, ring: int, box: tuple[int, int, int, int]) -> list[CellKey]:
+        """Cells exactly `ring` steps (Chebyshev) from `center`, inside `box`."""
+        ci, cj = center
+        lat0, lng0, lat1, lng1 = box
+        if ring == 0:
+            return [center]
+        keys = []
+        for i in range(max(ci - ring, lat0), min(ci + ring, lat1) + 1):
+            if abs(i - ci) == ring:
+                keys.extend((i, j) for j in range(max(cj - ring, lng0), min(cj + ring, lng1) + 1))
+            else:
+                keys.extend((i, j) for j in (cj - ring, cj + ring) if lng0 <= j <= lng1)
+        return keys
+
+    def _ring_bound(self, ring: int, max_abs_lat: float) -> float:
+        """Lower bound (m) on the distance to any point `ring` cells away.
+
+        Such a point is at least ring-1 whole cells away in latitude or
+        longitude; from the haversine formula, sin(d/2) >= cos(lat) *
+        sin(dlng/2), and latitude alone gives more.
+        """
+        if ring <= 1:
+            return 0.0
+        gap = math.radians((ring - 1) * self._cell_degrees)
+        return 2 * EARTH_RADIUS_M * math.asin(
+            math.cos(math.radians(max_abs_lat)) * math.sin(gap / 2)
+        )
+
+    def query(
+        self,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        limit: int,
+        techs: list[str] | None = None,
+        match_all: bool = True,
+        after: tuple[float, str] | None = None,
+    ) -> list[dict] | None:
+        """Nearest-first {id, distance_m} page within radius_km of (lat, lng).
+
+        Same contract as ProfileRepository.nearby_page. Returns None when
+        the area isn't loaded yet (loading starts in the background) or is
+        too large or awkward for the grid; use the RPC then.
+
+        Cells are scanned in rings around the query point, stopping once
+        `limit` hits are closer than anything in the next ring could be.
+        """
+        radius_m = radius_km * 1000
+        box = self._cover(lat, lng, radius_m)
+        if box is None:
+            self.misses += 1
+            return None
+        center = self._key(lat, lng)
+        last_ring = max(
+            center[0] - box[0], box[2] - center[0], center[1] - box[1], box[3] - center[1]
+        )
+        phi0, lam0 = math.radians(lat), math.radians(lng)
+        cos_phi0 = math.cos(phi0)
+        max_a = math.sin(radius_m / EARTH_RADIUS_M / 2) ** 2
+        max_abs_lat = min(90.0, abs(lat) + math.degrees(radius_m / EARTH_RADIUS_M))
+        wanted = set(techs or ())
+        found: list[tuple[float, str]] = []
+        found_dist: list[np.ndarray] = []
+
+        now = time.monotonic()
+        stale: list[CellKey] = []
+        for ring in range(last_ring + 1):
+            cells = []
+            for key in self._ring(center, ring, box):
+                cell = self._cells.get(key)
+                if cell is None:
+                    # Cold cell that may hold a result: load the whole box.
+                    self._schedule_load(stale + [
+                        (i, j)
+                        for i in range(box[0], box[2] + 1)
+                        for j in range(box[1], box[3] + 1)
+                        if (i, j) not in self._cells
+                    ])
+                    self.misses += 1
+                    return None
+                self._cells.move_to_end(key)
+                if now - cell.loaded_at > self._ttl:
+                    stale.append(key)
+                if len(cell):
+                    cells.append(cell)
+            if not cells:
+                continue
+            points = np.concatenate([c.points[: len(c)] for c in cells])
+            offsets = np.cumsum([0] + [len(c) for c in cells])
+            # Haversine; compare on `a` and only take asin for the hits.
+            a = (
+                np.sin((points[:, 0] - phi0) / 2) ** 2
+                + cos_phi0 * points[:, 2] * np.sin((points[:, 1] - lam0) / 2) ** 2
+            )
+            hits = np.flatnonzero(a <= max_a)
+            dist = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a[hits]))
+            if after is not None:
+                keep = dist >= after[0]
+                hits, dist = hits[keep], dist[keep]
+
+            # Materialize ids only for hits that can still make the page.
+            if sum(len(d) for d in found_dist) >= limit:
+                cutoff = np.partition(np.concatenate(found_dist), limit - 1)[limit - 1]
+                near = dist <= cutoff
+                hits, dist = hits[near], dist[near]
+            if not wanted:
+                # Tied-with-the-cursor rows may still be skipped below.
+                k = limit + (int((dist == after[0]).sum()) if after is not None else 0)
+                if len(dist) > k:
+                    near = dist <= np.partition(dist, k - 1)[k - 1]
+                    hits, dist = hits[near], dist[near]
+            accepted = []
+            for i in np.argsort(dist, kind="stable"):
+                c = int(np.searchsorted(offsets, hits[i], side="right")) - 1
+                slot = int(hits[i] - offsets[c])
+                profile_id, tech_set = cells[c].ids[slot], cells[c].techs[slot]
+                d = float(dist[i])
+                if len(accepted) >= limit and d > accepted[limit - 1]:
+                    break  # further hits in this ring are farther still
+                if after is not None and d == after[0] and profile_id <= after[1]:
+                    continue
+                if wanted and not ((wanted <= tech_set) if match_all else (wanted & tech_set)):
+                    continue
+                found.append((d, profile_id))
+                accepted.append(d)
+            found_dist.append(np.array(accepted))
+
+            if len(found) >= limit:
+                bound = self._ring_bound(ring + 1, max_abs_lat)
+                if sorted(d for d, _ in found)[limit - 1] < bound:
+                    break
+
+        if stale:
+            self._schedule_load(stale)
+        self.hits += 1
+        found.sort()
+        return [{"id": profile_id, "distance_m": d} for d, profile_id in found[:limit]]
+
+    # ── Loading ──────────────────────────────────────────────────
+
+    def _schedule_load(self, keys: list[CellKey]) -> None:
+        keys = [k for k in keys if k not in self._loading]
+        if not keys:
+            return
+        self._loading.update(keys)
+        task = asyncio.create_task(self._load(keys))
+        self._tasks[task] = time.monotonic()
+        task.add_done_callback(self._load_done)
+
+    def _load_done(self, task: asyncio.Task) -> None:
+        self._tasks.pop(task, None)
+        oldest = min(self._tasks.values(), default=None)
+        if oldest is None:
+            self._touched.clear()
+        else:
+            self._touched = {k: v for k, v in self._touched.items() if v[0] >= oldest}
+
+    async def _load(self, keys: list[CellKey]) -> None:
+        started = time.monotonic()
+        size = self._cell_degrees
+        min_lat = min(k[0] for k in keys) * size
+        min_lng = min(k[1] for k in keys) * size
+        max_lat = (max(k[0] for k in keys) + 1) * size
+        max_lng = (max(k[1] for k in keys) + 1) * size
+        wanted = set(keys)
+        try:
+            rows: list[dict] = []
+            after = None
+            while True:
+                page = await ProfileRepository.points_in_box(
+                    min_lat, min_lng, max_lat, max_lng, _LOAD_PAGE, after_id=after
+                )
+                rows.extend(page)
+                if len(page) < _LOAD_PAGE:
+                    break
+                after = page[-1]["id"]
+        except Exception:
+            logger.exception("Geo index load of %d cells failed", len(keys))
+            return
+        finally:
+            self._loading.difference_update(keys)
+
+        # Swap in fresh cells for everything requested, then put back the
+        # local writes made while the rows were in flight.
+        fresh = {key: _Cell(started) for key in keys}
+        for key in keys:
+            old = self._cells.pop(key, None)
+            if old is not None:
+                for profile_id in old.ids:
+                    self._cell_of.pop(profile_id, None)
+        for r in rows:
+            lat, lng = r["location_lat"], r["location_lng"]
+            key = self._key(lat, lng)
+            if key in wanted:
+                profile_id = r["id"]
+                old = self._cell_of.pop(profile_id, None)
+                if old is not None and old in self._cells:
+                    self._cells[old].discard(profile_id)
+                fresh[key].put(profile_id, lat, lng, frozenset(r.get("tech_stack") or ()))
+                self._cell_of[profile_id] = key
+        self._cells.update(fresh)
+        for profile_id, (at, lat, lng, techs) in list(self._touched.items()):
+            if at >= started:
+                self._place(profile_id, lat, lng, techs)
+
+        while len(self._cells) > self._max_cells:
+            _, evicted = self._cells.popitem(last=False)
+            for profile_id in evicted.ids:
+                self._cell_of.pop(profile_id, None)
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "cells": len(self._cells),
+            "profiles": len(self._cell_of),
+            "loading_cells": len(self._loading),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+geo_index = GeoGridIndex(
+    settings.GEO_CELL_DEGREES,
+    settings.GEO_MAX_CELLS,
+    settings.GEO_MAX_QUERY_CELLS,
+    settings.GEO_CELL_TTL_SECONDS,
+)
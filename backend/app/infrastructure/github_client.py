@@ -2,15 +2,95 @@
 
 from __future__ import annotations
 
+import importlib.util
+import time
+from collections import OrderedDict
+from typing import Any
+
 import httpx
 
-GITHUB_API = "https://api.github.com"
+from app.core.config import settings
+from app.infrastructure.github_scheduler import (
+    INTERACTIVE,
+    GitHubRateLimitError,
+    GitHubScheduler,
+    github_scheduler,
+)
+from app.infrastructure.metrics import observe_outbound, registry
+
+# One pooled AsyncClient for the whole process. Keep-alive connections are
+# reused across requests, so bulk enrichment pays the TCP/TLS handshake once
+# per pooled connection instead of once per call.
+_http_client: httpx.AsyncClient | None = None
+
+# (path, params) -> (etag, payload) for conditional requests made with the
+# shared token pool. Calls with a user's own token are not revalidated.
+_etag_cache: OrderedDict[tuple, tuple[str, Any]] = OrderedDict()
+
+_responses = registry.counter(
+    "devdate_github_responses_total",
+    "GitHub API responses by endpoint and status code.",
+    ("endpoint", "status"),
+)
+
+
+def _endpoint(path: str) -> str:
+    """Metric label for a request path: "/users/octocat/repos" -> "/users/{user}/repos"."""
+    parts = path.strip("/").split("/")
+    if parts[0] == "users" and len(parts) > 1:
+        parts[1] = "{user}"
+    elif parts[0] == "repos" and len(parts) > 2:
+        parts[1:3] = ["{owner}", "{repo}"]
+    return "/" + "/".join(parts)
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    http2 = settings.GITHUB_HTTP2 and importlib.util.find_spec("h2") is not None
+    return httpx.AsyncClient(
+        base_url=settings.GITHUB_API_URL,
+        http2=http2,
+        timeout=httpx.Timeout(settings.GITHUB_TIMEOUT_SECONDS),
+        limits=httpx.Limits(
+            max_connections=settings.GITHUB_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.GITHUB_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.GITHUB_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _build_http_client()
+    return _http_client
+
+
+async def startup() -> None:
+    """Open the shared connection pool (FastAPI lifespan hook)."""
+    get_http_client()
+
+
+async def shutdown() -> None:
+    """Close pooled connections (FastAPI lifespan hook)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
 
 
 class GitHubClient:
     """Lightweight async client for the GitHub REST API."""
 
-    def __init__(self, access_token: str | None = None):
+    def __init__(
+        self,
+        access_token: str | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        scheduler: GitHubScheduler | None = None,
+    ):
+        self._http_client = http_client
+        # Calls made with the user's own token bypass the shared token pool.
+        self._scheduler = None if access_token else (scheduler or github_scheduler)
         self._headers = {
             "Accept": "application/vnd.github+json",
             "X-GitHub-Api-Version": "2022-11-28",
@@ -18,33 +98,92 @@ class GitHubClient:
         if access_token:
             self._headers["Authorization"] = f"Bearer {access_token}"
 
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        return self._http_client or get_http_client()
+
+    async def _timed_get(self, path: str, headers: dict, params: dict | None) -> httpx.Response:
+        endpoint = _endpoint(path)
+        started = time.perf_counter()
+        try:
+            resp = await self._client.get(path, headers=headers, params=params)
+        except Exception:
+            observe_outbound("github", endpoint, time.perf_counter() - started, ok=False)
+            raise
+        observe_outbound("github", endpoint, time.perf_counter() - started, resp.status_code < 500)
+        _responses.labels(endpoint, str(resp.status_code)).inc()
+        return resp
+
+    async def _send(self, path: str, headers: dict, params: dict | None, priority: int) -> httpx.Response:
+        """GET through the scheduler, retrying on another credential if rate limited."""
+        if self._scheduler is None:
+            return await self._timed_get(path, headers, params)
+
+        for _ in range(settings.GITHUB_RATE_LIMIT_RETRIES + 1):
+            credential = await self._scheduler.acquire(priority)
+            resp = await self._timed_get(path, {**headers, **credential.auth_header}, params)
+            if not self._scheduler.update(credential, resp):
+                return resp
+        raise GitHubRateLimitError(f"GitHub rate limited {path}")
+
+    async def _get_json(
+        self,
+        path: str,
+        params: dict | None = None,
+        priority: int = INTERACTIVE,
+    ) -> tuple[Any, bool]:
+        """GET a JSON resource, revalidating with `If-None-Match` when possible.
+
+        Returns (payload, not_modified). A 304 replays the cached payload;
+        authenticated 304s do not count against the GitHub rate limit.
+        The cache only saves quota: callers must not treat `not_modified`
+        as "already stored", since the write that followed the first
+        fetch may have failed.
+        """
+        headers = dict(self._headers)
+        cache_key = (path, tuple(sorted((params or {}).items())))
+        cached = _etag_cache.get(cache_key) if self._scheduler is not None else None
+        if cached is not None:
+            headers["If-None-Match"] = cached[0]
+
+        resp = await self._send(path, headers, params, priority)
+        if resp.status_code == 304 and cached is not None:
+            _etag_cache.move_to_end(cache_key)
+            return cached[1], True
+        resp.raise_for_status()
+
+        payload = resp.json()
+        etag = resp.headers.get("ETag")
+        if etag and self._scheduler is not None:
+            _etag_cache[cache_key] = (etag, payload)
+            _etag_cache.move_to_end(cache_key)
+            while len(_etag_cache) > settings.GITHUB_ETAG_CACHE_MAX_ENTRIES:
+                _etag_cache.popitem(last=False)
+        return payload, False
+
     async def get_user(self, username: str) -> dict:
         """Fetch a GitHub user's public profile."""
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{GITHUB_API}/users/{username}",
-                headers=self._headers,
-            )
-            resp.raise_for_status()
-            return resp.json()
-
-    async def get_user_repos(
-        self, username: str, limit: int = 10
-    ) -> list[dict]:
-        """Fetch a user's public repos sorted by most recently pushed."""
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{GITHUB_API}/users/{username}/repos",
-                headers=self._headers,
-                params={
-                    "sort": "pushed",
-                    "direction": "desc",
-                    "per_page": limit,
-                    "type": "owner",
-                },
-            )
-            resp.raise_for_status()
-            repos = resp.json()
+        payload, _ = await self._get_json(f"/users/{username}")
+        return payload
+
+    async def list_user_repos(
+        self, username: str, limit: int = 10, priority: int = INTERACTIVE
+    ) -> tuple[list[dict], bool]:
+        """Fetch a user's public repos sorted by most recently pushed.
+
+        Returns (repos, not_modified) so callers can skip work when the
+        listing has not changed since the previous fetch.
+        """
+        repos, not_modified = await self._get_json(
+            f"/users/{username}/repos",
+            params={
+                "sort": "pushed",
+                "direction": "desc",
+                "per_page": limit,
+                "type": "owner",
+            },
+            priority=priority,
+        )
 
         return [
             {
@@ -57,10 +196,17 @@ class GitHubClient:
                 "updated_at": r["pushed_at"],
             }
             for r in repos
-        ]
+        ], not_modified
+
+    async def get_repo_languages(
+        self, full_name: str, priority: int = INTERACTIVE
+    ) -> dict[str, int]:
+        """Fetch the byte count per language for one repository."""
+        payload, _ = await self._get_json(
+            f"/repos/{full_name}/languages", priority=priority
+        )
+        return payload
+
 
-    async def get_user_languages(self, username: str) -> list[str]:
-        """Extract unique languages from a user's top repos."""
-        repos = await self.get_user_repos(username, limit=20)
-        languages = {r["language"] for r in repos if r["language"]}
-        return sorted(languages)
+# Shared default instance for unauthenticated calls.
+github_client = GitHubClient()
@@ -0,0 +1,193 @@
+"""Rate-limit-aware request scheduler for the GitHub REST API.
+
+Tracks the primary quota (`X-RateLimit-*`) and secondary-limit
+`Retry-After` back-off per credential and rotates across a pool of tokens.
+Interactive requests are served first and may spend any remaining quota;
+bulk requests are paced by a token bucket that spreads the quota until the
+reset time and never dip into a reserve kept for interactive traffic.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+from app.core.config import settings
+
+INTERACTIVE = 0
+BULK = 1
+
+_PRIORITY_NAMES = {INTERACTIVE: "interactive", BULK: "bulk"}
+
+
+class GitHubRateLimitError(Exception):
+    """Raised when no credential has quota within the allowed wait."""
+
+
+@dataclass
+class Credential:
+    """Quota state for one token (or the anonymous client when token is None)."""
+    label: str
+    token: str | None
+    limit: int
+    remaining: int
+    reset_at: float
+    blocked_until: float = 0.0
+    tokens: float = 0.0  # token-bucket fill
+    refilled_at: float = field(default_factory=time.time)
+
+    @property
+    def auth_header(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+    def _refill(self, now: float) -> float:
+        """Refill the bucket and return the current rate (requests/s)."""
+        window = max(self.reset_at - now, 1.0)
+        rate = max(self.remaining, 0) / window
+        self.tokens = min(
+            float(settings.GITHUB_BURST), self.tokens + rate * (now - self.refilled_at)
+        )
+        self.refilled_at = now
+        return rate
+
+    def ready_at(self, now: float, priority: int) -> float:
+        """Earliest time this credential may send a request of `priority`."""
+        if now >= self.reset_at:
+            # The window rolled over; assume a full quota until headers say otherwise.
+            self.remaining = self.limit
+            self.reset_at = now + 3600
+        if now < self.blocked_until:
+            return self.blocked_until
+        if priority == INTERACTIVE:
+            return now if self.remaining > 0 else self.reset_at
+
+        reserve = int(self.limit * settings.GITHUB_BULK_RESERVE_FRACTION)
+        if self.remaining <= reserve:
+            return self.reset_at
+
+        rate = self._refill(now)
+        if self.tokens >= 1.0:
+            return now
+        return now + (1.0 - self.tokens) / rate if rate > 0 else self.reset_at
+
+
+class GitHubScheduler:
+    """Hands out credentials to callers in priority order, within quota."""
+
+    def __init__(self, tokens: list[str]):
+        now = time.time()
+        if tokens:
+            self.credentials = [
+                Credential(f"token-{i}", t, 5000, 5000, now + 3600, tokens=settings.GITHUB_BURST)
+                for i, t in enumerate(tokens)
+            ]
+        else:
+            self.credentials = [
+                Credential("anonymous", None, 60, 60, now + 3600, tokens=settings.GITHUB_BURST)
+            ]
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+        self.granted = {INTERACTIVE: 0, BULK: 0}
+        self.rate_limited = 0
+
+    async def acquire(self, priority: int = INTERACTIVE) -> Credential:
+        """Wait for a credential with quota; interactive callers go first."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Credential] = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        self._dispatch()
+
+        timeout = settings.GITHUB_MAX_WAIT_SECONDS if priority == INTERACTIVE else None
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise GitHubRateLimitError("GitHub quota exhausted for all credentials")
+
+    def update(self, credential: Credential, response: httpx.Response) -> bool:
+        """Record quota headers. Returns True if the response was rate limited."""
+        headers = response.headers
+        now = time.time()
+        if "X-RateLimit-Limit" in headers:
+            credential.limit = int(headers["X-RateLimit-Limit"])
+        if "X-RateLimit-Remaining" in headers:
+            credential.remaining = int(headers["X-RateLimit-Remaining"])
+        if "X-RateLimit-Reset" in headers:
+            credential.reset_at = float(headers["X-RateLimit-Reset"])
+
+        limited = response.status_code in (403, 429) and (
+            "Retry-After" in headers or credential.remaining == 0
+        )
+        if limited:
+            self.rate_limited += 1
+            if "Retry-After" in headers:
+                credential.blocked_until = now + float(headers["Retry-After"])
+            else:
+                credential.blocked_until = credential.reset_at
+        self._dispatch()
+        return limited
+
+    def metrics(self) -> dict:
+        """Queue depth per priority and quota headroom per credential."""
+        depth = {name: 0 for name in _PRIORITY_NAMES.values()}
+        for priority, _, future in self._waiters:
+            if not future.done():
+                depth[_PRIORITY_NAMES[priority]] += 1
+        return {
+            "queue_depth": depth,
+            "granted": {_PRIORITY_NAMES[p]: n for p, n in self.granted.items()},
+            "rate_limited": self.rate_limited,
+            "credentials": [
+                {
+                    "label": c.label,
+                    "limit": c.limit,
+                    "remaining": c.remaining,
+                    "reset_at": c.reset_at,
+                    "blocked_until": c.blocked_until,
+                }
+                for c in self.credentials
+            ],
+        }
+
+    def _dispatch(self) -> None:
+        """Grant credentials to waiters in priority order until one must wait."""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():  # cancelled or timed out
+                heapq.heappop(self._waiters)
+                continue
+
+            now = time.time()
+            # Earliest-ready credential; ties go to the one with most quota left.
+            ready_at, _, index = min(
+                (c.ready_at(now, priority), -c.remaining, i)
+                for i, c in enumerate(self.credentials)
+            )
+            if ready_at > now:
+                loop = asyncio.get_running_loop()
+                self._wakeup = loop.call_later(ready_at - now, self._dispatch)
+                return
+
+            credential = self.credentials[index]
+            if priority == BULK:
+                credential.tokens -= 1.0
+            credential.remaining -= 1  # optimistic; corrected by response headers
+            heapq.heappop(self._waiters)
+            self.granted[priority] += 1
+            future.set_result(credential)
+
+
+def _configured_tokens() -> list[str]:
+    return [t.strip() for t in settings.GITHUB_TOKENS.split(",") if t.strip()]
+
+
+github_scheduler = GitHubScheduler(_configured_tokens())
@@ -0,0 +1,192 @@
+"""In-process background job queue with a worker pool and retries."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+RETRYING = "retrying"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+_ACTIVE = {QUEUED, RUNNING, RETRYING}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class Job:
+    """One unit of work, identified for dedupe by `key`."""
+    key: str
+    run: Callable[[], Awaitable[Any]] = field(repr=False)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = QUEUED
+    attempts: int = 0
+    last_error: str | None = None
+    enqueued_at: datetime = field(default_factory=_now)
+    updated_at: datetime = field(default_factory=_now)
+
+    @property
+    def active(self) -> bool:
+        return self.status in _ACTIVE
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "key": self.key,
+            "status": self.status,
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "enqueued_at": self.enqueued_at,
+            "updated_at": self.updated_at,
+        }
+
+
+class JobQueue:
+    """Async FIFO queue drained by `workers` coroutines.
+
+    Jobs with the same key are deduplicated while one is still active.
+    Failures are retried with exponential backoff plus jitter, up to
+    `max_attempts`. Finished jobs are kept (bounded by `history_size`)
+    so their state can be inspected.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        workers: int = 4,
+        max_attempts: int = 5,
+        backoff_base: float = 2.0,
+        backoff_max: float = 300.0,
+        history_size: int = 10_000,
+        is_retryable: Callable[[Exception], bool] = lambda e: True,
+    ):
+        self.name = name
+        self._workers = workers
+        self._max_attempts = max_attempts
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._history_size = history_size
+        self._is_retryable = is_retryable
+        self._queue: asyncio.Queue[Job] = asyncio.Queue()
+        self._jobs: OrderedDict[str, Job] = OrderedDict()  # key -> latest job
+        self._tasks: list[asyncio.Task] = []
+        self._retries: set[asyncio.Task] = set()
+
+    # ── Producer side ──────────────────────────────────────────
+
+    def enqueue(self, key: str, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Job:
+        """Queue `fn(*args, **kwargs)` unless a job for `key` is already active."""
+        existing = self._jobs.get(key)
+        if existing is not None and existing.active:
+            return existing
+
+        job = Job(key=key, run=lambda: fn(*args, **kwargs))
+        self._remember(job)
+        self._queue.put_nowait(job)
+        return job
+
+    def get(self, key: str) -> Job | None:
+        """Return the most recent job for `key`, if any."""
+        return self._jobs.get(key)
+
+    def snapshot(self) -> dict:
+        """Counts per status plus the current queue depth."""
+        counts = {s: 0 for s in (QUEUED, RUNNING, RETRYING, SUCCEEDED, FAILED)}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return {"name": self.name, "depth": self._queue.qsize(), **counts}
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    # ── Lifecycle ──────────────────────────────────────────────
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"{self.name}-worker-{i}")
+            for i in range(self._workers)
+        ]
+
+    async def stop(self) -> None:
+        tasks = [*self._tasks, *self._retries]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._retries.clear()
+
+    async def join(self) -> None:
+        """Wait until every queued job (including pending retries) is done."""
+        while True:
+            await self._queue.join()
+            if not self._retries:
+                return
+            await asyncio.sleep(0.05)
+
+    # ── Internals ──────────────────────────────────────────────
+
+    def _remember(self, job: Job) -> None:
+        self._jobs[job.key] = job
+        self._jobs.move_to_end(job.key)
+        if len(self._jobs) > self._history_size:
+            for key in list(self._jobs):
+                if len(self._jobs) <= self._history_size:
+                    break
+                if not self._jobs[key].active:
+                    del self._jobs[key]
+
+    def _set_status(self, job: Job, status: str) -> None:
+        job.status = status
+        job.updated_at = _now()
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self._backoff_max, self._backoff_base * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _retry_later(self, job: Job, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._set_status(job, QUEUED)
+        self._queue.put_nowait(job)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self._set_status(job, RUNNING)
+            job.attempts += 1
+            try:
+                await job.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.last_error = f"{type(e).__name__}: {e}"
+                if job.attempts < self._max_attempts and self._is_retryable(e):
+                    self._set_status(job, RETRYING)
+                    task = asyncio.create_task(
+                        self._retry_later(job, self._backoff(job.attempts))
+                    )
+                    self._retries.add(task)
+                    task.add_done_callback(self._retries.discard)
+                else:
+                    self._set_status(job, FAILED)
+                    logger.warning("%s job %s failed: %s", self.name, job.key, job.last_error)
+            else:
+                job.last_error = None
+                self._set_status(job, SUCCEEDED)
+            finally:
+                self._queue.task_done()
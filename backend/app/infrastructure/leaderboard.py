@@ -0,0 +1,283 @@
+"""In-memory XP leaderboards: global and per technology.
+
+Every profile is a `(-xp, id)` key in an indexable skip list, one for the
+whole site and one per technology in its stack, so top-K pages and a
+user's position are O(log n) instead of a sort or a `count(*)` per
+request. Positions are competition-style: one plus the number of profiles
+with strictly more XP, so ties share a position.
+
+The lists are bulk-built from a paged scan on start-up and then kept
+current incrementally: by `upsert` from this process's profile writes,
+by a catch-up every LEADERBOARD_CATCH_UP_SECONDS that replays profiles
+whose `updated_at` moved (XP from database triggers and other workers
+included), and by a full reconcile every LEADERBOARD_RECONCILE_SECONDS
+that drops deleted profiles and repairs drifted rank tiers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.infrastructure.skip_list import IndexableSkipList
+from app.infrastructure.supabase_repository import ProfileRepository, QueryTimeoutError
+
+logger = logging.getLogger(__name__)
+
+_PAGE = 5000
+# Catch-ups start this far before the last one so rows committed late (or
+# stamped by a skewed clock) are not skipped.
+_SYNC_SLACK = timedelta(seconds=60)
+
+# Mirrors calculate_rank() in the schema.
+RANK_TIERS = ((5000, "Principal"), (2000, "Staff"), (500, "Senior"), (100, "Junior"))
+
+
+def rank_for(xp: int) -> str:
+    for floor, rank in RANK_TIERS:
+        if xp >= floor:
+            return rank
+    return "Intern"
+
+
+def _sync_mark() -> str:
+    return (datetime.now(timezone.utc) - _SYNC_SLACK).isoformat()
+
+
+def _tech_keys(techs: list[str] | None) -> frozenset[str]:
+    return frozenset(t.strip().lower() for t in techs or () if t and t.strip())
+
+
+def _build_boards(
+    rows: dict[str, tuple[int, frozenset[str]]],
+) -> tuple[IndexableSkipList, dict[str, IndexableSkipList]]:
+    by_tech: dict[str, list[tuple[int, str]]] = {}
+    for user_id, (xp, techs) in rows.items():
+        for tech in techs:
+            by_tech.setdefault(tech, []).append((-xp, user_id))
+    global_board = IndexableSkipList((-xp, user_id) for user_id, (xp, _) in rows.items())
+    return global_board, {tech: IndexableSkipList(keys) for tech, keys in by_tech.items()}
+
+
+class LeaderboardIndex:
+    """Skip-list leaderboards over every profile's XP."""
+
+    def __init__(self, catch_up_seconds: float = 30.0, reconcile_seconds: float = 3600.0):
+        self._catch_up_seconds = catch_up_seconds
+        self._reconcile_seconds = reconcile_seconds
+        self._entries: dict[str, tuple[int, frozenset[str]]] = {}
+        self._global = IndexableSkipList()
+        self._by_tech: dict[str, IndexableSkipList] = {}
+        self._loaded = asyncio.Event()
+        self._synced_at: str | None = None
+        self._reconciled_at = 0.0
+        self._task: asyncio.Task | None = None
+        # Local writes made while a full scan was in flight; the scan's
+        # (older) copy of these rows is not applied over them.
+        self._touched: set[str] | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ── Writes ───────────────────────────────────────────────────
+
+    def upsert(self, user_id: str, xp: int | None, techs: list[str] | None) -> None:
+        """Record a profile's current XP and tech stack."""
+        if self._touched is not None:
+            self._touched.add(user_id)
+        self._put(user_id, xp or 0, _tech_keys(techs))
+
+    def remove(self, user_id: str) -> None:
+        if self._touched is not None:
+            self._touched.add(user_id)
+        self._drop(user_id)
+
+    def _put(self, user_id: str, xp: int, techs: frozenset[str]) -> None:
+        old = self._entries.get(user_id)
+        if old == (xp, techs):
+            return
+        if old is not None:
+            self._drop(user_id)
+        key = (-xp, user_id)
+        self._entries[user_id] = (xp, techs)
+        self._global.insert(key)
+        for tech in techs:
+            board = self._by_tech.get(tech)
+            if board is None:
+                board = self._by_tech[tech] = IndexableSkipList()
+            board.insert(key)
+
+    def _drop(self, user_id: str) -> None:
+        old = self._entries.pop(user_id, None)
+        if old is None:
+            return
+        key = (-old[0], user_id)
+        self._global.remove(key)
+        for tech in old[1]:
+            board = self._by_tech[tech]
+            board.remove(key)
+            if not board:
+                del self._by_tech[tech]
+
+    # ── Queries ──────────────────────────────────────────────────
+
+    def _board(self, tech: str | None) -> IndexableSkipList | None:
+        if tech is None:
+            return self._global
+        return self._by_tech.get(tech.strip().lower())
+
+    def size(self, tech: str | None = None) -> int:
+        board = self._board(tech)
+        return len(board) if board is not None else 0
+
+    def top(self, limit: int, offset: int = 0, tech: str | None = None) -> list[tuple[int, str, int]]:
+        """(position, user_id, xp) for `limit` profiles from `offset`, best first."""
+        board = self._board(tech)
+        if board is None:
+            return []
+        page = []
+        position = prev_xp = None
+        for index, (neg_xp, user_id) in enumerate(board.islice(offset, offset + limit), start=offset):
+            xp = -neg_xp
+            if xp != prev_xp:
+                position = index + 1 if prev_xp is not None else board.bisect_left((neg_xp, "")) + 1
+                prev_xp = xp
+            page.append((position, user_id, xp))
+        return page
+
+    def position(self, user_id: str, tech: str | None = None) -> tuple[int, int] | None:
+        """(position, xp) of a profile, or None if it isn't on that board."""
+        entry = self._entries.get(user_id)
+        board = self._board(tech)
+        if entry is None or board is None:
+            return None
+        if tech is not None and tech.strip().lower() not in entry[1]:
+            return None
+        return board.bisect_left((-entry[0], "")) + 1, entry[0]
+
+    async def ready(self, timeout: float = 5.0) -> None:
+        """Wait for the initial load; QueryTimeoutError if it takes too long."""
+        if self._loaded.is_set():
+            return
+        try:
+            await asyncio.wait_for(self._loaded.wait(), timeout)
+        except asyncio.TimeoutError:
+            raise QueryTimeoutError("Leaderboard is still loading") from None
+
+    # ── Sync ─────────────────────────────────────────────────────
+
+    async def load(self) -> None:
+        """Full scan: bulk-build on first load, diff-apply afterwards."""
+        mark = _sync_mark()
+        self._touched = set()
+        try:
+            rows: dict[str, tuple[int, frozenset[str]]] = {}
+            after = None
+            while True:
+                page = await ProfileRepository.xp_page(_PAGE, after_id=after)
+                for row in page:
+                    rows[row["id"]] = (row.get("xp") or 0, _tech_keys(row.get("tech_stack")))
+                if len(page) < _PAGE:
+                    break
+                after = page[-1]["id"]
+
+            if not self._loaded.is_set():
+                # Building the lists is seconds of CPU for a large site; do it
+                # off the event loop, then swap them in.
+                boards = await asyncio.to_thread(_build_boards, rows)
+                self._swap(rows, *boards)
+            else:
+                for user_id in self._entries.keys() - rows.keys() - self._touched:
+                    self._drop(user_id)
+                for user_id, (xp, techs) in rows.items():
+                    if user_id not in self._touched:
+                        self._put(user_id, xp, techs)
+        finally:
+            self._touched = None
+        self._synced_at = mark
+        self._reconciled_at = time.monotonic()
+        self._loaded.set()
+
+    def _swap(
+        self,
+        rows: dict[str, tuple[int, frozenset[str]]],
+        global_board: IndexableSkipList,
+        by_tech: dict[str, IndexableSkipList],
+    ) -> None:
+        """Install freshly built boards, then re-apply local writes made
+        during the scan on top of them."""
+        local = {user_id: self._entries.get(user_id) for user_id in self._touched or ()}
+        self._entries, self._global, self._by_tech = rows, global_board, by_tech
+        for user_id, entry in local.items():
+            if entry is None:
+                self._drop(user_id)
+            else:
+                self._put(user_id, *entry)
+
+    async def catch_up(self) -> int:
+        """Apply profiles updated since the last sync; returns how many."""
+        mark = _sync_mark()
+        since = self._synced_at or mark
+        applied = 0
+        after = None
+        while True:
+            page = await ProfileRepository.xp_changed_since(since, _PAGE, after=after)
+            for row in page:
+                self._put(row["id"], row.get("xp") or 0, _tech_keys(row.get("tech_stack")))
+            applied += len(page)
+            if len(page) < _PAGE:
+                break
+            after = (page[-1]["updated_at"], page[-1]["id"])
+        self._synced_at = mark
+        return applied
+
+    async def reconcile(self) -> int:
+        """Full re-scan plus a rank-tier repair in the database; returns
+        the number of ranks fixed."""
+        await self.load()
+        return await ProfileRepository.recompute_ranks()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _sync_loop(self) -> None:
+        while not self._loaded.is_set():
+            try:
+                await self.load()
+            except Exception:
+                logger.exception("Leaderboard load failed")
+                await asyncio.sleep(self._catch_up_seconds)
+        while True:
+            await asyncio.sleep(self._catch_up_seconds)
+            try:
+                if time.monotonic() - self._reconciled_at >= self._reconcile_seconds:
+                    fixed = await self.reconcile()
+                    if fixed:
+                        logger.info("Leaderboard reconcile repaired %d rank tiers", fixed)
+                else:
+                    await self.catch_up()
+            except Exception:
+                logger.exception("Leaderboard sync failed")
+
+    def stats(self) -> dict:
+        return {
+            "profiles": len(self._entries),
+            "technologies": len(self._by_tech),
+            "loaded": self._loaded.is_set(),
+        }
+
+
+leaderboard = LeaderboardIndex(
+    settings.LEADERBOARD_CATCH_UP_SECONDS,
+    settings.LEADERBOARD_RECONCILE_SECONDS,
+)
@@ -0,0 +1,264 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Counters, gauges and histograms live in one `registry` that GET /metrics
+renders. Collectors registered with `registry.add_collector` report state
+owned elsewhere (cache hit counts, queue depths) at scrape time, so hot
+paths don't pay for them.
+
+Each HTTP request also gets a `RequestTrace` in a context variable. Timed
+outbound calls (Supabase, GitHub) add to it, and the slow-request log uses
+it to show where the time went.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+# Latency buckets (seconds) shared by the request and outbound histograms.
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+Sample = tuple[str, dict[str, str], float]  # (name, labels, value)
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [
+        f'{n}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(10), " ").replace(chr(34), chr(92) + chr(34))}"'
+        for n, v in zip(names, values)
+    ]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: tuple[str, ...], child) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"]
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        if i < len(self.counts):
+            self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _render_child(self, values: tuple[str, ...], child: _HistogramValue) -> list[str]:
+        names = self.labelnames + ("le",)
+        lines, cumulative = [], 0
+        for bound, n in zip(self.buckets, child.counts):
+            cumulative += n
+            labels = _format_labels(names, values + (_format_value(bound),))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        lines.append(f"{self.name}_bucket{_format_labels(names, values + ('+Inf',))} {child.count}")
+        plain = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{plain} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{plain} {child.count}")
+        return lines
+
+
+class Registry:
+    """Named metrics plus scrape-time collectors."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[tuple[str, str, str, Callable[[], Iterable[Sample]]]] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))  # type: ignore[return-value]
+
+    def add_collector(
+        self, name: str, kind: str, help: str, collect: Callable[[], Iterable[Sample]]
+    ) -> None:
+        """Report a family whose samples are read at scrape time.
+
+        `collect` yields (sample_name, labels, value); sample names must
+        start with `name`.
+        """
+        self._collectors.append((name, kind, help, collect))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        for name, kind, help, collect in self._collectors:
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+            for sample, labels, value in collect():
+                lines.append(
+                    f"{sample}{_format_labels(labels.keys(), labels.values())} {_format_value(value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+outbound_seconds = registry.histogram(
+    "devdate_outbound_duration_seconds",
+    "Outbound call latency by service and target (table, RPC or endpoint).",
+    ("service", "target"),
+)
+outbound_errors = registry.counter(
+    "devdate_outbound_errors_total",
+    "Outbound calls that raised or timed out.",
+    ("service", "target"),
+)
+
+
+# ── Per-request trace ─────────────────────────────────────────
+
+
+@dataclass
+class RequestTrace:
+    """Where one request spent its time: {service: [seconds, calls]}."""
+
+    started: float = field(default_factory=time.perf_counter)
+    spans: dict[str, list[float]] = field(default_factory=dict)
+    calls: list[tuple[str, float]] = field(default_factory=list)  # (service:target, seconds)
+
+    def add(self, service: str, target: str, seconds: float) -> None:
+        span = self.spans.setdefault(service, [0.0, 0])
+        span[0] += seconds
+        span[1] += 1
+        if len(self.calls) < 50:
+            self.calls.append((f"{service}:{target}", seconds))
+
+    def breakdown(self) -> dict:
+        total = time.perf_counter() - self.started
+        out = {s: {"ms": round(v[0] * 1000, 2), "calls": int(v[1])} for s, v in self.spans.items()}
+        # Outbound calls may overlap, so "app" is a lower bound on local time.
+        out["app"] = {"ms": round(max(0.0, total - sum(v[0] for v in self.spans.values())) * 1000, 2)}
+        return out
+
+
+current_trace: ContextVar[RequestTrace | None] = ContextVar("current_trace", default=None)
+
+
+def observe_outbound(service: str, target: str, seconds: float, ok: bool = True) -> None:
+    """Record one outbound call in the histograms and the current request's trace."""
+    outbound_seconds.labels(service, target).observe(seconds)
+    if not ok:
+        outbound_errors.labels(service, target).inc()
+    trace = current_trace.get()
+    if trace is not None:
+        trace.add(service, target, seconds)
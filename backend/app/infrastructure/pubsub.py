@@ -0,0 +1,138 @@
+"""Pub/sub bridge so every worker can deliver to its own WebSockets.
+
+Publishers never talk to sockets directly: they publish to a channel and
+each process that has local subscribers for it fans the message out. The
+in-memory backend keeps that within one process (tests, single worker);
+the Redis backend spans workers and nodes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Protocol
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str, dict], None]
+
+
+class PubSub(Protocol):
+    async def publish(self, channel: str, message: dict) -> None: ...
+
+    async def subscribe(self, channel: str, handler: Handler) -> None: ...
+
+    async def unsubscribe(self, channel: str, handler: Handler) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class _HandlerRegistry:
+    def __init__(self) -> None:
+        self._handlers: dict[str, list[Handler]] = {}
+
+    def add(self, channel: str, handler: Handler) -> bool:
+        """Register a handler; True if it is the channel's first."""
+        handlers = self._handlers.setdefault(channel, [])
+        handlers.append(handler)
+        return len(handlers) == 1
+
+    def remove(self, channel: str, handler: Handler) -> bool:
+        """Unregister a handler; True if the channel has none left."""
+        handlers = self._handlers.get(channel, [])
+        if handler in handlers:
+            handlers.remove(handler)
+        if not handlers:
+            self._handlers.pop(channel, None)
+            return True
+        return False
+
+    def dispatch(self, channel: str, message: dict) -> None:
+        for handler in list(self._handlers.get(channel, ())):
+            try:
+                handler(channel, message)
+            except Exception:
+                logger.exception("pubsub handler failed on %s", channel)
+
+
+class InMemoryPubSub:
+    """Single-process bridge: publish calls local handlers directly."""
+
+    def __init__(self) -> None:
+        self._registry = _HandlerRegistry()
+
+    async def publish(self, channel: str, message: dict) -> None:
+        self._registry.dispatch(channel, message)
+
+    async def subscribe(self, channel: str, handler: Handler) -> None:
+        self._registry.add(channel, handler)
+
+    async def unsubscribe(self, channel: str, handler: Handler) -> None:
+        self._registry.remove(channel, handler)
+
+    async def close(self) -> None:
+        return None
+
+
+class RedisPubSub:
+    """Cross-process bridge over Redis PUBLISH/SUBSCRIBE (JSON payloads)."""
+
+    def __init__(self, client: Any):
+        self._client = client
+        self._pubsub = client.pubsub()
+        self._registry = _HandlerRegistry()
+        self._reader: asyncio.Task | None = None
+
+    async def publish(self, channel: str, message: dict) -> None:
+        await self._client.publish(channel, json.dumps(message, default=str))
+
+    async def subscribe(self, channel: str, handler: Handler) -> None:
+        if self._registry.add(channel, handler):
+            await self._pubsub.subscribe(channel)
+        if self._reader is None:
+            self._reader = asyncio.create_task(self._read())
+
+    async def unsubscribe(self, channel: str, handler: Handler) -> None:
+        if self._registry.remove(channel, handler):
+            await self._pubsub.unsubscribe(channel)
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+        await self._pubsub.close()
+
+    async def _read(self) -> None:
+        while True:
+            try:
+                msg = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("redis pubsub read failed")
+                await asyncio.sleep(1.0)
+                continue
+            if msg is None:
+                continue
+            channel = msg["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            self._registry.dispatch(channel, json.loads(msg["data"]))
+
+
+def build_pubsub() -> PubSub:
+    """Create the bridge selected by PUBSUB_BACKEND ("memory" or "redis")."""
+    if settings.PUBSUB_BACKEND == "redis":
+        if not settings.REDIS_URL:
+            raise ValueError("REDIS_URL is not configured in .env")
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("PUBSUB_BACKEND=redis requires the `redis` package") from e
+        return RedisPubSub(redis.from_url(settings.REDIS_URL))
+    return InMemoryPubSub()
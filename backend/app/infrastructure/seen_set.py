@@ -0,0 +1,178 @@
+"""Per-user set of profiles already swiped, used to exclude them from feeds.
+
+Each resident user has a scalable Bloom filter (a few bits per swipe, false
+positives bounded by SEEN_FALSE_POSITIVE_RATE, no false negatives), so a
+candidate list is filtered in memory instead of shipping a `NOT IN` list
+to the database. A false positive only hides an unseen card.
+
+Filters are loaded lazily: from the last checkpoint in `seen_filters` plus
+the swipes made since, or rebuilt from `swipes` when there is none. Dirty
+filters are checkpointed in the background, and resident filters replay
+newer swipes every SEEN_REFRESH_SECONDS so other workers' swipes show up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.infrastructure.bloom import ScalableBloomFilter, hash_ids
+from app.infrastructure.cache import SingleFlight
+from app.infrastructure.supabase_repository import SeenFilterRepository, SwipeRepository
+
+logger = logging.getLogger(__name__)
+
+_PAGE = 1000
+# Replays start this far before the last sync so swipes still sitting in a
+# write buffer (or written with a skewed clock) are not skipped.
+_SYNC_SLACK = timedelta(seconds=60)
+
+
+def _sync_mark() -> str:
+    return (datetime.now(timezone.utc) - _SYNC_SLACK).isoformat()
+
+
+@dataclass
+class _Entry:
+    bloom: ScalableBloomFilter
+    synced_at: str  # swipes created after this may be missing from `bloom`
+    refreshed_at: float = field(default_factory=time.monotonic)
+
+
+class SeenSetStore:
+    """Bloom-filter seen-sets, bounded by the number of users kept resident."""
+
+    def __init__(self, max_users: int = 50_000):
+        self._max_users = max_users
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._dirty: set[str] = set()
+        self._loads = SingleFlight()
+        self._persister: asyncio.Task | None = None
+
+    def _new_bloom(self) -> ScalableBloomFilter:
+        return ScalableBloomFilter(
+            settings.SEEN_FALSE_POSITIVE_RATE, settings.SEEN_INITIAL_CAPACITY
+        )
+
+    async def _get(self, user_id: str) -> _Entry:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            entry = await self._loads.do(user_id, lambda: self._load(user_id))
+        elif time.monotonic() - entry.refreshed_at > settings.SEEN_REFRESH_SECONDS:
+            entry.refreshed_at = time.monotonic()
+            await self._replay(user_id, entry)
+        self._entries.move_to_end(user_id)
+        return entry
+
+    async def _load(self, user_id: str) -> _Entry:
+        checkpoint = await SeenFilterRepository.get(user_id)
+        if checkpoint is not None:
+            entry = _Entry(
+                ScalableBloomFilter.from_bytes(checkpoint["filter"]), checkpoint["synced_at"]
+            )
+            await self._replay(user_id, entry)
+        else:
+            entry = _Entry(self._new_bloom(), _sync_mark())
+            after = None
+            while True:
+                targets = await SwipeRepository.targets_of(user_id, _PAGE, after_target=after)
+                entry.bloom.add(hash_ids(targets))
+                if len(targets) < _PAGE:
+                    break
+                after = targets[-1]
+            self._dirty.add(user_id)
+
+        self._entries[user_id] = entry
+        while len(self._entries) > self._max_users:
+            evicted, _ = self._entries.popitem(last=False)
+            self._dirty.discard(evicted)
+        return entry
+
+    async def _replay(self, user_id: str, entry: _Entry) -> None:
+        """Add swipes made since the entry's last sync."""
+        mark = _sync_mark()
+        since = entry.synced_at
+        while True:
+            rows = await SwipeRepository.targets_since(user_id, since, _PAGE)
+            if entry.bloom.add(hash_ids([r["target_id"] for r in rows])):
+                self._dirty.add(user_id)
+            if len(rows) < _PAGE:
+                break
+            since = rows[-1]["created_at"]
+        entry.synced_at = mark
+
+    async def add(self, user_id: str, target_id: str) -> None:
+        entry = await self._get(user_id)
+        if entry.bloom.add(hash_ids([target_id])):
+            self._dirty.add(user_id)
+
+    async def contains(self, user_id: str, target_id: str) -> bool:
+        entry = await self._get(user_id)
+        return bool(entry.bloom.contains(hash_ids([target_id]))[0])
+
+    async def filter_unseen(self, user_id: str, candidate_ids: list[str]) -> list[str]:
+        """Return the candidates the user has not swiped, preserving order."""
+        if not candidate_ids:
+            return []
+        entry = await self._get(user_id)
+        seen = entry.bloom.contains(hash_ids(candidate_ids))
+        return [c for c, s in zip(candidate_ids, seen) if not s]
+
+    # ── Checkpointing ────────────────────────────────────────────
+
+    async def persist(self) -> int:
+        """Write dirty filters to `seen_filters`; returns how many were written."""
+        dirty, self._dirty = self._dirty, set()
+        now = datetime.now(timezone.utc).isoformat()
+        rows = []
+        for user_id in dirty:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                continue
+            rows.append({
+                "user_id": user_id,
+                "filter": entry.bloom.to_bytes(),
+                "item_count": len(entry.bloom),
+                "synced_at": entry.synced_at,
+                "updated_at": now,
+            })
+        try:
+            for start in range(0, len(rows), 100):
+                await SeenFilterRepository.upsert_many(rows[start : start + 100])
+        except Exception:
+            self._dirty |= dirty  # try again next round
+            raise
+        return len(rows)
+
+    async def start(self) -> None:
+        if self._persister is None:
+            self._persister = asyncio.create_task(self._persist_loop())
+
+    async def stop(self) -> None:
+        if self._persister is not None:
+            self._persister.cancel()
+            await asyncio.gather(self._persister, return_exceptions=True)
+            self._persister = None
+        try:
+            await self.persist()
+        except Exception:
+            logger.exception("Final seen-filter checkpoint failed")
+
+    async def _persist_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.SEEN_PERSIST_SECONDS)
+            try:
+                await self.persist()
+            except Exception:
+                logger.exception("Seen-filter checkpoint failed")
+
+    def memory_bytes(self) -> int:
+        return sum(entry.bloom.nbytes for entry in self._entries.values())
+
+
+seen_set = SeenSetStore(settings.SEEN_MAX_USERS)
@@ -0,0 +1,167 @@
+"""Indexable skip list: a sorted sequence with O(log n) rank queries.
+
+Every forward link stores its width (how many positions it skips), so the
+search that finds a key also counts the keys before it, and the i-th key
+is found by walking widths down from the top level. Insert, remove,
+`bisect_left` and `__getitem__` are O(log n) expected; `islice` then
+walks the bottom level.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any, Iterable, Iterator
+
+_MAX_LEVELS = 24  # enough for ~16M keys at p = 1/2
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key: Any, levels: int):
+        self.key = key
+        self.next: list[_Node | None] = [None] * levels
+        self.width: list[int] = [1] * levels
+
+
+def _random_levels(rng: random.Random) -> int:
+    """1 + the number of trailing one bits: level k with probability 2^-k."""
+    bits = rng.getrandbits(_MAX_LEVELS - 1)
+    return (bits ^ (bits + 1)).bit_length()
+
+
+class IndexableSkipList:
+    """Unique, mutually comparable keys in ascending order."""
+
+    __slots__ = ("_head", "_size", "_levels", "_rng")
+
+    def __init__(self, keys: Iterable[Any] = (), seed: int | None = None):
+        self._rng = random.Random(seed)
+        self._head = _Node(None, _MAX_LEVELS)
+        self._size = 0
+        self._levels = 1  # levels in use; searches start at the top one
+        self._build(sorted(keys))
+
+    def _build(self, keys: list) -> None:
+        """Link already-sorted keys in one pass (O(n)).
+
+        Levels are assigned deterministically (every 2^k-th key reaches
+        level k + 1), which gives a perfectly balanced list without
+        drawing a random number per key.
+        """
+        head = self._head
+        last: list[_Node] = [head] * _MAX_LEVELS
+        last_pos = [0] * _MAX_LEVELS  # 1-based position of last[level]; head is 0
+        for pos, key in enumerate(keys, start=1):
+            node = _Node(key, min((pos & -pos).bit_length(), _MAX_LEVELS))
+            for level in range(len(node.next)):
+                prev = last[level]
+                prev.next[level] = node
+                prev.width[level] = pos - last_pos[level]
+                last[level], last_pos[level] = node, pos
+        n = len(keys)
+        for level in range(_MAX_LEVELS):
+            last[level].width[level] = n + 1 - last_pos[level]
+        self._size = n
+        self._levels = max(1, sum(1 for nxt in head.next if nxt is not None))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: Any) -> bool:
+        node = self._head
+        for level in reversed(range(self._levels)):
+            while (nxt := node.next[level]) is not None and nxt.key < key:
+                node = nxt
+        nxt = node.next[0]
+        return nxt is not None and nxt.key == key
+
+    def insert(self, key: Any) -> None:
+        new = _Node(key, _random_levels(self._rng))
+        height = len(new.next)
+        if height > self._levels:
+            for level in range(self._levels, height):
+                self._head.width[level] = self._size + 1  # spans the whole list
+            self._levels = height
+        levels = self._levels
+        chain: list[_Node] = [self._head] * levels
+        steps = [0] * levels
+        node = self._head
+        for level in reversed(range(levels)):
+            while (nxt := node.next[level]) is not None and nxt.key < key:
+                steps[level] += node.width[level]
+                node = nxt
+            chain[level] = node
+
+        offset = 0  # keys between chain[level] and the new node
+        for level in range(height):
+            prev = chain[level]
+            new.next[level] = prev.next[level]
+            prev.next[level] = new
+            new.width[level] = prev.width[level] - offset
+            prev.width[level] = offset + 1
+            offset += steps[level]
+        for level in range(height, levels):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key: Any) -> None:
+        """Remove `key`; KeyError if absent."""
+        levels = self._levels
+        chain: list[_Node] = [self._head] * levels
+        node = self._head
+        for level in reversed(range(levels)):
+            while (nxt := node.next[level]) is not None and nxt.key < key:
+                node = nxt
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), levels):
+            chain[level].width[level] -= 1
+        self._size -= 1
+
+    def bisect_left(self, key: Any) -> int:
+        """Number of keys strictly less than `key`."""
+        node, rank = self._head, 0
+        for level in reversed(range(self._levels)):
+            while (nxt := node.next[level]) is not None and nxt.key < key:
+                rank += node.width[level]
+                node = nxt
+        return rank
+
+    def _node_at(self, index: int) -> _Node:
+        node, remaining = self._head, index + 1
+        for level in reversed(range(self._levels)):
+            while node.next[level] is not None and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        return node
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("skip list index out of range")
+        return self._node_at(index).key
+
+    def islice(self, start: int, stop: int) -> Iterator[Any]:
+        """Keys at positions start..stop-1 (clamped to the list)."""
+        start, stop = max(start, 0), min(stop, self._size)
+        if start >= stop:
+            return
+        node = self._node_at(start)
+        for _ in range(stop - start):
+            yield node.key
+            node = node.next[0]
+
+    def __iter__(self) -> Iterator[Any]:
+        node = self._head.next[0]
+        while node is not None:
+            yield node.key
+            node = node.next[0]
@@ -1,22 +1,160 @@
-from supabase import create_client, Client
+"""Supabase client registry: lazily created, pooled clients per role.
+
+  clients.anon          anon key; Supabase Auth calls (code exchange, get_user)
+  clients.admin         service role key; bypasses Row Level Security
+  clients.for_user(jwt) PostgREST client acting as the caller, so RLS applies
+  db()                  what the repositories query with: admin when the
+                        service key is configured, otherwise a separate anon
+                        client
+
+Clients are built on first use, not at import, and all of them share one
+pooled `httpx.Client` (SUPABASE_HTTP_*), so a per-user client costs a few
+dict copies rather than a new connection pool (this needs the
+`httpx_client` options of supabase/postgrest 2.x, pinned in
+requirements.txt). `close()` releases the pool on shutdown; `override()`
+lets tests swap in a fake client.
+
+The SDK itself (supabase, gotrue, postgrest, realtime, storage) is only
+imported when the first client is built, which keeps it out of process
+start-up; `warm_up()` does that off the event loop once the app is serving.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+import httpx
+
 from app.core.config import settings
 
+if TYPE_CHECKING:
+    from postgrest import SyncPostgrestClient
+    from supabase import Client, ClientOptions
+
+logger = logging.getLogger(__name__)
+
+
+class SupabaseClients:
+    """Builds each client once and hands out the cached instance."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._clients: dict[str, Client] = {}
+        self._http: httpx.Client | None = None
+
+    # ── Roles ──────────────────────────────────────────────────
+
+    @property
+    def anon(self) -> Client:
+        return self._get("anon", settings.SUPABASE_KEY)
+
+    @property
+    def admin(self) -> Client:
+        """Service-role client. WARNING: bypasses Row Level Security."""
+        if not settings.SUPABASE_SERVICE_KEY:
+            raise ValueError("SUPABASE_SERVICE_KEY is not configured in .env")
+        return self._get("admin", settings.SUPABASE_SERVICE_KEY)
+
+    @property
+    def data(self) -> Client:
+        if settings.SUPABASE_SERVICE_KEY:
+            return self.admin
+        # Not `anon`: a code exchange signs that client in and would swap
+        # the Authorization header every repository query is sent with.
+        return self._get("data", settings.SUPABASE_KEY)
+
+    def for_user(self, access_token: str) -> SyncPostgrestClient:
+        """PostgREST client that sends the caller's JWT, so RLS policies apply."""
+        headers = {
+            "apikey": settings.SUPABASE_KEY,
+            "Authorization": f"Bearer {access_token}",
+        }
+        from postgrest import SyncPostgrestClient
+
+        rest_url = f"{settings.SUPABASE_URL.rstrip('/')}/rest/v1"
+        return SyncPostgrestClient(rest_url, headers=headers, http_client=self._transport())
+
+    # ── Lifecycle ──────────────────────────────────────────────
+
+    def warm_up(self) -> None:
+        """Import the SDK and build the clients requests will need (blocking)."""
+        self.data
+        self.anon
+
+    def override(self, role: str, client: Client) -> None:
+        """Use `client` for `role` ("anon", "admin" or "data"), e.g. in tests."""
+        with self._lock:
+            self._clients[role] = client
+
+    def close(self) -> None:
+        """Drop every client and close the shared connection pool."""
+        with self._lock:
+            self._clients.clear()
+            http, self._http = self._http, None
+        if http is not None:
+            http.close()
+
+    def _get(self, role: str, key: str) -> Client:
+        client = self._clients.get(role)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(role)
+                if client is None:
+                    from supabase import create_client
+
+                    client = self._clients[role] = create_client(
+                        settings.SUPABASE_URL, key, options=self._options()
+                    )
+        return client
+
+    def _options(self) -> ClientOptions:
+        from supabase import ClientOptions
+
+        # Server-side clients never refresh or persist a session of their own.
+        return ClientOptions(
+            auto_refresh_token=False,
+            persist_session=False,
+            postgrest_client_timeout=settings.SUPABASE_HTTP_TIMEOUT_SECONDS,
+            httpx_client=self._transport(),
+        )
+
+    def _transport(self) -> httpx.Client:
+        http = self._http
+        if http is None:
+            with self._lock:
+                if self._http is None:
+                    self._http = httpx.Client(
+                        timeout=settings.SUPABASE_HTTP_TIMEOUT_SECONDS,
+                        limits=httpx.Limits(
+                            max_connections=settings.SUPABASE_HTTP_MAX_CONNECTIONS,
+                            max_keepalive_connections=settings.SUPABASE_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                            keepalive_expiry=settings.SUPABASE_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                        ),
+                    )
+                http = self._http
+        return http
+
+
+clients = SupabaseClients()
+
+
+def db() -> Client:
+    """The client repositories build queries on."""
+    return clients.data
 
-def get_supabase_client() -> Client:
-    """Create and return a Supabase client using the anon key (for user-facing operations)."""
-    return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
 
+def warm_up_in_background() -> None:
+    """FastAPI lifespan hook: build the clients on a worker thread.
 
-def get_supabase_admin_client() -> Client:
-    """Create and return a Supabase client using the service role key (for admin operations).
-    
-    WARNING: This client bypasses Row Level Security.
-    Only use for server-side admin tasks (e.g. creating users, managing data).
+    Start-up doesn't wait for it; a request that needs a client first just
+    waits for the build in progress.
     """
-    if not settings.SUPABASE_SERVICE_KEY:
-        raise ValueError("SUPABASE_SERVICE_KEY is not configured in .env")
-    return create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
 
+    def done(future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning("Supabase client warm-up failed: %s", future.exception())
 
-# Singleton instances (reused across the app)
-supabase: Client = get_supabase_client()
+    asyncio.get_running_loop().run_in_executor(None, clients.warm_up).add_done_callback(done)
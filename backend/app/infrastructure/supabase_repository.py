@@ -0,0 +1,591 @@
+"""Non-blocking data access on top of the synchronous Supabase client.
+
+supabase-py performs blocking HTTP inside `.execute()`. Every call here is
+offloaded to a bounded thread pool, gated by a semaphore and a per-call
+timeout, so the event loop keeps serving other requests while PostgREST
+answers. Repositories hand `execute` a builder rather than a query, so
+touching the client (and building it on first use) happens there too.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.core.config import settings
+from app.infrastructure.metrics import observe_outbound, registry
+from app.infrastructure.supabase_client import db
+
+T = TypeVar("T")
+
+
+class QueryTimeoutError(Exception):
+    """Raised when a Supabase call does not finish within its timeout."""
+
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.SUPABASE_MAX_CONCURRENCY,
+    thread_name_prefix="supabase",
+)
+_semaphores: dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+# Health probes get their own threads and skip the semaphore, so a busy
+# pool delays requests, not the readiness check.
+_probe_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="supabase-probe")
+
+_pool_wait_seconds = registry.histogram(
+    "devdate_supabase_pool_wait_seconds",
+    "Time Supabase calls spent waiting for a worker slot.",
+)
+
+
+def _semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    sem = _semaphores.get(loop)
+    if sem is None:
+        sem = _semaphores[loop] = asyncio.Semaphore(settings.SUPABASE_MAX_CONCURRENCY)
+    return sem
+
+
+async def run_sync(
+    fn: Callable[..., T],
+    *args: Any,
+    timeout: float | None = None,
+    target: str | Callable[[], str] | None = None,
+    **kwargs: Any,
+) -> T:
+    """Run a blocking Supabase SDK call on the worker pool.
+
+    At most SUPABASE_MAX_CONCURRENCY calls are in flight; the rest wait
+    on the semaphore instead of piling up in the executor queue. The call
+    is timed under `target` (default: the function's name), which may be
+    a callable evaluated once the call is over.
+    """
+    timeout = timeout or settings.SUPABASE_QUERY_TIMEOUT_SECONDS
+    loop = asyncio.get_running_loop()
+    queued = time.perf_counter()
+    async with _semaphore():
+        started = time.perf_counter()
+        _pool_wait_seconds.observe(started - queued)
+        future = loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+        ok = False
+        try:
+            result = await asyncio.wait_for(future, timeout)
+            ok = True
+            return result
+        except asyncio.TimeoutError:
+            raise QueryTimeoutError(f"Supabase call timed out after {timeout}s")
+        finally:
+            if callable(target):
+                target = target()
+            observe_outbound(
+                "supabase",
+                target or getattr(fn, "__name__", "call"),
+                time.perf_counter() - started,
+                ok,
+            )
+
+
+def _query_target(query: Any) -> str:
+    """Metric label for a query builder: "profiles.GET" or "rpc:match_candidates"."""
+    request = getattr(query, "request", query)
+    path = str(getattr(request, "path", "")).split("?", 1)[0].rstrip("/")
+    name = path.rsplit("/", 1)[-1] or "unknown"
+    if path.rsplit("/", 2)[-2:-1] == ["rpc"]:
+        return f"rpc:{name}"
+    method = getattr(request, "http_method", "") or ""
+    return f"{name}.{method}" if method else name
+
+
+async def execute(build: Callable[[], Any], timeout: float | None = None) -> Any:
+    """Build a PostgREST query with `build()` and execute it on the worker pool.
+
+    The query is built on the worker thread too: the first one creates the
+    client (SDK import, create_client, or waiting on a warm-up in progress),
+    which must not stall the event loop.
+    """
+    target = "unknown"
+
+    def call() -> Any:
+        nonlocal target
+        query = build()
+        target = _query_target(query)
+        return query.execute()
+
+    return await run_sync(call, timeout=timeout, target=lambda: target)
+
+
+async def ping(timeout: float | None = None) -> None:
+    """Cheapest real round-trip to PostgREST; raises if Supabase is unreachable.
+
+    Runs outside the request semaphore and worker pool, so it measures
+    Supabase rather than how many queries are queued in this process.
+    """
+    timeout = timeout or settings.SUPABASE_QUERY_TIMEOUT_SECONDS
+
+    def call() -> Any:
+        return db().table("profiles").select("id").limit(1).execute()
+
+    future = asyncio.get_running_loop().run_in_executor(_probe_executor, call)
+    started = time.perf_counter()
+    ok = False
+    try:
+        await asyncio.wait_for(future, timeout)
+        ok = True
+    except asyncio.TimeoutError:
+        raise QueryTimeoutError(f"Supabase ping timed out after {timeout}s")
+    finally:
+        observe_outbound("supabase", "ping", time.perf_counter() - started, ok)
+
+
+def pool_saturated() -> bool:
+    """True while every worker slot is taken, so new queries have to wait."""
+    sem = _semaphores.get(asyncio.get_running_loop())
+    return sem is not None and sem.locked()
+
+
+def shutdown() -> None:
+    """Stop accepting work and let in-flight calls finish."""
+    _executor.shutdown(wait=False, cancel_futures=True)
+    _probe_executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ProfileRepository:
+    """Queries against the `profiles` table."""
+
+    @staticmethod
+    async def get_by_id(user_id: str) -> dict | None:
+        result = await execute(
+            lambda: db().table("profiles").select("*").eq("id", user_id).maybe_single()
+        )
+        return result.data if result else None
+
+    @staticmethod
+    async def get_by_username(username: str) -> dict | None:
+        result = await execute(
+            lambda: db().table("profiles")
+            .select("*")
+            .eq("github_username", username)
+            .maybe_single()
+        )
+        return result.data if result else None
+
+    @staticmethod
+    async def update(user_id: str, data: dict) -> dict:
+        result = await execute(
+            lambda: db().table("profiles").update(data).eq("id", user_id)
+        )
+        return result.data[0] if result.data else {}
+
+    @staticmethod
+    async def get_many(ids: list[str], columns: str = "*") -> list[dict]:
+        """Fetch several profiles in one `in` query (unordered)."""
+        if not ids:
+            return []
+        result = await execute(
+            lambda: db().table("profiles").select(columns).in_("id", ids)
+        )
+        return result.data or []
+
+    @staticmethod
+    async def get_many_by_username(usernames: list[str], columns: str = "*") -> list[dict]:
+        """Fetch several profiles by GitHub username in one `in` query (unordered)."""
+        if not usernames:
+            return []
+        result = await execute(
+            lambda: db().table("profiles").select(columns).in_("github_username", usernames)
+        )
+        return result.data or []
+
+    @staticmethod
+    async def page(
+        columns: str,
+        limit: int,
+        techs: list[str] | None = None,
+        match_all: bool = True,
+        after: tuple[str, str] | None = None,
+    ) -> list[dict]:
+        """One keyset page ordered by (created_at desc, id desc).
+
+        `after` is the (created_at, id) of the last row already returned.
+        """
+        def build():
+            query = db().table("profiles").select(columns)
+            if techs:
+                query = (
+                    query.contains("tech_stack", techs)
+                    if match_all
+                    else query.overlaps("tech_stack", techs)
+                )
+            if after is not None:
+                created_at, last_id = after
+                # The `lte` is redundant with the `or` but lets the index scan
+                # start at the cursor instead of filtering every newer row.
+                query = query.lte("created_at", created_at).or_(
+                    f'created_at.lt."{created_at}",'
+                    f'and(created_at.eq."{created_at}",id.lt.{last_id})'
+                )
+            return query.order("created_at", desc=True).order("id", desc=True).limit(limit)
+
+        result = await execute(build)
+        return result.data or []
+
+    @staticmethod
+    async def nearby_page(
+        lat: float,
+        lng: float,
+        radius_km: float,
+        limit: int,
+        techs: list[str] | None = None,
+        match_all: bool = True,
+        after: tuple[float, str] | None = None,
+    ) -> list[dict]:
+        """Keyset page of {id, distance_m} ordered by distance (PostGIS RPC)."""
+        result = await execute(
+            lambda: db().rpc(
+                "nearby_profiles_page",
+                {
+                    "lat": lat,
+                    "lng": lng,
+                    "radius_km": radius_km,
+                    "filter_techs": techs or None,
+                    "match_all": match_all,
+                    "after_distance_m": after[0] if after else None,
+                    "after_id": after[1] if after else None,
+                    "max_results": limit,
+                },
+            )
+        )
+        return result.data or []
+
+    @staticmethod
+    async def points_in_box(
+        min_lat: float,
+        min_lng: float,
+        max_lat: float,
+        max_lng: float,
+        limit: int,
+        after_id: str | None = None,
+    ) -> list[dict]:
+        """Located profiles in a lat/lng box as {id, location_lat, location_lng,
+        tech_stack}, keyset-paged by id (loads the geo index)."""
+        result = await execute(
+            lambda: db().rpc(
+                "profile_points_in_box",
+                {
+                    "min_lat": min_lat,
+                    "min_lng": min_lng,
+                    "max_lat": max_lat,
+                    "max_lng": max_lng,
+                    "after_id": after_id,
+                    "max_results": limit,
+                },
+            )
+        )
+        return result.data or []
+
+    # ── Candidate generation (matching) ─────────────────────────
+
+    @staticmethod
+    async def list_by_tech_overlap(
+        techs: list[str], exclude_id: str, columns: str, limit: int
+    ) -> list[dict]:
+        result = await execute(
+            lambda: db().table("profiles")
+            .select(columns)
+            .overlaps("tech_stack", techs)
+            .neq("id", exclude_id)
+            .limit(limit)
+        )
+        return result.data or []
+
+    @staticmethod
+    async def list_by_xp_range(
+        low: int, high: int, exclude_id: str, columns: str, limit: int
+    ) -> list[dict]:
+        result = await execute(
+            lambda: db().table("profiles")
+            .select(columns)
+            .gte("xp", low)
+            .lte("xp", high)
+            .neq("id", exclude_id)
+            .order("xp", desc=True)
+            .limit(limit)
+        )
+        return result.data or []
+
+    @staticmethod
+    async def list_updated_since(
+        since: str, exclude_id: str, columns: str, limit: int
+    ) -> list[dict]:
+        result = await execute(
+            lambda: db().table("profiles")
+            .select(columns)
+            .gt("updated_at", since)
+            .neq("id", exclude_id)
+            .order("updated_at")
+            .limit(limit)
+        )
+        return result.data or []
+
+    @staticmethod
+    async def nearby(
+        lat: float, lng: float, radius_km: float, filter_tech: str | None = None
+    ) -> list[dict]:
+        result = await execute(
+            lambda: db().rpc(
+                "nearby_profiles",
+                {
+                    "lat": lat,
+                    "lng": lng,
+                    "radius_km": radius_km,
+                    "filter_tech": filter_tech,
+                },
+            )
+        )
+        return result.data or []
+
+    @staticmethod
+    async def xp_page(limit: int, after_id: str | None = None) -> list[dict]:
+        """{id, xp, tech_stack} of every profile, keyset-paged by id (loads
+        the leaderboards)."""
+        def build():
+            query = db().table("profiles").select("id,xp,tech_stack")
+            if after_id is not None:
+                query = query.gt("id", after_id)
+            return query.order("id").limit(limit)
+
+        result = await execute(build)
+        return result.data or []
+
+    @staticmethod
+    async def xp_changed_since(
+        since: str,
+        limit: int,
+        after: tuple[str, str] | None = None,
+    ) -> list[dict]:
+        """{id, xp, tech_stack, updated_at} of profiles updated at or after
+        `since`, ordered by (updated_at, id).
+
+        `after` is the (updated_at, id) of the last row already returned.
+        """
+        def build():
+            query = db().table("profiles").select("id,xp,tech_stack,updated_at").gte("updated_at", since)
+            if after is not None:
+                updated_at, last_id = after
+                query = query.gte("updated_at", updated_at).or_(
+                    f'updated_at.gt."{updated_at}",'
+                    f'and(updated_at.eq."{updated_at}",id.gt.{last_id})'
+                )
+            return query.order("updated_at").order("id").limit(limit)
+
+        result = await execute(build)
+        return result.data or []
+
+    @staticmethod
+    async def recompute_ranks() -> int:
+        """Repair rank tiers that drifted from calculate_rank(xp); returns rows fixed."""
+        result = await execute(lambda: db().rpc("recompute_profile_ranks", {}))
+        return result.data or 0
+
+    @staticmethod
+    async def stale_page(
+        stale_before: str,
+        limit: int,
+        after: tuple[str | None, str] | None = None,
+    ) -> list[dict]:
+        """Profiles last enriched before `stale_before`, stalest first, as
+        {id, github_username, enriched_at, enrichment_hash}.
+
+        `after` is the (enriched_at, id) of the last row already returned.
+        """
+        result = await execute(
+            lambda: db().rpc(
+                "stale_profiles_page",
+                {
+                    "stale_before": stale_before,
+                    "after_enriched_at": after[0] if after else None,
+                    "after_id": after[1] if after else None,
+                    "max_results": limit,
+                },
+            )
+        )
+        return result.data or []
+
+    @staticmethod
+    async def apply_enrichment(rows: list[dict]) -> None:
+        """Write back a batch of refreshed enrichment fields in one statement."""
+        if rows:
+            await execute(lambda: db().rpc("apply_profile_enrichment", {"p_rows": rows}))
+
+
+class ConnectionRepository:
+    """Queries against the `connections` table (accepted ones are conversations)."""
+
+    @staticmethod
+    async def get_by_id(connection_id: str) -> dict | None:
+        result = await execute(
+            lambda: db().table("connections")
+            .select("id,requester_id,target_id,status")
+            .eq("id", connection_id)
+            .maybe_single()
+        )
+        return result.data if result else None
+
+    @staticmethod
+    async def create_mutual(requester_id: str, target_id: str) -> dict:
+        """Accepted connection for a mutual like (idempotent RPC)."""
+        result = await execute(
+            lambda: db().rpc(
+                "create_mutual_connection",
+                {"p_requester": requester_id, "p_target": target_id},
+            )
+        )
+        return result.data[0] if result.data else {}
+
+
+class MessageRepository:
+    """Queries against `messages` and `conversation_reads`."""
+
+    @staticmethod
+    async def insert_many(rows: list[dict]) -> None:
+        """Bulk insert; ids are client-side so a retried batch is a no-op."""
+        await execute(
+            lambda: db().table("messages").upsert(rows, on_conflict="id", ignore_duplicates=True)
+        )
+
+    @staticmethod
+    async def page(
+        conversation_id: str,
+        limit: int,
+        before: tuple[str, str] | None = None,
+        after: tuple[str, str] | None = None,
+    ) -> list[dict]:
+        """One keyset page of a conversation.
+
+        Newest first, older than `before` when given; with `after`, the
+        messages newer than it in ascending order. The range bound next to
+        each `or` keeps the scan on idx_messages_conversation_created.
+        """
+        def build():
+            query = (
+                db().table("messages")
+                .select("id,conversation_id,sender_id,content,created_at")
+                .eq("conversation_id", conversation_id)
+            )
+            if after is not None:
+                created_at, last_id = after
+                query = query.gte("created_at", created_at).or_(
+                    f'created_at.gt."{created_at}",'
+                    f'and(created_at.eq."{created_at}",id.gt.{last_id})'
+                )
+                query = query.order("created_at").order("id")
+            else:
+                if before is not None:
+                    created_at, last_id = before
+                    query = query.lte("created_at", created_at).or_(
+                        f'created_at.lt."{created_at}",'
+                        f'and(created_at.eq."{created_at}",id.lt.{last_id})'
+                    )
+                query = query.order("created_at", desc=True).order("id", desc=True)
+            return query.limit(limit)
+
+        result = await execute(build)
+        return result.data or []
+
+    @staticmethod
+    async def mark_read(conversation_id: str, user_id: str, read_at: str) -> None:
+        await execute(
+            lambda: db().table("conversation_reads").upsert(
+                {"conversation_id": conversation_id, "user_id": user_id, "last_read_at": read_at},
+                on_conflict="conversation_id,user_id",
+            )
+        )
+
+    @staticmethod
+    async def summaries(user_id: str, limit: int) -> list[dict]:
+        """Inbox rows with last-message preview and unread count (one RPC)."""
+        result = await execute(
+            lambda: db().rpc(
+                "conversation_summaries",
+                {"p_user_id": user_id, "max_results": limit},
+            )
+        )
+        return result.data or []
+
+
+class SwipeRepository:
+    """Queries against the `swipes` table."""
+
+    @staticmethod
+    async def record_many(rows: list[dict]) -> None:
+        """Upsert a batch of swipes in one RPC (latest swipe per pair wins)."""
+        await execute(lambda: db().rpc("record_swipes", {"p_swipes": rows}))
+
+    @staticmethod
+    async def likers_of(user_id: str) -> list[str]:
+        """Ids of everyone who liked `user_id`."""
+        result = await execute(
+            lambda: db().table("swipes")
+            .select("swiper_id")
+            .eq("target_id", user_id)
+            .eq("direction", "like")
+        )
+        return [row["swiper_id"] for row in result.data or []]
+
+    @staticmethod
+    async def targets_of(
+        user_id: str, limit: int, after_target: str | None = None
+    ) -> list[str]:
+        """One page of the profiles `user_id` swiped on, by target id."""
+        def build():
+            query = db().table("swipes").select("target_id").eq("swiper_id", user_id)
+            if after_target is not None:
+                query = query.gt("target_id", after_target)
+            return query.order("target_id").limit(limit)
+
+        result = await execute(build)
+        return [row["target_id"] for row in result.data or []]
+
+    @staticmethod
+    async def targets_since(user_id: str, since: str, limit: int) -> list[dict]:
+        """{target_id, created_at} of swipes made after `since`, oldest first."""
+        result = await execute(
+            lambda: db().table("swipes")
+            .select("target_id,created_at")
+            .eq("swiper_id", user_id)
+            .gt("created_at", since)
+            .order("created_at")
+            .limit(limit)
+        )
+        return result.data or []
+
+
+class SeenFilterRepository:
+    """Checkpoints of per-user seen filters (`seen_filters`, bytea as hex)."""
+
+    @staticmethod
+    async def get(user_id: str) -> dict | None:
+        result = await execute(
+            lambda: db().table("seen_filters")
+            .select("filter,item_count,synced_at")
+            .eq("user_id", user_id)
+            .maybe_single()
+        )
+        if not result or not result.data:
+            return None
+        row = result.data
+        row["filter"] = bytes.fromhex(row["filter"].removeprefix("\\x"))
+        return row
+
+    @staticmethod
+    async def upsert_many(rows: list[dict]) -> None:
+        """Rows of {user_id, filter: bytes, item_count, synced_at}."""
+        await execute(
+            lambda: db().table("seen_filters").upsert(
+                [{**row, "filter": "\\x" + row["filter"].hex()} for row in rows],
+                on_conflict="user_id",
+            )
+        )
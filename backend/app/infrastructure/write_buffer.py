@@ -0,0 +1,154 @@
+"""Write-behind buffer that batches row inserts.
+
+Callers `submit` a row and await its acknowledgement; a single flusher task
+collects rows for up to `max_delay` seconds (or `max_batch` rows) and writes
+them with one call. The acknowledgement resolves only after that call has
+succeeded, so an ack is durable while a burst of N writes costs one
+round-trip instead of N. A batch that still fails after its retries is
+bisected so one bad row fails only its own acknowledgement.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from app.infrastructure.supabase_repository import QueryTimeoutError
+
+logger = logging.getLogger(__name__)
+
+FlushFn = Callable[[list[dict]], Awaitable[None]]
+
+
+class BatchWriter:
+    """Batches rows for `flush_fn`; retries a failed batch, then bisects it."""
+
+    def __init__(
+        self,
+        name: str,
+        flush_fn: FlushFn,
+        max_batch: int = 500,
+        max_delay: float = 0.02,
+        max_pending: int = 10_000,
+        retries: int = 2,
+    ):
+        self.name = name
+        self._flush_fn = flush_fn
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._max_pending = max_pending
+        self._retries = retries
+        self._queue: asyncio.Queue[tuple[dict, asyncio.Future | None]] | None = None
+        self._flusher: asyncio.Task | None = None
+        self.flushed_rows = 0
+        self.flushed_batches = 0
+        self.failed_rows = 0
+
+    async def start(self) -> None:
+        if self._flusher is None:
+            self._queue = asyncio.Queue(maxsize=self._max_pending)
+            self._flusher = asyncio.create_task(self._run(), name=f"{self.name}-flusher")
+
+    async def stop(self) -> None:
+        """Flush everything already submitted, then stop."""
+        if self._flusher is None:
+            return
+        await self._queue.join()
+        self._flusher.cancel()
+        await asyncio.gather(self._flusher, return_exceptions=True)
+        self._flusher = None
+
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, row: dict) -> None:
+        """Queue a row and wait until the batch containing it is written."""
+        future = asyncio.get_running_loop().create_future()
+        await self._put(row, future)
+        await future
+
+    async def submit_nowait(self, row: dict) -> None:
+        """Queue a row without waiting for the write (blocks only when full)."""
+        await self._put(row, None)
+
+    async def _put(self, row: dict, future: asyncio.Future | None) -> None:
+        if self._queue is None:
+            raise RuntimeError(f"BatchWriter {self.name!r} is not started")
+        await self._queue.put((row, future))  # backpressure when max_pending is hit
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            if self._queue.qsize() < self._max_batch - 1:
+                await asyncio.sleep(self._max_delay)  # let the batch fill
+            while len(batch) < self._max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: list[tuple[dict, asyncio.Future | None]]) -> None:
+        rows = [row for row, _ in batch]
+        error: Exception | None = None
+        for attempt in range(self._retries + 1):
+            try:
+                await self._flush_fn(rows)
+                error = None
+                break
+            except Exception as e:
+                error = e
+                logger.warning(
+                    "%s: flush of %d rows failed (attempt %d): %s",
+                    self.name, len(rows), attempt + 1, e,
+                )
+                if attempt < self._retries:
+                    await asyncio.sleep(0.1 * 2**attempt)
+
+        if error is None:
+            self._settle(batch, None)
+        elif len(batch) > 1 and not isinstance(error, QueryTimeoutError):
+            # Most likely one bad row (constraint, payload) rather than an
+            # outage, which the retries above already covered: split the
+            # batch so the good rows still land.
+            mid = len(batch) // 2
+            await self._bisect(batch[:mid])
+            await self._bisect(batch[mid:])
+        else:
+            self._settle(batch, error)
+
+    async def _bisect(self, batch: list[tuple[dict, asyncio.Future | None]]) -> None:
+        """Write one half of a failed batch, splitting again until the bad rows are isolated."""
+        try:
+            await self._flush_fn([row for row, _ in batch])
+        except Exception as e:
+            if len(batch) == 1 or isinstance(e, QueryTimeoutError):
+                logger.warning("%s: dropping %d rows: %s", self.name, len(batch), e)
+                self._settle(batch, e)
+                return
+            mid = len(batch) // 2
+            await self._bisect(batch[:mid])
+            await self._bisect(batch[mid:])
+        else:
+            self._settle(batch, None)
+
+    def _settle(
+        self, batch: list[tuple[dict, asyncio.Future | None]], error: Exception | None
+    ) -> None:
+        if error is None:
+            self.flushed_rows += len(batch)
+            self.flushed_batches += 1
+        else:
+            self.failed_rows += len(batch)
+        for _, future in batch:
+            if future is None or future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
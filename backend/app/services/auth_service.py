@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from app.core.config import settings
-from app.infrastructure.supabase_client import supabase, get_supabase_admin_client
+from app.infrastructure.supabase_client import clients
+from app.infrastructure.supabase_repository import run_sync
+from app.services.profile_service import ProfileService
 
 
 class AuthService:
@@ -32,7 +34,10 @@ class AuthService:
         This is called when the OAuth redirect sends the code back to the backend.
         """
         try:
-            response = supabase.auth.exchange_code_for_session({"auth_code": code})
+            response = await run_sync(
+                lambda: clients.anon.auth.exchange_code_for_session({"auth_code": code}),
+                target="exchange_code_for_session",
+            )
             session = response.session
             user = response.user
 
@@ -59,15 +64,9 @@ class AuthService:
         """Get the profile row for the authenticated user."""
         user_id = user["id"]
 
-        result = (
-            supabase.table("profiles")
-            .select("*")
-            .eq("id", user_id)
-            .maybe_single()
-            .execute()
-        )
+        profile = await ProfileService.get_profile(user_id)
 
-        if result.data is None:
+        if profile is None:
             # Profile might not exist yet if trigger hasn't fired
             meta = user.get("user_metadata", {})
             return {
@@ -77,15 +76,14 @@ class AuthService:
                 "avatar_url": meta.get("avatar_url"),
             }
 
-        return result.data
+        return profile
 
     @staticmethod
     async def sign_out(token: str) -> None:
         """Invalidate a user's session on Supabase side."""
         try:
-            admin = get_supabase_admin_client()
             # Sign out via admin to ensure token is revoked
-            admin.auth.admin.sign_out(token)
+            await run_sync(lambda: clients.admin.auth.admin.sign_out(token), target="sign_out")
         except Exception:
             # Best-effort; client should also clear local tokens
             pass
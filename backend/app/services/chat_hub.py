@@ -0,0 +1,218 @@
+"""In-process WebSocket hub: per-conversation fan-out with backpressure.
+
+Every socket gets a bounded send queue drained by its own task, so one slow
+client never stalls delivery to the others; a client whose queue overflows
+is disconnected (it reconnects and catches up from history). Messages reach
+the hub through the pub/sub bridge, which is how other workers' sockets see
+them too.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Awaitable, Callable
+
+import anyio
+from fastapi import WebSocket, WebSocketDisconnect, status
+
+from app.core.config import settings
+from app.infrastructure.pubsub import PubSub, build_pubsub
+
+logger = logging.getLogger(__name__)
+
+_CHANNEL_PREFIX = "chat:"
+_PING = json.dumps({"type": "ping"})
+
+
+def _channel(conversation_id: str) -> str:
+    return f"{_CHANNEL_PREFIX}{conversation_id}"
+
+
+class Connection:
+    """One authenticated socket and its outbound queue."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user_id: str,
+        expires_at: float | None = None,
+        queue_size: int | None = None,
+    ):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.expires_at = expires_at  # the handshake token's `exp` (epoch seconds)
+        self.conversations: set[str] = set()
+        self.last_seen = time.monotonic()
+        self.close_code = status.WS_1000_NORMAL_CLOSURE
+        self.close_reason = ""
+        self._queue: asyncio.Queue[str] = asyncio.Queue(
+            maxsize=queue_size or settings.CHAT_SEND_QUEUE_SIZE
+        )
+        self._scope: anyio.CancelScope | None = None
+        self._closing = False
+
+    def offer(self, text: str) -> bool:
+        """Queue a frame without blocking; drop the client if it can't keep up."""
+        if self._closing:
+            return False
+        try:
+            self._queue.put_nowait(text)
+            return True
+        except asyncio.QueueFull:
+            self.abort(status.WS_1013_TRY_AGAIN_LATER, "send queue full")
+            return False
+
+    async def send(self, event: dict) -> None:
+        self.offer(json.dumps(event, default=str))
+
+    def abort(self, code: int, reason: str) -> None:
+        """Stop the connection; `ChatHub.serve` does the cleanup."""
+        if self._closing:
+            return
+        self._closing = True
+        self.close_code, self.close_reason = code, reason
+        if self._scope is not None:
+            self._scope.cancel()
+
+    async def _send_loop(self) -> None:
+        while True:
+            await self.websocket.send_text(await self._queue.get())
+
+    async def _heartbeat_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            if time.monotonic() - self.last_seen > 2 * interval:
+                self.abort(status.WS_1001_GOING_AWAY, "heartbeat timeout")
+                return
+            if self.expires_at is not None and time.time() >= self.expires_at:
+                # Auth happens once per socket; make the client re-handshake.
+                self.abort(status.WS_1008_POLICY_VIOLATION, "token expired")
+                return
+            self.offer(_PING)
+
+    async def _receive_loop(
+        self, on_frame: Callable[[Connection, dict], Awaitable[None]]
+    ) -> None:
+        while True:
+            try:
+                text = await self.websocket.receive_text()
+            except (WebSocketDisconnect, RuntimeError):
+                return
+            self.last_seen = time.monotonic()
+            try:
+                frame = json.loads(text)
+            except ValueError:
+                frame = None
+            if not isinstance(frame, dict):
+                await self.send({"type": "error", "detail": "Frames must be JSON objects"})
+                continue
+            await on_frame(self, frame)
+
+
+class ChatHub:
+    """Tracks local sockets per conversation and fans out bridge messages."""
+
+    def __init__(self) -> None:
+        self._pubsub: PubSub | None = None
+        self._rooms: dict[str, set[Connection]] = {}
+        self._connections: set[Connection] = set()
+        self.dropped = 0  # clients disconnected for overflowing their queue
+
+    async def start(self) -> None:
+        if self._pubsub is None:
+            self._pubsub = build_pubsub()
+
+    async def stop(self) -> None:
+        for conn in list(self._connections):
+            conn.abort(status.WS_1001_GOING_AWAY, "server shutting down")
+        if self._pubsub is not None:
+            await self._pubsub.close()
+            self._pubsub = None
+
+    @property
+    def pubsub(self) -> PubSub:
+        if self._pubsub is None:
+            raise RuntimeError("ChatHub.start() has not been called")
+        return self._pubsub
+
+    async def serve(
+        self,
+        conn: Connection,
+        on_frame: Callable[[Connection, dict], Awaitable[None]],
+    ) -> None:
+        """Run an accepted socket until it disconnects or is aborted."""
+        self._connections.add(conn)
+        try:
+            async with anyio.create_task_group() as tg:
+                conn._scope = tg.cancel_scope
+
+                async def run_until_done(loop: Awaitable[None]) -> None:
+                    await loop
+                    tg.cancel_scope.cancel()  # any loop ending ends the socket
+
+                tg.start_soon(run_until_done, conn._send_loop())
+                tg.start_soon(
+                    run_until_done, conn._heartbeat_loop(settings.CHAT_HEARTBEAT_SECONDS)
+                )
+                tg.start_soon(run_until_done, conn._receive_loop(on_frame))
+        finally:
+            with anyio.CancelScope(shield=True):
+                self._connections.discard(conn)
+                for conversation_id in list(conn.conversations):
+                    await self.leave(conn, conversation_id)
+                if conn.close_code == status.WS_1013_TRY_AGAIN_LATER:
+                    self.dropped += 1
+                try:
+                    await conn.websocket.close(code=conn.close_code, reason=conn.close_reason)
+                except RuntimeError:
+                    pass  # already closed by the client
+
+    async def join(self, conn: Connection, conversation_id: str) -> None:
+        members = self._rooms.get(conversation_id)
+        if members is None:
+            members = self._rooms[conversation_id] = set()
+            try:
+                await self.pubsub.subscribe(_channel(conversation_id), self._deliver)
+            except BaseException:
+                # Don't leave a room behind that later joins think is subscribed.
+                if not members and self._rooms.get(conversation_id) is members:
+                    del self._rooms[conversation_id]
+                raise
+        members.add(conn)
+        conn.conversations.add(conversation_id)
+
+    async def leave(self, conn: Connection, conversation_id: str) -> None:
+        conn.conversations.discard(conversation_id)
+        members = self._rooms.get(conversation_id)
+        if members is None:
+            return
+        members.discard(conn)
+        if not members:
+            del self._rooms[conversation_id]
+            if self._pubsub is not None:  # None once the hub has stopped
+                await self._pubsub.unsubscribe(_channel(conversation_id), self._deliver)
+
+    async def publish(self, conversation_id: str, event: dict) -> None:
+        """Deliver an event to every socket in the conversation, on any worker."""
+        await self.pubsub.publish(_channel(conversation_id), event)
+
+    def _deliver(self, channel: str, event: dict) -> None:
+        members = self._rooms.get(channel[len(_CHANNEL_PREFIX):])
+        if not members:
+            return
+        text = json.dumps(event, default=str)  # serialize once per fan-out
+        for conn in list(members):
+            conn.offer(text)
+
+    def metrics(self) -> dict:
+        return {
+            "connections": len(self._connections),
+            "conversations": len(self._rooms),
+            "dropped_slow_consumers": self.dropped,
+        }
+
+
+chat_hub = ChatHub()
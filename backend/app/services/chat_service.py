@@ -0,0 +1,295 @@
+"""Chat business logic — conversation access and the WebSocket protocol.
+
+A conversation is an accepted connection; its two members are the only
+users allowed to subscribe or post. Client frames:
+
+    {"type": "subscribe",   "conversation_id": ...}
+    {"type": "unsubscribe", "conversation_id": ...}
+    {"type": "message",     "conversation_id": ..., "content": ..., "client_id": ...}
+    {"type": "ping"} / {"type": "pong"}
+
+Server frames are "subscribed", "unsubscribed", "message", "ack", "ping",
+"pong" and "error". A message is acknowledged (and fanned out) only after
+it has been written.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.infrastructure.cache import SingleFlight, build_cache
+from app.infrastructure.supabase_repository import ConnectionRepository, MessageRepository
+from app.infrastructure.write_buffer import BatchWriter
+from app.services.chat_hub import Connection, chat_hub
+
+logger = logging.getLogger(__name__)
+
+# conversation id -> [requester_id, target_id]; membership never changes
+# once accepted, so this only has to expire for deleted connections.
+_participants_cache = build_cache(
+    max_entries=50_000,
+    default_ttl=settings.CHAT_PARTICIPANT_CACHE_SECONDS,
+)
+
+
+# Sends are acknowledged once their batch is in the database.
+message_writer = BatchWriter(
+    "messages",
+    MessageRepository.insert_many,
+    max_batch=settings.CHAT_WRITE_BATCH_SIZE,
+    max_delay=settings.CHAT_WRITE_DELAY_SECONDS,
+)
+
+# (conversation_id, sender_id, client_id) -> stored message, so a retried
+# send is not stored or delivered twice.
+_recent_sends: OrderedDict[tuple[str, str, str], dict] = OrderedDict()
+_RECENT_SENDS_MAX = 50_000
+# Concurrent retries of one send wait for the first instead of racing it.
+_sends_in_flight = SingleFlight()
+_MESSAGE_ID_NAMESPACE = uuid.UUID("6f1c0d1e-4a57-4b1e-9a8e-2c3f8d6b7a10")
+
+
+def _message_id(conversation_id: str, sender_id: str, client_id: str | None) -> str:
+    """Random id, or one derived from (conversation, sender, client_id) so
+    retries that reach another process collide on the primary key and are
+    ignored."""
+    if client_id is None:
+        return str(uuid.uuid4())
+    return str(uuid.uuid5(_MESSAGE_ID_NAMESPACE, f"{conversation_id}:{sender_id}:{client_id}"))
+
+
+def _is_uuid(value: object) -> bool:
+    try:
+        uuid.UUID(str(value))
+        return True
+    except ValueError:
+        return False
+
+
+class ChatService:
+    """Conversation membership, message fan-out and socket frame handling."""
+
+    @staticmethod
+    async def get_participants(conversation_id: str) -> list[str] | None:
+        """Member ids of an accepted connection, or None if there is none."""
+        if not _is_uuid(conversation_id):
+            return None
+        key = f"conversation:{conversation_id}:participants"
+        cached = await _participants_cache.get(key)
+        if cached is not None:
+            return cached
+        row = await ConnectionRepository.get_by_id(conversation_id)
+        if row is None or row.get("status") != "accepted":
+            return None
+        participants = [row["requester_id"], row["target_id"]]
+        await _participants_cache.set(key, participants)
+        return participants
+
+    @staticmethod
+    def participant_cache_stats() -> dict:
+        """Lookup counters of the membership cache, for /metrics."""
+        return {"hits": _participants_cache.hits, "misses": _participants_cache.misses}
+
+    @staticmethod
+    async def is_participant(conversation_id: str, user_id: str) -> bool:
+        return user_id in (await ChatService.get_participants(conversation_id) or ())
+
+    @staticmethod
+    async def send_message(
+        conversation_id: str,
+        sender_id: str,
+        content: str,
+        client_id: str | None = None,
+    ) -> dict:
+        """Store a message, then publish it to everyone in the conversation.
+
+        Returns after the write-behind batch holding the message has been
+        written, so the returned message is durable.
+        """
+        if client_id is None:
+            return await ChatService._store_and_publish(conversation_id, sender_id, content, None)
+        previous = _recent_sends.get((conversation_id, sender_id, client_id))
+        if previous is not None:
+            return previous
+        return await _sends_in_flight.do(
+            f"{conversation_id}:{sender_id}:{client_id}",
+            lambda: ChatService._store_and_publish(conversation_id, sender_id, content, client_id),
+        )
+
+    @staticmethod
+    async def _store_and_publish(
+        conversation_id: str, sender_id: str, content: str, client_id: str | None
+    ) -> dict:
+        row = {
+            "id": _message_id(conversation_id, sender_id, client_id),
+            "conversation_id": conversation_id,
+            "sender_id": sender_id,
+            "content": content,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        await message_writer.submit(row)
+        message = {**row, "client_id": client_id}
+
+        if client_id is not None:
+            _recent_sends[(conversation_id, sender_id, client_id)] = message
+            while len(_recent_sends) > _RECENT_SENDS_MAX:
+                _recent_sends.popitem(last=False)
+        await chat_hub.publish(
+            conversation_id,
+            {"type": "message", "conversation_id": conversation_id, "message": message},
+        )
+        return message
+
+    @staticmethod
+    async def get_messages(
+        conversation_id: str,
+        user_id: str,
+        limit: int | None = None,
+        before: str | None = None,
+        after: str | None = None,
+    ) -> tuple[list[dict], str | None, str | None]:
+        """One history page in chronological order, plus (older, newer) cursors.
+
+        No cursor returns the latest page; `before` pages back in time and
+        `after` catches up on messages newer than a known one.
+        """
+        if before and after:
+            raise ValueError("Pass either before or after, not both")
+        if not await ChatService.is_participant(conversation_id, user_id):
+            raise PermissionError("Conversation not found")
+        limit = min(limit or settings.CHAT_HISTORY_PAGE_SIZE, settings.CHAT_HISTORY_MAX_PAGE_SIZE)
+
+        position = decode_cursor(before or after, "c") if (before or after) else None
+        key = (position["c"], position["i"]) if position else None
+        rows = await MessageRepository.page(
+            conversation_id,
+            limit + 1,
+            before=key if before else None,
+            after=key if after else None,
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if not after:
+            rows.reverse()  # fetched newest first
+
+        def cursor(row: dict) -> str:
+            return encode_cursor({"c": row["created_at"], "i": row["id"]})
+
+        if not rows:
+            return [], None, after  # nothing newer yet: keep polling from `after`
+        older = cursor(rows[0]) if (has_more or after) else None
+        newer = cursor(rows[-1])
+        return rows, older, newer
+
+    @staticmethod
+    async def list_conversations(user_id: str, limit: int = 50) -> list[dict]:
+        """Inbox with last-message previews and unread counts."""
+        summaries = []
+        for row in await MessageRepository.summaries(user_id, limit):
+            last = None
+            if row.get("last_message_id"):
+                last = {
+                    "id": row["last_message_id"],
+                    "conversation_id": row["conversation_id"],
+                    "sender_id": row["last_sender_id"],
+                    "content": row["last_content"],
+                    "created_at": row["last_message_at"],
+                }
+            summaries.append({
+                "conversation_id": row["conversation_id"],
+                "other_user_id": row["other_user_id"],
+                "last_message": last,
+                "unread_count": row.get("unread_count") or 0,
+            })
+        return summaries
+
+    @staticmethod
+    async def mark_read(conversation_id: str, user_id: str) -> None:
+        if not await ChatService.is_participant(conversation_id, user_id):
+            raise PermissionError("Conversation not found")
+        await MessageRepository.mark_read(
+            conversation_id, user_id, datetime.now(timezone.utc).isoformat()
+        )
+
+    @staticmethod
+    async def handle_socket(conn: Connection) -> None:
+        """Serve an accepted, authenticated socket until it closes."""
+        await chat_hub.serve(conn, ChatService._on_frame)
+
+    @staticmethod
+    async def _on_frame(conn: Connection, frame: dict) -> None:
+        kind = frame.get("type")
+        if kind == "pong":
+            return
+        if kind == "ping":
+            await conn.send({"type": "pong"})
+            return
+
+        conversation_id = frame.get("conversation_id")
+        if kind not in ("subscribe", "unsubscribe", "message"):
+            await conn.send({"type": "error", "detail": f"Unknown frame type: {kind}"})
+            return
+        if not _is_uuid(conversation_id):
+            await conn.send({"type": "error", "detail": "Invalid conversation_id"})
+            return
+
+        if kind == "unsubscribe":
+            await chat_hub.leave(conn, conversation_id)
+            await conn.send({"type": "unsubscribed", "conversation_id": conversation_id})
+            return
+
+        if conversation_id not in conn.conversations:
+            # A failed lookup or subscribe is answered on this frame; letting
+            # it escape would close the whole socket.
+            try:
+                allowed = await ChatService.is_participant(conversation_id, conn.user_id)
+                if allowed:
+                    await chat_hub.join(conn, conversation_id)
+            except Exception:
+                logger.warning("Chat membership check failed for %s", conversation_id, exc_info=True)
+                await conn.send({
+                    "type": "error",
+                    "conversation_id": conversation_id,
+                    "client_id": frame.get("client_id"),
+                    "detail": "Conversation is temporarily unavailable, retry",
+                })
+                return
+            if not allowed:
+                await conn.send({
+                    "type": "error",
+                    "conversation_id": conversation_id,
+                    "detail": "Not a participant in this conversation",
+                })
+                return
+
+        if kind == "subscribe":
+            await conn.send({"type": "subscribed", "conversation_id": conversation_id})
+        else:
+            content = frame.get("content")
+            if not isinstance(content, str) or not content.strip():
+                await conn.send({"type": "error", "detail": "Message content is required"})
+                return
+            if len(content) > settings.CHAT_MAX_MESSAGE_CHARS:
+                await conn.send({"type": "error", "detail": "Message is too long"})
+                return
+            client_id = frame.get("client_id")
+            try:
+                message = await ChatService.send_message(
+                    conversation_id,
+                    conn.user_id,
+                    content,
+                    str(client_id)[:64] if client_id is not None else None,
+                )
+            except Exception:
+                await conn.send({
+                    "type": "error",
+                    "client_id": client_id,
+                    "detail": "Message could not be stored, retry",
+                })
+                return
+            await conn.send({"type": "ack", "client_id": client_id, "message": message})
@@ -0,0 +1,162 @@
+"""Scheduled bulk GitHub re-enrichment, resumable from a checkpoint file.
+
+Profiles are walked stalest first (`enriched_at`, never-enriched first) in
+keyset pages. Each page is fetched from GitHub concurrently at BULK
+priority, so the scheduler paces it within quota and keeps the
+interactive reserve. Results are compared to the stored `enrichment_hash`:
+changed profiles get their derived fields rewritten, unchanged ones only
+a new `enriched_at`, all in one bulk statement per page.
+
+The staleness cutoff is fixed when a run starts and saved with the keyset
+position after every page, so an interrupted run picks up where it left
+off instead of starting over.
+
+The refresher runs outside the API processes, so it can't update their
+in-memory state directly. Changed rows get a new `updated_at` from the
+profiles trigger. That is how the API workers catch up: the leaderboard
+and match pools pull rows changed since their last sync, and geo cells
+reload after GEO_CELL_TTL_SECONDS. Cached profile rows are only dropped
+across processes with CACHE_BACKEND="redis"; with the in-memory cache,
+workers serve the old row for up to PROFILE_CACHE_TTL_SECONDS.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+
+from app.core.config import settings
+from app.infrastructure.github_scheduler import BULK
+from app.infrastructure.supabase_repository import ProfileRepository
+from app.services.enrichment_service import EnrichmentService
+from app.services.profile_service import ProfileService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RefreshCheckpoint:
+    stale_before: str
+    after_enriched_at: str | None = None
+    after_id: str | None = None
+    stats: dict[str, int] = field(
+        default_factory=lambda: {"scanned": 0, "changed": 0, "unchanged": 0, "missing": 0, "failed": 0}
+    )
+
+    @property
+    def after(self) -> tuple[str | None, str] | None:
+        return (self.after_enriched_at, self.after_id) if self.after_id else None
+
+    @classmethod
+    def load(cls, path: Path) -> RefreshCheckpoint | None:
+        try:
+            return cls(**json.loads(path.read_text()))
+        except FileNotFoundError:
+            return None
+
+    def save(self, path: Path) -> None:
+        # Write-then-rename so a crash never leaves a half-written checkpoint.
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(asdict(self)))
+        os.replace(tmp, path)
+
+
+class EnrichmentRefresher:
+    """One pass over stale profiles; see the module docstring."""
+
+    def __init__(
+        self,
+        checkpoint_path: str | Path = settings.ENRICH_REFRESH_CHECKPOINT,
+        max_age: timedelta = timedelta(hours=settings.ENRICH_REFRESH_MAX_AGE_HOURS),
+        page_size: int = settings.ENRICH_REFRESH_PAGE_SIZE,
+        concurrency: int = settings.ENRICH_REFRESH_CONCURRENCY,
+        max_profiles: int | None = None,
+        dry_run: bool = False,
+    ):
+        self.checkpoint_path = Path(checkpoint_path)
+        self.max_age = max_age
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.max_profiles = max_profiles
+        self.dry_run = dry_run
+
+    async def run(self, resume: bool = True) -> dict[str, int]:
+        """Refresh stale profiles until none are left (or `max_profiles`).
+
+        Returns the cumulative counts, including pages from a resumed run.
+        """
+        state = RefreshCheckpoint.load(self.checkpoint_path) if resume else None
+        if state is None:
+            cutoff = datetime.now(timezone.utc) - self.max_age
+            state = RefreshCheckpoint(stale_before=cutoff.isoformat())
+        else:
+            logger.info("Resuming refresh at %s (%s)", state.after, state.stats)
+
+        sem = asyncio.Semaphore(self.concurrency)
+        processed = 0
+        while self.max_profiles is None or processed < self.max_profiles:
+            limit = self.page_size
+            if self.max_profiles is not None:
+                limit = min(limit, self.max_profiles - processed)
+            rows = await ProfileRepository.stale_page(state.stale_before, limit, state.after)
+            if not rows:
+                break
+
+            results = await asyncio.gather(*(self._refresh_one(row, sem) for row in rows))
+            writes = [write for _, write in results if write is not None]
+            if writes and not self.dry_run:
+                await ProfileRepository.apply_enrichment(writes)
+                for row, (outcome, _) in zip(rows, results):
+                    if outcome == "changed":
+                        await ProfileService.invalidate(row["id"], row["github_username"])
+
+            for outcome, _ in results:
+                state.stats[outcome] += 1
+            state.stats["scanned"] += len(rows)
+            state.after_enriched_at, state.after_id = rows[-1]["enriched_at"], rows[-1]["id"]
+            if not self.dry_run:
+                state.save(self.checkpoint_path)
+            processed += len(rows)
+            logger.info("Refreshed %d profiles: %s", state.stats["scanned"], state.stats)
+            if len(rows) < limit:
+                break
+        else:
+            return state.stats  # stopped at max_profiles: keep the checkpoint
+
+        if not self.dry_run:
+            self.checkpoint_path.unlink(missing_ok=True)
+        return state.stats
+
+    @staticmethod
+    async def _refresh_one(row: dict, sem: asyncio.Semaphore) -> tuple[str, dict | None]:
+        """Fetch one profile's GitHub data; returns (outcome, row to write)."""
+        async with sem:
+            try:
+                update_data = await EnrichmentService.fetch(row["github_username"], priority=BULK)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 404:
+                    logger.warning("Refresh failed for %s: %s", row["github_username"], e)
+                    return "failed", None
+                # Renamed or deleted on GitHub: park it until the next cycle.
+                update_data = None
+                outcome = "missing"
+            except Exception as e:
+                logger.warning("Refresh failed for %s: %s", row["github_username"], e)
+                return "failed", None
+            else:
+                outcome = "unchanged"
+
+        write = {"id": row["id"], "enriched_at": datetime.now(timezone.utc).isoformat()}
+        if update_data is not None:
+            digest = EnrichmentService.content_hash(update_data)
+            if digest != row.get("enrichment_hash"):
+                write.update(update_data, enrichment_hash=digest)
+                outcome = "changed"
+        return outcome, write
@@ -0,0 +1,90 @@
+"""GitHub enrichment pipeline — derives profile fields from one repo listing."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import Counter
+from hashlib import blake2b
+
+from app.core.config import settings
+from app.infrastructure.github_client import GitHubClient, github_client
+from app.infrastructure.github_scheduler import INTERACTIVE
+
+
+class EnrichmentService:
+    """Builds `github_repos` / `tech_stack` updates from GitHub data."""
+
+    @staticmethod
+    async def fetch(
+        github_username: str,
+        with_language_bytes: bool | None = None,
+        client: GitHubClient | None = None,
+        priority: int = INTERACTIVE,
+    ) -> dict:
+        """Fetch a user's repos once and derive the profile update from them.
+
+        The top repos and the language set both come from a single listing
+        of the ENRICH_REPO_SCAN most recently pushed repos. With
+        `with_language_bytes`, per-repo language byte counts are fetched
+        concurrently and the tech stack is ordered by total bytes.
+
+        `priority` (INTERACTIVE or BULK) orders the calls in the GitHub
+        scheduler. Unchanged listings are revalidated with ETags and rebuilt
+        from the cached payload; callers compare `content_hash` with the
+        stored `enrichment_hash` to decide whether to write.
+        """
+        gh = client or github_client
+        if with_language_bytes is None:
+            with_language_bytes = settings.ENRICH_LANGUAGE_BYTES
+
+        repos, _ = await gh.list_user_repos(
+            github_username, limit=settings.ENRICH_REPO_SCAN, priority=priority
+        )
+        update_data: dict = {"github_repos": repos[: settings.ENRICH_REPO_LIMIT]}
+
+        if with_language_bytes and repos:
+            weights = await EnrichmentService._language_bytes(gh, repos, priority)
+            update_data["tech_stack"] = [lang for lang, _ in weights.most_common()]
+            update_data["tech_weights"] = dict(weights)
+        else:
+            update_data["tech_stack"] = sorted(
+                {r["language"] for r in repos if r["language"]}
+            )
+
+        return update_data
+
+    @staticmethod
+    def content_hash(update_data: dict) -> str:
+        """Stable hash of the derived fields, stored as `enrichment_hash`.
+
+        The refresher compares it to skip writing profiles whose GitHub
+        data hasn't changed since the last enrichment.
+        """
+        raw = json.dumps(update_data, sort_keys=True, separators=(",", ":"), default=str)
+        return blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    async def _language_bytes(
+        gh: GitHubClient, repos: list[dict], priority: int
+    ) -> Counter:
+        """Sum `/repos/{owner}/{repo}/languages` across repos, bounded fan-out."""
+        sem = asyncio.Semaphore(settings.ENRICH_LANGUAGE_CONCURRENCY)
+
+        async def one(full_name: str) -> dict[str, int]:
+            async with sem:
+                try:
+                    return await gh.get_repo_languages(full_name, priority)
+                except Exception:
+                    return {}
+
+        totals: Counter = Counter()
+        results = await asyncio.gather(*(one(r["full_name"]) for r in repos))
+        for langs in results:
+            totals.update(langs)
+
+        # Repos whose languages call failed still count via their primary language.
+        for repo, langs in zip(repos, results):
+            if not langs and repo["language"] and repo["language"] not in totals:
+                totals[repo["language"]] = 0
+        return totals
@@ -0,0 +1,202 @@
+"""Dependency health, checked in the background and served from memory.
+
+A checker task probes Supabase, the cache backend, GitHub quota and the
+in-process queues every HEALTH_CHECK_INTERVAL_SECONDS and keeps the
+results, so liveness and readiness probes never touch a dependency
+themselves. Readiness fails while a critical check (Supabase, cache) is
+failing or the last round is older than HEALTH_STALE_AFTER_SECONDS; the
+others only mark the service degraded.
+
+The Supabase ping bypasses the request pool: an instance that is merely
+busy reports degraded and stays in rotation, instead of being pulled
+exactly when it has the most work queued.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from app.core.config import settings
+from app.infrastructure import supabase_repository
+from app.infrastructure.github_scheduler import github_scheduler
+from app.services.chat_service import message_writer
+from app.services.matching_service import pool_refresh_queue
+from app.services.profile_service import enrichment_queue, profile_cache
+from app.services.swipe_service import swipe_writer
+
+logger = logging.getLogger(__name__)
+
+OK = "ok"
+DEGRADED = "degraded"
+FAILING = "failing"
+
+
+@dataclass
+class CheckResult:
+    status: str
+    detail: dict = field(default_factory=dict)
+    checked_at: float = field(default_factory=time.time)
+    duration_ms: float = 0.0
+
+
+async def _check_supabase() -> CheckResult:
+    """Down only if Supabase itself fails; a saturated local pool is degraded."""
+    await supabase_repository.ping(timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS)
+    if supabase_repository.pool_saturated():
+        return CheckResult(DEGRADED, {"pool": "saturated"})
+    return CheckResult(OK)
+
+
+async def _check_cache() -> CheckResult:
+    ok = await profile_cache.ping()
+    return CheckResult(OK if ok else FAILING, {"backend": profile_cache.name})
+
+
+async def _check_github() -> CheckResult:
+    """Quota headroom from the scheduler's view of the rate-limit headers."""
+    now = time.time()
+    credentials = github_scheduler.metrics()["credentials"]
+    usable = [
+        c for c in credentials
+        if c["blocked_until"] <= now and (c["remaining"] > 0 or c["reset_at"] <= now)
+    ]
+    detail = {
+        "credentials": len(credentials),
+        "usable": len(usable),
+        "remaining": sum(max(c["remaining"], 0) for c in credentials),
+        "limit": sum(c["limit"] for c in credentials),
+    }
+    return CheckResult(OK if usable else DEGRADED, detail)
+
+
+async def _check_queues() -> CheckResult:
+    depths = {queue.name: queue.depth for queue in (enrichment_queue, pool_refresh_queue)}
+    depths.update(
+        {f"{writer.name}-writer": writer.depth() for writer in (swipe_writer, message_writer)}
+    )
+    backed_up = any(depth > settings.HEALTH_QUEUE_DEPTH_WARN for depth in depths.values())
+    return CheckResult(DEGRADED if backed_up else OK, {"depth": depths})
+
+
+CHECKS: dict[str, Callable[[], Awaitable[CheckResult]]] = {
+    "supabase": _check_supabase,
+    "cache": _check_cache,
+    "github": _check_github,
+    "queues": _check_queues,
+}
+CRITICAL = frozenset({"supabase", "cache"})
+
+
+class HealthMonitor:
+    """Runs the checks on an interval and keeps the latest results."""
+
+    def __init__(
+        self,
+        checks: dict[str, Callable[[], Awaitable[CheckResult]]],
+        critical: frozenset[str],
+        interval: float = 10.0,
+        timeout: float = 3.0,
+        stale_after: float = 30.0,
+    ):
+        self._checks = checks
+        self._critical = critical
+        self._interval = interval
+        self._timeout = timeout
+        self._stale_after = stale_after
+        self._results: dict[str, CheckResult] = {}
+        self._checked_at: float | None = None
+        self._task: asyncio.Task | None = None
+
+    async def _run_one(self, name: str, check: Callable[[], Awaitable[CheckResult]]) -> CheckResult:
+        start = time.perf_counter()
+        error: Exception | None = None
+        try:
+            result = await asyncio.wait_for(check(), self._timeout)
+        except asyncio.TimeoutError:
+            result = CheckResult(FAILING, {"error": f"timed out after {self._timeout:g}s"})
+        except Exception as exc:
+            # Probes only see the exception type; the message goes to the log.
+            error = exc
+            result = CheckResult(FAILING, {"error": type(exc).__name__})
+        result.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        previous = self._results.get(name)
+        if result.status != OK and (previous is None or previous.status != result.status):
+            logger.warning(
+                "Health check %s is %s: %s", name, result.status, result.detail, exc_info=error
+            )
+        elif result.status == OK and previous is not None and previous.status != OK:
+            logger.info("Health check %s recovered", name)
+        return result
+
+    async def check_now(self) -> None:
+        """Run every check once, concurrently, and replace the cached results."""
+        names = list(self._checks)
+        results = await asyncio.gather(*(self._run_one(n, self._checks[n]) for n in names))
+        self._results = dict(zip(names, results))
+        self._checked_at = time.monotonic()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.check_now()
+            except Exception:
+                logger.exception("Health check round failed")
+            await asyncio.sleep(self._interval)
+
+    def status(self, name: str) -> str | None:
+        result = self._results.get(name)
+        return result.status if result else None
+
+    def readiness(self) -> tuple[bool, dict]:
+        """(ready, report) from the cached results; never awaits anything."""
+        if self._checked_at is None:
+            return False, {"status": "starting", "checks": {}}
+        age = time.monotonic() - self._checked_at
+        stale = age > self._stale_after
+        failing = [n for n in self._critical if self.status(n) not in (OK, DEGRADED)]
+        ready = not stale and not failing
+        if not ready:
+            status = FAILING
+        elif any(r.status != OK for r in self._results.values()):
+            status = DEGRADED
+        else:
+            status = OK
+        report = {
+            "status": status,
+            "age_seconds": round(age, 1),
+            "checks": {
+                name: {
+                    "status": r.status,
+                    "critical": name in self._critical,
+                    "duration_ms": r.duration_ms,
+                    **r.detail,
+                }
+                for name, r in self._results.items()
+            },
+        }
+        if stale:
+            report["stale"] = True
+        return ready, report
+
+
+health_monitor = HealthMonitor(
+    CHECKS,
+    CRITICAL,
+    interval=settings.HEALTH_CHECK_INTERVAL_SECONDS,
+    timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS,
+    stale_after=settings.HEALTH_STALE_AFTER_SECONDS,
+)
@@ -0,0 +1,53 @@
+"""Leaderboards — top-K pages and positions from the in-memory index.
+
+Positions and page membership come from the skip-list leaderboards; the
+profile fields shown on each row come from the profile cache. XP itself
+is only ever changed by database triggers, which the index picks up on
+its next catch-up.
+"""
+
+from __future__ import annotations
+
+from app.infrastructure.leaderboard import leaderboard, rank_for
+from app.services.profile_service import ProfileService
+
+
+class LeaderboardService:
+    """Reads the leaderboards."""
+
+    @staticmethod
+    async def top(limit: int = 20, offset: int = 0, tech: str | None = None) -> dict:
+        """One page of the global board, or of `tech`'s board."""
+        await leaderboard.ready()
+        page = leaderboard.top(limit, offset, tech)
+        profiles = await ProfileService.get_profiles_many(ids=[user_id for _, user_id, _ in page])
+        items = []
+        for (position, _, xp), profile in zip(page, profiles):
+            if profile is None:
+                continue  # deleted since the last sync
+            items.append({
+                "position": position,
+                "id": profile["id"],
+                "github_username": profile["github_username"],
+                "display_name": profile.get("display_name"),
+                "avatar_url": profile.get("avatar_url"),
+                "tech_stack": profile.get("tech_stack") or [],
+                "xp": xp,
+                "rank": rank_for(xp),
+            })
+        return {"items": items, "total": leaderboard.size(tech), "tech": tech}
+
+    @staticmethod
+    async def position(user_id: str, tech: str | None = None) -> dict:
+        """A user's position on the global board, or on `tech`'s board."""
+        await leaderboard.ready()
+        found = leaderboard.position(user_id, tech)
+        position, xp = found if found is not None else (None, 0)
+        return {
+            "position": position,
+            "total": leaderboard.size(tech),
+            "xp": xp,
+            "rank": rank_for(xp),
+            "tech": tech,
+        }
+
@@ -0,0 +1,251 @@
+"""Match candidate generation — precomputed, incrementally refreshed pools.
+
+Each user gets a ranked pool of candidates built from three cheap indexed
+sources (tech-stack overlap, the `nearby_profiles` PostGIS RPC and an XP
+band). A request only reads a slice of that pool; stale pools are topped up
+in the background with profiles updated since the last sync, so the hot
+path never scans `profiles`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from app.core.config import settings
+from app.infrastructure.cache import SingleFlight
+from app.infrastructure.job_queue import JobQueue
+from app.infrastructure.seen_set import seen_set
+from app.infrastructure.supabase_repository import ProfileRepository
+from app.services.profile_service import FEED_COLUMNS, ProfileService
+from app.services.tech_similarity import TechMatrix, TechVocabulary, tech_weights_for
+
+logger = logging.getLogger(__name__)
+
+# Card fields only — pools never carry the github_repos blob.
+MATCH_COLUMNS = FEED_COLUMNS + ",tech_weights"
+_MATCH_FIELDS = frozenset(MATCH_COLUMNS.split(","))
+
+_MAX_XP = 5000  # 'Principal' threshold in calculate_rank()
+
+def _sync_mark() -> str:
+    """Timestamp for incremental syncs, with slack for clock skew."""
+    return (datetime.now(timezone.utc) - timedelta(seconds=5)).isoformat()
+
+
+def score_candidates(viewer: dict, rows: list[dict]) -> np.ndarray:
+    """Score every row against the viewer in one batch, values in [0, 1].
+
+    Weighted blend of tech similarity (Jaccard, or cosine over GitHub
+    language weights when MATCH_TECH_METRIC="cosine"), proximity and
+    log-XP similarity.
+    """
+    if not rows:
+        return np.zeros(0, dtype=np.float32)
+
+    stacks = [r.get("tech_stack") or [] for r in rows]
+    # The matrix lives only for this call, so its vocabulary does too: it
+    # holds just this batch's technologies instead of every one ever seen.
+    vocab = TechVocabulary()
+    if settings.MATCH_TECH_METRIC == "cosine":
+        matrix = TechMatrix(vocab, stacks, [tech_weights_for(r) for r in rows])
+        tech = matrix.cosine(tech_weights_for(viewer))
+    else:
+        tech = TechMatrix(vocab, stacks).jaccard(viewer.get("tech_stack") or [])
+
+    geo = np.zeros(len(rows), dtype=np.float32)
+    if viewer.get("location_lat") is not None and viewer.get("location_lng") is not None:
+        lat = np.array([r.get("location_lat") for r in rows], dtype=np.float64)
+        lng = np.array([r.get("location_lng") for r in rows], dtype=np.float64)
+        lat1, lng1 = math.radians(viewer["location_lat"]), math.radians(viewer["location_lng"])
+        lat2, lng2 = np.radians(lat), np.radians(lng)
+        h = (
+            np.sin((lat2 - lat1) / 2) ** 2
+            + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+        )
+        distance = 2 * 6371.0 * np.arcsin(np.sqrt(h))
+        geo = np.nan_to_num(np.clip(1.0 - distance / settings.MATCH_RADIUS_KM, 0.0, 1.0))
+
+    xp = np.array([r.get("xp") or 0 for r in rows], dtype=np.float64)
+    gap = np.abs(math.log1p(viewer.get("xp") or 0) - np.log1p(xp))
+    xp_sim = 1.0 - np.minimum(1.0, gap / math.log1p(_MAX_XP))
+
+    return (
+        settings.MATCH_WEIGHT_TECH * tech
+        + settings.MATCH_WEIGHT_GEO * geo
+        + settings.MATCH_WEIGHT_XP * xp_sim
+    )
+
+
+@dataclass
+class CandidatePool:
+    """A user's candidates ordered by descending score."""
+    viewer: dict
+    synced_at: str  # ISO timestamp; profiles updated after it are not merged yet
+    built_at: float = field(default_factory=time.monotonic)
+    refreshed_at: float = field(default_factory=time.monotonic)
+    ranked: list[tuple[float, str]] = field(default_factory=list)  # (-score, id)
+    scores: dict[str, float] = field(default_factory=dict)
+    rows: dict[str, dict] = field(default_factory=dict)
+
+    def upsert(self, row: dict, score: float) -> None:
+        self.remove(row["id"])
+        bisect.insort(self.ranked, (-score, row["id"]))
+        self.scores[row["id"]] = score
+        self.rows[row["id"]] = row
+
+    def remove(self, candidate_id: str) -> None:
+        score = self.scores.pop(candidate_id, None)
+        if score is None:
+            return
+        i = bisect.bisect_left(self.ranked, (-score, candidate_id))
+        del self.ranked[i]
+        del self.rows[candidate_id]
+
+    def trim(self, size: int) -> None:
+        while len(self.ranked) > size:
+            _, candidate_id = self.ranked.pop()
+            del self.scores[candidate_id]
+            del self.rows[candidate_id]
+
+
+_pools: OrderedDict[str, CandidatePool] = OrderedDict()
+# Concurrent first requests (and a refresh that falls back to a rebuild)
+# share one build per user.
+_pool_builds = SingleFlight()
+pool_refresh_queue = JobQueue("match-pools", workers=2, max_attempts=2)
+
+
+class MatchingService:
+    """Builds, refreshes and reads per-user candidate pools."""
+
+    @staticmethod
+    async def get_matches(user_id: str, limit: int = 20) -> list[dict]:
+        """Return the top unseen candidates as {profile, score} dicts."""
+        pool = _pools.get(user_id)
+        if pool is None:
+            pool = await MatchingService.build_pool(user_id)
+        else:
+            _pools.move_to_end(user_id)
+            if time.monotonic() - pool.refreshed_at > settings.MATCH_POOL_REFRESH_SECONDS:
+                pool_refresh_queue.enqueue(user_id, MatchingService.refresh_pool, user_id)
+
+        results: list[dict] = []
+        step = max(limit * 2, 50)
+        for start in range(0, len(pool.ranked), step):
+            chunk = [cid for _, cid in pool.ranked[start : start + step]]
+            for cid in await seen_set.filter_unseen(user_id, chunk):
+                results.append({"profile": pool.rows[cid], "score": round(pool.scores[cid], 4)})
+                if len(results) == limit:
+                    return results
+        return results
+
+    @staticmethod
+    async def build_pool(user_id: str) -> CandidatePool:
+        """Full rebuild from the candidate sources, one in flight per user."""
+        return await _pool_builds.do(user_id, lambda: MatchingService._build_pool(user_id))
+
+    @staticmethod
+    async def _build_pool(user_id: str) -> CandidatePool:
+        viewer = await ProfileService.get_profile(user_id)
+        if viewer is None:
+            raise ValueError("Profile not found")
+
+        rows = await MatchingService._candidate_rows(viewer)
+
+        pool = CandidatePool(viewer=viewer, synced_at=_sync_mark())
+        candidates = list(rows.values())
+        for row, score in zip(candidates, score_candidates(viewer, candidates)):
+            pool.upsert(row, float(score))
+        pool.trim(settings.MATCH_POOL_SIZE)
+
+        _pools[user_id] = pool
+        _pools.move_to_end(user_id)
+        while len(_pools) > settings.MATCH_POOL_MAX_USERS:
+            _pools.popitem(last=False)
+        return pool
+
+    @staticmethod
+    async def refresh_pool(user_id: str) -> None:
+        """Merge profiles changed since the last sync into an existing pool.
+
+        Falls back to a full rebuild when the viewer's own profile changed
+        or the pool is older than MATCH_POOL_REBUILD_SECONDS.
+        """
+        pool = _pools.get(user_id)
+        viewer = await ProfileService.get_profile(user_id)
+        if viewer is None:
+            _pools.pop(user_id, None)
+            return
+        if (
+            pool is None
+            or viewer.get("updated_at") != pool.viewer.get("updated_at")
+            or time.monotonic() - pool.built_at > settings.MATCH_POOL_REBUILD_SECONDS
+        ):
+            await MatchingService.build_pool(user_id)
+            return
+
+        synced_at = _sync_mark()
+        changed = await ProfileRepository.list_updated_since(
+            pool.synced_at, user_id, MATCH_COLUMNS, settings.MATCH_POOL_FETCH
+        )
+        if len(changed) == settings.MATCH_POOL_FETCH:
+            # More changes than one batch; resume after the last one next time.
+            synced_at = changed[-1]["updated_at"]
+        for row, score in zip(changed, score_candidates(viewer, changed)):
+            if score > 0:
+                pool.upsert(row, float(score))
+            else:
+                pool.remove(row["id"])
+        pool.trim(settings.MATCH_POOL_SIZE)
+        pool.synced_at = synced_at
+        pool.refreshed_at = time.monotonic()
+
+    @staticmethod
+    def invalidate(user_id: str) -> None:
+        """Drop a user's pool so the next request rebuilds it."""
+        _pools.pop(user_id, None)
+
+    @staticmethod
+    async def _candidate_rows(viewer: dict) -> dict[str, dict]:
+        """Union of the tech, geo and XP candidate sources, keyed by id."""
+        user_id = viewer["id"]
+        fetch = settings.MATCH_POOL_FETCH
+        xp = viewer.get("xp") or 0
+
+        sources = [
+            ProfileRepository.list_by_xp_range(
+                xp // 2, max(xp * 2, 100), user_id, MATCH_COLUMNS, fetch
+            )
+        ]
+        if viewer.get("tech_stack"):
+            sources.append(
+                ProfileRepository.list_by_tech_overlap(
+                    viewer["tech_stack"], user_id, MATCH_COLUMNS, fetch
+                )
+            )
+        if viewer.get("location_lat") is not None and viewer.get("location_lng") is not None:
+            sources.append(
+                ProfileRepository.nearby(
+                    viewer["location_lat"], viewer["location_lng"], settings.MATCH_RADIUS_KM
+                )
+            )
+
+        rows: dict[str, dict] = {}
+        for result in await asyncio.gather(*sources, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.warning("Candidate source failed: %s", result)
+                continue
+            for row in result:
+                if row["id"] != user_id and row["id"] not in rows:
+                    # The geo RPC returns whole rows; keep card fields only.
+                    rows[row["id"]] = {k: v for k, v in row.items() if k in _MATCH_FIELDS}
+        return rows
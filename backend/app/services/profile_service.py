@@ -1,9 +1,152 @@
-"""Profile business logic — CRUD and GitHub enrichment."""
+"""Profile business logic — CRUD, discovery and GitHub enrichment."""
 
 from __future__ import annotations
 
-from app.infrastructure.supabase_client import supabase
-from app.infrastructure.github_client import GitHubClient
+import asyncio
+import re
+import uuid
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+import httpx
+
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.infrastructure.cache import BatchLoader, SingleFlight, build_cache
+from app.infrastructure.geo_index import geo_index
+from app.infrastructure.github_scheduler import INTERACTIVE
+from app.infrastructure.job_queue import Job, JobQueue
+from app.infrastructure.leaderboard import leaderboard
+from app.infrastructure.seen_set import seen_set
+from app.infrastructure.supabase_repository import ProfileRepository
+from app.services.enrichment_service import EnrichmentService
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Retry network errors, 5xx and rate limits; a 404 user won't appear later."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        code = exc.response.status_code
+        return code >= 500 or code in (403, 429)
+    return True
+
+
+enrichment_queue = JobQueue(
+    "enrichment",
+    workers=settings.ENRICH_WORKERS,
+    max_attempts=settings.ENRICH_MAX_ATTEMPTS,
+    backoff_base=settings.ENRICH_BACKOFF_BASE_SECONDS,
+    backoff_max=settings.ENRICH_BACKOFF_MAX_SECONDS,
+    history_size=settings.ENRICH_JOB_HISTORY,
+    is_retryable=_is_retryable,
+)
+
+# Feed cards carry every ProfileResponse field except the github_repos blob.
+FEED_COLUMNS = (
+    "id,github_username,display_name,bio,avatar_url,tech_stack,"
+    "location_lat,location_lng,xp,rank,created_at,updated_at"
+)
+
+# Keyset pages a viewer's discover call may scan to fill one page of
+# unseen profiles.
+_DISCOVER_MAX_SCANS = 5
+
+# nearby_profiles_page returns at most this many rows per call; a larger
+# fetch would look like the last page and drop next_cursor.
+_DISCOVER_MAX_FETCH = 500
+
+# Read-through cache of full profile rows, keyed by id and by username.
+profile_cache = build_cache(
+    max_entries=settings.PROFILE_CACHE_MAX_ENTRIES,
+    default_ttl=settings.PROFILE_CACHE_TTL_SECONDS,
+)
+_profile_loads = SingleFlight()
+# Bumped on every invalidation so a load that raced a write doesn't
+# repopulate the cache with the pre-write row.
+_invalidation_epoch = 0
+
+
+def _id_key(user_id: str) -> str:
+    return f"profile:id:{user_id}"
+
+
+def _username_key(username: str) -> str:
+    return f"profile:username:{username}"
+
+
+_GITHUB_USERNAME = re.compile(r"^[A-Za-z0-9](?:[A-Za-z0-9-]{0,38})$")
+
+
+def _is_uuid(value: str) -> bool:
+    try:
+        uuid.UUID(value)
+    except (ValueError, TypeError, AttributeError):
+        return False
+    return True
+
+
+async def _load_by_ids(ids: list[str]) -> dict[str, dict]:
+    # One malformed id would fail the whole `in` query; it can't match anyway.
+    rows = await ProfileRepository.get_many([i for i in ids if _is_uuid(i)])
+    return {row["id"]: row for row in rows}
+
+
+async def _load_by_usernames(usernames: list[str]) -> dict[str, dict]:
+    valid = [u for u in usernames if _GITHUB_USERNAME.match(u)]
+    rows = await ProfileRepository.get_many_by_username(valid)
+    return {row["github_username"]: row for row in rows}
+
+
+# Cache misses from concurrent requests are fetched with one `in` query.
+_profiles_by_id = BatchLoader(_load_by_ids, max_batch=settings.PROFILE_BATCH_MAX)
+_profiles_by_username = BatchLoader(_load_by_usernames, max_batch=settings.PROFILE_BATCH_MAX)
+
+
+async def _remember(profile: dict) -> None:
+    await profile_cache.set(_id_key(profile["id"]), profile)
+    await profile_cache.set(_username_key(profile["github_username"]), profile)
+
+
+async def _read_through(
+    key: str, loader: Callable[[], Awaitable[dict | None]]
+) -> dict | None:
+    cached = await profile_cache.get(key)
+    if cached is not None:
+        return cached
+
+    async def load() -> dict | None:
+        epoch = _invalidation_epoch
+        profile = await loader()
+        if profile is not None and epoch == _invalidation_epoch:
+            await _remember(profile)
+        return profile
+
+    # Concurrent misses on the same key share one database round-trip.
+    return await _profile_loads.do(key, load)
+
+
+async def _invalidate(user_id: str, username: str | None = None) -> None:
+    global _invalidation_epoch
+    _invalidation_epoch += 1
+    if username is None:
+        cached = await profile_cache.get(_id_key(user_id))
+        username = cached["github_username"] if cached else None
+    keys = [_id_key(user_id)]
+    if username:
+        keys.append(_username_key(username))
+    await profile_cache.delete(*keys)
+
+
+def _reindex(profile: dict) -> None:
+    """Apply a written profile row to the in-memory geo and leaderboard indexes."""
+    if profile.get("id") and "xp" in profile:
+        leaderboard.upsert(profile["id"], profile.get("xp"), profile.get("tech_stack"))
+    if profile.get("id") and "location_lat" in profile:
+        geo_index.upsert(
+            profile["id"],
+            profile.get("location_lat"),
+            profile.get("location_lng"),
+            profile.get("tech_stack"),
+        )
 
 
 class ProfileService:
@@ -11,27 +154,47 @@ class ProfileService:
 
     @staticmethod
     async def get_profile(user_id: str) -> dict | None:
-        """Fetch a profile by user ID."""
-        result = (
-            supabase.table("profiles")
-            .select("*")
-            .eq("id", user_id)
-            .maybe_single()
-            .execute()
-        )
-        return result.data
+        """Fetch a profile by user ID (cached)."""
+        return await _read_through(_id_key(user_id), lambda: _profiles_by_id.load(user_id))
 
     @staticmethod
     async def get_profile_by_username(username: str) -> dict | None:
-        """Fetch a profile by GitHub username."""
-        result = (
-            supabase.table("profiles")
-            .select("*")
-            .eq("github_username", username)
-            .maybe_single()
-            .execute()
+        """Fetch a profile by GitHub username (cached)."""
+        return await _read_through(
+            _username_key(username), lambda: _profiles_by_username.load(username)
         )
-        return result.data
+
+    @staticmethod
+    async def get_profiles_many(
+        ids: list[str] | None = None, usernames: list[str] | None = None
+    ) -> list[dict | None]:
+        """Fetch several profiles by id and/or GitHub username (cached).
+
+        Returns one entry per requested key, ids first and then usernames,
+        in request order; None where no profile matches. Cache misses are
+        fetched with one `in` query per key type.
+        """
+        ids, usernames = ids or [], usernames or []
+        cached = await profile_cache.get_many(
+            [_id_key(i) for i in ids] + [_username_key(u) for u in usernames]
+        )
+        by_id = {i: p for i, p in zip(ids, cached) if p is not None}
+        by_username = {u: p for u, p in zip(usernames, cached[len(ids) :]) if p is not None}
+
+        epoch = _invalidation_epoch
+        missing_ids = list(dict.fromkeys(i for i in ids if i not in by_id))
+        missing_usernames = list(dict.fromkeys(u for u in usernames if u not in by_username))
+        loaded_ids, loaded_usernames = await asyncio.gather(
+            _profiles_by_id.load_many(missing_ids),
+            _profiles_by_username.load_many(missing_usernames),
+        )
+        loaded = [p for p in loaded_ids + loaded_usernames if p is not None]
+        by_id.update((p["id"], p) for p in loaded)
+        by_username.update((p["github_username"], p) for p in loaded)
+        if epoch == _invalidation_epoch:
+            for profile in loaded:
+                await _remember(profile)
+        return [by_id.get(i) for i in ids] + [by_username.get(u) for u in usernames]
 
     @staticmethod
     async def update_profile(user_id: str, data: dict) -> dict:
@@ -42,53 +205,140 @@ class ProfileService:
             # Nothing to update, just return current
             return await ProfileService.get_profile(user_id)  # type: ignore
 
-        result = (
-            supabase.table("profiles")
-            .update(update_data)
-            .eq("id", user_id)
-            .execute()
-        )
-        return result.data[0] if result.data else {}
+        updated = await ProfileRepository.update(user_id, update_data)
+        await _invalidate(user_id, updated.get("github_username"))
+        _reindex(updated)
+        return updated
 
     @staticmethod
-    async def enrich_from_github(user_id: str, github_username: str) -> dict:
+    async def enrich_from_github(
+        user_id: str,
+        github_username: str,
+        priority: int = INTERACTIVE,
+    ) -> dict:
         """Pull repos and languages from GitHub and save to profile.
 
         Called after first OAuth login to populate tech_stack and github_repos.
+        Skips the write (returning the stored profile) when the derived
+        fields hash to the stored `enrichment_hash`. GitHub errors propagate
+        so the enrichment queue can retry them.
         """
-        gh = GitHubClient()
-
-        try:
-            repos = await gh.get_user_repos(github_username, limit=10)
-            languages = await gh.get_user_languages(github_username)
-        except Exception:
-            # GitHub API might rate-limit or fail — non-critical
-            return {}
-
-        update_data = {
-            "github_repos": repos,
-            "tech_stack": languages,
-        }
-
-        result = (
-            supabase.table("profiles")
-            .update(update_data)
-            .eq("id", user_id)
-            .execute()
+        update_data = await EnrichmentService.fetch(github_username, priority=priority)
+        digest = EnrichmentService.content_hash(update_data)
+        current = await ProfileService.get_profile(user_id)
+        if current is not None and current.get("enrichment_hash") == digest:
+            return current
+
+        update_data["enrichment_hash"] = digest
+        update_data["enriched_at"] = datetime.now(timezone.utc).isoformat()
+        updated = await ProfileRepository.update(user_id, update_data)
+        await _invalidate(user_id, updated.get("github_username") or github_username)
+        _reindex(updated)
+        return updated
+
+    @staticmethod
+    async def invalidate(user_id: str, github_username: str | None = None) -> None:
+        """Drop cached copies of a profile written outside this service."""
+        await _invalidate(user_id, github_username)
+
+    @staticmethod
+    def enqueue_enrichment(user_id: str, github_username: str) -> Job:
+        """Schedule a background GitHub enrichment (deduplicated per user)."""
+        return enrichment_queue.enqueue(
+            user_id,
+            ProfileService.enrich_from_github,
+            user_id=user_id,
+            github_username=github_username,
         )
-        return result.data[0] if result.data else {}
+
+    @staticmethod
+    def get_enrichment_job(user_id: str) -> Job | None:
+        """Return the latest enrichment job for a user, if any."""
+        return enrichment_queue.get(user_id)
 
     @staticmethod
     async def discover(
-        tech: str | None = None,
+        techs: list[str] | None = None,
+        match_all: bool = True,
         limit: int = 20,
-    ) -> list[dict]:
-        """Discover developer profiles, optionally filtered by tech stack."""
-        query = supabase.table("profiles").select("*")
+        cursor: str | None = None,
+        near: tuple[float, float, float] | None = None,
+        include_repos: bool = False,
+        viewer_id: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Discover developer profiles one keyset page at a time.
+
+        `techs` filters by tech stack (all of them, or any with
+        match_all=False); `near` is (lat, lng, radius_km) and switches to
+        nearest-first order, served by the in-memory geo index when the
+        area is loaded and by the PostGIS RPC otherwise. With a
+        `viewer_id`, the viewer's own profile and the profiles they already
+        swiped are skipped (a few more keyset pages are scanned to fill the
+        page).
+        Returns (rows, next_cursor); next_cursor is None on the last page.
+        Raises ValueError for a malformed cursor.
+        """
+        columns = FEED_COLUMNS + (",github_repos" if include_repos else "")
+        sort_key = "d" if near else "c"
+        position = decode_cursor(cursor, sort_key) if cursor else None
+        fetch = limit + 1 if viewer_id is None else 2 * limit + 1
+        fetch = min(fetch, _DISCOVER_MAX_FETCH)
+
+        async def fetch_page(after: dict | None) -> list[dict]:
+            if near is None:
+                return await ProfileRepository.page(
+                    columns,
+                    fetch,
+                    techs=techs,
+                    match_all=match_all,
+                    after=(after["c"], after["i"]) if after else None,
+                )
+            lat, lng, radius_km = near
+            after_key = (after["d"], after["i"]) if after else None
+            hits = geo_index.query(
+                lat, lng, radius_km, fetch, techs=techs, match_all=match_all, after=after_key
+            )
+            if hits is not None:
+                return hits
+            return await ProfileRepository.nearby_page(
+                lat,
+                lng,
+                radius_km,
+                fetch,
+                techs=techs,
+                match_all=match_all,
+                after=after_key,
+            )
+
+        def key_of(row: dict) -> dict:
+            if near is None:
+                return {"c": row["created_at"], "i": row["id"]}
+            return {"d": row["distance_m"], "i": row["id"]}
 
-        if tech:
-            query = query.contains("tech_stack", [tech])
+        picked: list[dict] = []
+        next_cursor = None
+        for scan in range(_DISCOVER_MAX_SCANS):
+            batch = await fetch_page(position)
+            keep = None
+            if viewer_id is not None:
+                ids = [r["id"] for r in batch if r["id"] != viewer_id]
+                keep = set(await seen_set.filter_unseen(viewer_id, ids))
+            consumed = 0
+            for row in batch:
+                if len(picked) == limit:
+                    break
+                consumed += 1
+                position = key_of(row)
+                if keep is None or row["id"] in keep:
+                    picked.append(row)
+            if consumed == len(batch) and len(batch) < fetch:
+                break  # nothing left to scan
+            if len(picked) == limit or scan == _DISCOVER_MAX_SCANS - 1:
+                next_cursor = encode_cursor(position)
+                break
 
-        query = query.limit(limit)
-        result = query.execute()
-        return result.data or []
+        if near is None:
+            return picked, next_cursor
+        rows = await ProfileRepository.get_many([h["id"] for h in picked], columns)
+        by_id = {r["id"]: r for r in rows}
+        return [by_id[h["id"]] for h in picked if h["id"] in by_id], next_cursor
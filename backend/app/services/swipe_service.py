@@ -0,0 +1,133 @@
+"""Swipe ingestion — batched writes with in-memory mutual-like detection.
+
+A swipe is validated, recorded in the reverse-like index and written
+through the batched `record_swipes` RPC: the request waits for the batch
+holding its swipe, so a burst of swipes still costs one round-trip, and a
+failed write is undone in the index and reported to the client instead of
+being lost. A like whose target already liked the swiper is a match: the
+accepted connection is created right away and returned to the client.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.infrastructure.cache import SingleFlight
+from app.infrastructure.seen_set import seen_set
+from app.infrastructure.supabase_repository import ConnectionRepository, SwipeRepository
+from app.infrastructure.write_buffer import BatchWriter
+
+LIKE = "like"
+PASS = "pass"
+
+swipe_writer = BatchWriter(
+    "swipes",
+    SwipeRepository.record_many,
+    max_batch=settings.SWIPE_BATCH_SIZE,
+    max_delay=settings.SWIPE_FLUSH_SECONDS,
+    max_pending=settings.SWIPE_MAX_PENDING,
+)
+
+
+class LikeIndex:
+    """For each resident user, the set of users who liked them.
+
+    A user's set is loaded from the database the first time they swipe and
+    kept current by every like that passes through this process, so "did
+    B like A?" is a set lookup. Likes for users that aren't loaded yet are
+    kept too and merged with the database rows on load, so a like still
+    sitting in the write buffer is never missed.
+    """
+
+    def __init__(self, max_users: int):
+        self._max_users = max_users
+        self._liked_by: OrderedDict[str, set[str]] = OrderedDict()
+        self._loaded: set[str] = set()
+        self._loads = SingleFlight()
+
+    def _get(self, user_id: str) -> set[str]:
+        likers = self._liked_by.get(user_id)
+        if likers is None:
+            likers = self._liked_by[user_id] = set()
+            while len(self._liked_by) > self._max_users:
+                evicted, _ = self._liked_by.popitem(last=False)
+                self._loaded.discard(evicted)
+        self._liked_by.move_to_end(user_id)
+        return likers
+
+    async def ensure_loaded(self, user_id: str) -> None:
+        if user_id in self._loaded:
+            return
+
+        async def load() -> None:
+            likers = await SwipeRepository.likers_of(user_id)
+            self._get(user_id).update(likers)
+            self._loaded.add(user_id)
+
+        await self._loads.do(user_id, load)
+
+    def record(self, swiper_id: str, target_id: str, direction: str) -> None:
+        likers = self._get(target_id)
+        if direction == LIKE:
+            likers.add(swiper_id)
+        else:
+            likers.discard(swiper_id)
+
+    def has_liked(self, swiper_id: str, target_id: str) -> bool:
+        likers = self._liked_by.get(target_id)
+        return likers is not None and swiper_id in likers
+
+    def __len__(self) -> int:
+        return len(self._liked_by)
+
+
+like_index = LikeIndex(settings.SWIPE_INDEX_MAX_USERS)
+
+
+class SwipeService:
+    """Records swipes and turns mutual likes into accepted connections."""
+
+    @staticmethod
+    async def swipe(user_id: str, target_id: str, direction: str) -> dict:
+        """Record a swipe; returns {target_id, direction, match}.
+
+        Idempotent: repeating a swipe repeats the same upsert and, for a
+        mutual like, returns the same connection. If the write fails the
+        index change is rolled back and the error propagates, so the
+        client can retry.
+        """
+        try:
+            target_id = str(uuid.UUID(target_id))
+        except (ValueError, TypeError):
+            raise ValueError("Invalid target_id")
+        if target_id == user_id:
+            raise ValueError("You can't swipe on yourself")
+        if direction not in (LIKE, PASS):
+            raise ValueError("direction must be 'like' or 'pass'")
+
+        # Whether the target liked us is answered from our own likers.
+        await like_index.ensure_loaded(user_id)
+        # Recorded before the write so a like crossing ours in the same
+        # batch window still sees it.
+        liked_before = like_index.has_liked(user_id, target_id)
+        like_index.record(user_id, target_id, direction)
+        try:
+            await swipe_writer.submit({
+                "swiper_id": user_id,
+                "target_id": target_id,
+                "direction": direction,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            })
+        except Exception:
+            like_index.record(user_id, target_id, LIKE if liked_before else PASS)
+            raise
+        await seen_set.add(user_id, target_id)
+
+        match = None
+        if direction == LIKE and like_index.has_liked(target_id, user_id):
+            # The target liked first, so they are the requester.
+            match = await ConnectionRepository.create_mutual(target_id, user_id) or None
+        return {"target_id": target_id, "direction": direction, "match": match}
@@ -0,0 +1,157 @@
+"""Batched tech-stack similarity with NumPy.
+
+Technologies are interned into a shared vocabulary. Each profile becomes a
+row of a bit-packed matrix (64 technologies per uint64 word) for Jaccard,
+and optionally a sparse CSR row of per-technology weights (derived from
+GitHub language byte counts) for cosine. Scoring one viewer against every
+row is a handful of vectorized operations, independent of Python loops.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+# 8-bit popcount table, used when NumPy lacks bitwise_count (< 2.0).
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount_rows(words: np.ndarray) -> np.ndarray:
+    """Number of set bits per row of a (n, w) uint64 matrix."""
+    bitwise_count = getattr(np, "bitwise_count", None)
+    if bitwise_count is not None:
+        return bitwise_count(words).sum(axis=1, dtype=np.int32)
+    as_bytes = words.view(np.uint8).reshape(words.shape[0], -1)
+    return _POPCOUNT8[as_bytes].sum(axis=1, dtype=np.int32)
+
+
+def normalize_tech(tech: str) -> str:
+    return tech.strip().lower()
+
+
+class TechVocabulary:
+    """Interns technology names into dense integer ids."""
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self.names: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, tech: str) -> int:
+        key = normalize_tech(tech)
+        tech_id = self._ids.get(key)
+        if tech_id is None:
+            tech_id = self._ids[key] = len(self.names)
+            self.names.append(key)
+        return tech_id
+
+    def lookup(self, tech: str) -> int | None:
+        return self._ids.get(normalize_tech(tech))
+
+
+def tech_weights_for(profile: dict) -> dict[str, float]:
+    """Per-technology weight: log-scaled GitHub bytes, 1.0 when unknown."""
+    byte_counts = {normalize_tech(k): v for k, v in (profile.get("tech_weights") or {}).items()}
+    return {
+        normalize_tech(t): 1.0 + math.log1p(byte_counts.get(normalize_tech(t), 0))
+        for t in profile.get("tech_stack") or []
+    }
+
+
+class TechMatrix:
+    """Bit-packed (and optionally weighted) tech stacks for a set of profiles."""
+
+    def __init__(
+        self,
+        vocab: TechVocabulary,
+        stacks: list[list[str]],
+        weights: list[dict[str, float]] | None = None,
+    ):
+        self.vocab = vocab
+        rows: list[int] = []
+        cols: list[int] = []
+        for i, stack in enumerate(stacks):
+            for tech_id in {vocab.intern(t) for t in stack}:
+                rows.append(i)
+                cols.append(tech_id)
+
+        self.size = len(stacks)
+        self.words = max(1, math.ceil(len(vocab) / 64))
+        row_idx = np.asarray(rows, dtype=np.int64)
+        col_idx = np.asarray(cols, dtype=np.int64)
+
+        self.bits = np.zeros((self.size, self.words), dtype=np.uint64)
+        np.bitwise_or.at(
+            self.bits,
+            (row_idx, col_idx // 64),
+            np.left_shift(np.uint64(1), (col_idx % 64).astype(np.uint64)),
+        )
+        self.counts = _popcount_rows(self.bits)
+
+        self.weighted = weights is not None
+        if weights is not None:
+            self._build_csr(weights)
+
+    def _build_csr(self, weights: list[dict[str, float]]) -> None:
+        indptr = [0]
+        indices: list[int] = []
+        data: list[float] = []
+        for row in weights:
+            for tech, w in row.items():
+                indices.append(self.vocab.intern(tech))
+                data.append(w)
+            indptr.append(len(indices))
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data, dtype=np.float32)
+        row_of = np.repeat(np.arange(self.size), np.diff(self.indptr))
+        self._row_of = row_of
+        self.norms = np.sqrt(
+            np.bincount(row_of, weights=self.data * self.data, minlength=self.size)
+        ).astype(np.float32)
+
+    def _query_bits(self, stack: list[str]) -> tuple[np.ndarray, int]:
+        query = np.zeros(self.words, dtype=np.uint64)
+        count = 0
+        for tech in set(normalize_tech(t) for t in stack):
+            tech_id = self.vocab.lookup(tech)
+            if tech_id is None:
+                count += 1  # unknown to every row: only grows the union
+                continue
+            if tech_id // 64 < self.words:
+                query[tech_id // 64] |= np.uint64(1) << np.uint64(tech_id % 64)
+            count += 1
+        return query, count
+
+    def jaccard(self, stack: list[str]) -> np.ndarray:
+        """|A ∩ B| / |A ∪ B| between `stack` and every row."""
+        query, query_count = self._query_bits(stack)
+        inter = _popcount_rows(self.bits & query)
+        union = self.counts + query_count - inter
+        out = np.zeros(self.size, dtype=np.float32)
+        np.divide(inter, union, out=out, where=union > 0)
+        return out
+
+    def cosine(self, weights: dict[str, float]) -> np.ndarray:
+        """Cosine similarity between a weighted stack and every weighted row."""
+        if not self.weighted:
+            raise ValueError("TechMatrix was built without weights")
+        query = np.zeros(len(self.vocab), dtype=np.float32)
+        for tech, w in weights.items():
+            tech_id = self.vocab.lookup(tech)
+            if tech_id is not None:
+                query[tech_id] = w
+        query_norm = float(np.linalg.norm(list(weights.values()))) if weights else 0.0
+
+        dots = np.bincount(
+            self._row_of,
+            weights=self.data * query[self.indices],
+            minlength=self.size,
+        ).astype(np.float32)
+        denom = self.norms * query_norm
+        out = np.zeros(self.size, dtype=np.float32)
+        np.divide(dots, denom, out=out, where=denom > 0)
+        return out
@@ -0,0 +1,168 @@
+"""Chat history read latency vs conversation length, and batched sends.
+
+History: builds conversations of 1k / 10k / 100k messages in an in-memory
+SQLite database with the same composite index as migration 005 and times
+a page read near the newest message and one near the oldest, using:
+
+  keyset  - the query MessageRepository.page issues (range bound + or)
+  or-only - the keyset predicate without the redundant range bound
+  offset  - LIMIT/OFFSET paging to the same depth
+
+Sends: pushes concurrent messages through BatchWriter with a fake insert
+that costs a fixed round-trip (at most SUPABASE_MAX_CONCURRENCY in flight),
+against awaiting one insert per message.
+
+    cd backend
+    python -m benchmarks.bench_chat_history --sizes 1000 10000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sqlite3
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.infrastructure.write_buffer import BatchWriter
+
+PAGE = 50
+
+KEYSET = """
+    select id, sender_id, content, created_at from messages
+    where conversation_id = ? and created_at <= ?
+      and (created_at < ? or (created_at = ? and id < ?))
+    order by created_at desc, id desc limit ?
+"""
+OR_ONLY = """
+    select id, sender_id, content, created_at from messages
+    where conversation_id = ?
+      and (created_at < ? or (created_at = ? and id < ?))
+    order by created_at desc, id desc limit ?
+"""
+OFFSET = """
+    select id, sender_id, content, created_at from messages
+    where conversation_id = ?
+    order by created_at desc, id desc limit ? offset ?
+"""
+
+
+def build_db(
+    sizes: list[int],
+) -> tuple[sqlite3.Connection, dict[int, tuple[str, list[tuple[str, str]]]]]:
+    """One conversation per size; returns its id and (created_at, id) keys newest first."""
+    db = sqlite3.connect(":memory:")
+    db.execute(
+        "create table messages (id text primary key, conversation_id text not null,"
+        " sender_id text not null, content text not null, created_at text not null)"
+    )
+    db.execute(
+        "create index idx_messages_conversation_created"
+        " on messages (conversation_id, created_at desc, id desc)"
+    )
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    conversations: dict[int, tuple[str, list[tuple[str, str]]]] = {}
+    for n in sizes:
+        conversation_id = str(uuid.uuid4())
+        senders = (str(uuid.uuid4()), str(uuid.uuid4()))
+        rows = [
+            (
+                str(uuid.uuid4()),
+                conversation_id,
+                senders[i % 2],
+                f"message {i}",
+                # Pairs of identical timestamps exercise the id tie-breaker.
+                (start + timedelta(seconds=i // 2)).isoformat(),
+            )
+            for i in range(n)
+        ]
+        db.executemany("insert into messages values (?, ?, ?, ?, ?)", rows)
+        conversations[n] = (conversation_id, sorted(((r[4], r[0]) for r in rows), reverse=True))
+    db.commit()
+    return db, conversations
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def bench_history(sizes: list[int], repeat: int) -> None:
+    db, conversations = build_db(sizes)
+    print(f"history: page={PAGE}, median of {repeat} runs (ms)")
+    print(f"{'messages':>9} {'depth':>7} {'keyset':>8} {'or-only':>8} {'offset':>8}")
+    for n in sizes:
+        conversation_id, ordered = conversations[n]
+        for label, depth in (("newest", PAGE), ("oldest", n - PAGE - 1)):
+            created_at, last_id = ordered[depth]
+            keyset = timed(
+                lambda: db.execute(
+                    KEYSET, (conversation_id, created_at, created_at, created_at, last_id, PAGE)
+                ).fetchall(),
+                repeat,
+            )
+            or_only = timed(
+                lambda: db.execute(
+                    OR_ONLY, (conversation_id, created_at, created_at, last_id, PAGE)
+                ).fetchall(),
+                repeat,
+            )
+            offset = timed(
+                lambda: db.execute(OFFSET, (conversation_id, PAGE, depth + 1)).fetchall(),
+                repeat,
+            )
+            print(
+                f"{n:>9,} {label:>7} {keyset * 1000:8.3f} {or_only * 1000:8.3f} {offset * 1000:8.3f}"
+            )
+
+
+async def bench_sends(messages: int, rtt: float) -> None:
+    inserts = 0
+    # Same cap run_sync puts on in-flight Supabase calls.
+    in_flight = asyncio.Semaphore(settings.SUPABASE_MAX_CONCURRENCY)
+
+    async def insert(rows: list[dict]) -> None:
+        nonlocal inserts
+        async with in_flight:
+            inserts += 1
+            await asyncio.sleep(rtt)
+
+    async def send(submit, i: int) -> None:
+        await submit({"id": str(i), "content": f"message {i}"})
+
+    start = time.perf_counter()
+    await asyncio.gather(*(send(lambda row: insert([row]), i) for i in range(messages)))
+    direct, direct_inserts = time.perf_counter() - start, inserts
+
+    inserts = 0
+    writer = BatchWriter("bench", insert, max_batch=200, max_delay=0.02)
+    await writer.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(send(writer.submit, i) for i in range(messages)))
+    batched = time.perf_counter() - start
+    await writer.stop()
+
+    print(
+        f"\nsends: {messages} concurrent, {rtt * 1000:.0f}ms per insert round-trip, "
+        f"{settings.SUPABASE_MAX_CONCURRENCY} in flight"
+    )
+    print(f"  one insert per message: {direct_inserts:>5} inserts  {direct:6.2f}s wall")
+    print(f"  BatchWriter:            {inserts:>5} inserts  {batched:6.2f}s wall")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--messages", type=int, default=5_000)
+    parser.add_argument("--rtt", type=float, default=0.01)
+    args = parser.parse_args()
+    bench_history(args.sizes, args.repeat)
+    asyncio.run(bench_sends(args.messages, args.rtt))
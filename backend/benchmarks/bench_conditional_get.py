@@ -0,0 +1,53 @@
+"""Repeat views of GET /profiles/{username}: full 200s vs 304 revalidation.
+
+Serves one profile (with a github_repos list) through the real app, the
+profile cache warm, and compares CPU and bytes per request for a client
+that re-downloads every time against one that sends If-None-Match.
+
+    cd backend
+    python -m benchmarks.bench_conditional_get --repos 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+
+from app.infrastructure.supabase_repository import ProfileRepository
+from benchmarks.bench_serialization import make_rows
+
+
+def main(args: argparse.Namespace) -> None:
+    (row,) = make_rows(1, args.repos)
+
+    async def by_username(usernames: list[str], columns: str = "*") -> list[dict]:
+        return [row] if row["github_username"] in usernames else []
+
+    ProfileRepository.get_many_by_username = staticmethod(by_username)
+    import main as app_module
+
+    client = TestClient(app_module.app)
+    path = f"/api/v1/profiles/{row['github_username']}"
+    etag = client.get(path).headers["etag"]
+
+    print(f"profile with {args.repos} repos, {args.requests} requests each")
+    for label, headers in (("no validator", {}), ("If-None-Match", {"If-None-Match": etag})):
+        sent = 0
+        start = time.process_time()
+        for _ in range(args.requests):
+            response = client.get(path, headers=headers)
+            sent += len(response.content)
+        cpu = (time.process_time() - start) / args.requests
+        print(
+            f"{label:>14}: HTTP {response.status_code}  {cpu * 1000:6.3f}ms CPU/request  "
+            f"{sent / args.requests / 1024:6.1f}KB body/request"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repos", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=1000)
+    main(parser.parse_args())
@@ -0,0 +1,131 @@
+"""Radius-query latency of the in-memory geo grid for one dense city (Berlin, 52.5°N).
+
+Scatters profiles around a city centre (normally distributed, so the
+centre is crowded and the edges sparse), warms the index through a fake
+`profile_points_in_box`, then times nearest-first pages at several radii
+(up to the default discover radius, MATCH_RADIUS_KM) and checks every
+page against a brute-force haversine sort. Queries the grid refuses
+(too many cells at this latitude) are counted as RPC fallbacks. Also
+times incremental updates (a profile moving across the city).
+
+    cd backend
+    python -m benchmarks.bench_geo_index --profiles 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import random
+import time
+import uuid
+
+import numpy as np
+
+from app.core.config import settings
+from app.infrastructure.geo_index import EARTH_RADIUS_M, GeoGridIndex
+from app.infrastructure.supabase_repository import ProfileRepository
+
+TECHS = ["python", "go", "rust", "typescript", "java", "kotlin", "swift", "elixir"]
+
+
+def brute_force(rows: list[dict], lat: float, lng: float, radius_km: float, limit: int):
+    phi0, lam0 = math.radians(lat), math.radians(lng)
+    hits = []
+    for r in rows:
+        phi, lam = math.radians(r["location_lat"]), math.radians(r["location_lng"])
+        a = math.sin((phi - phi0) / 2) ** 2 + math.cos(phi0) * math.cos(phi) * math.sin((lam - lam0) / 2) ** 2
+        d = 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+        if d <= radius_km * 1000:
+            hits.append((d, r["id"]))
+    hits.sort()
+    return [profile_id for _, profile_id in hits[:limit]]
+
+
+async def main(args: argparse.Namespace) -> None:
+    rng = random.Random(7)
+    lat0, lng0 = 52.52, 13.405
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "location_lat": lat0 + rng.gauss(0, args.spread_km / 111.2),
+            "location_lng": lng0 + rng.gauss(0, args.spread_km / (111.2 * math.cos(math.radians(lat0)))),
+            "tech_stack": rng.sample(TECHS, 3),
+        }
+        for _ in range(args.profiles)
+    ]
+    lats = np.array([r["location_lat"] for r in rows])
+    lngs = np.array([r["location_lng"] for r in rows])
+
+    async def points_in_box(min_lat, min_lng, max_lat, max_lng, limit, after_id=None):
+        inside = (lats >= min_lat) & (lats <= max_lat) & (lngs >= min_lng) & (lngs <= max_lng)
+        page = sorted((rows[i] for i in np.flatnonzero(inside)), key=lambda r: r["id"])
+        if after_id is not None:
+            page = [r for r in page if r["id"] > after_id]
+        return page[:limit]
+
+    ProfileRepository.points_in_box = staticmethod(points_in_box)
+    index = GeoGridIndex(
+        settings.GEO_CELL_DEGREES, settings.GEO_MAX_CELLS, settings.GEO_MAX_QUERY_CELLS, 3600
+    )
+    start = time.perf_counter()
+    # Cold queries fall back to the RPC and warm their cells in the background;
+    # a lattice of 25 km queries covers the largest radius around the city.
+    reach = (max(args.radii) + 3 * args.spread_km) / 111.2
+    steps = np.arange(-1.0, 1.01, 0.25)
+    for dlat in steps * reach:
+        for dlng in steps * reach / math.cos(math.radians(lat0)):
+            index.query(lat0 + dlat, lng0 + dlng, 25, 1)
+    while index.stats()["loading_cells"]:
+        await asyncio.sleep(0.01)
+    print(
+        f"{args.profiles:,} profiles, cell {settings.GEO_CELL_DEGREES}°, warmed "
+        f"{index.stats()['cells']:,} cells in {time.perf_counter() - start:.2f}s"
+    )
+
+    print(f"{'radius':>7} {'in radius':>10} {'mean µs':>8} {'p99 µs':>8} {'techs µs':>9} {'fallback':>9}  check")
+    for radius_km in args.radii:
+        timings, tech_timings, fallbacks = [], [], 0
+        for _ in range(args.queries):
+            lat = lat0 + rng.gauss(0, args.spread_km / 2 / 111.2)
+            lng = lng0 + rng.gauss(0, args.spread_km / 2 / 68)
+            t = time.perf_counter()
+            page = index.query(lat, lng, radius_km, args.limit)
+            timings.append(time.perf_counter() - t)
+            t = time.perf_counter()
+            index.query(lat, lng, radius_km, args.limit, techs=["rust"])
+            tech_timings.append(time.perf_counter() - t)
+            fallbacks += page is None
+        if page is None:
+            print(f"{radius_km:>5}km {'':>10} {'':>8} {'':>8} {'':>9} {fallbacks:>9}  grid refused (RPC fallback)")
+            continue
+        in_radius = len(brute_force(rows, lat, lng, radius_km, len(rows)))
+        ok = [h["id"] for h in page] == brute_force(rows, lat, lng, radius_km, args.limit)
+        # Second page through the keyset cursor.
+        after = (page[-1]["distance_m"], page[-1]["id"])
+        second = index.query(lat, lng, radius_km, args.limit, after=after)
+        expected = brute_force(rows, lat, lng, radius_km, 2 * args.limit)[args.limit :]
+        ok = ok and [h["id"] for h in second] == expected
+        timings.sort()
+        print(
+            f"{radius_km:>5}km {in_radius:>10,} {np.mean(timings) * 1e6:>8,.0f} "
+            f"{timings[int(len(timings) * 0.99)] * 1e6:>8,.0f} "
+            f"{np.mean(tech_timings) * 1e6:>9,.0f} {fallbacks:>9}  {'ok' if ok else 'MISMATCH'}"
+        )
+
+    moves = rng.sample(rows, min(10_000, len(rows)))
+    t = time.perf_counter()
+    for r in moves:
+        index.upsert(r["id"], lat0 + rng.gauss(0, 0.05), lng0 + rng.gauss(0, 0.05), r["tech_stack"])
+    print(f"upsert: {(time.perf_counter() - t) / len(moves) * 1e6:.1f}µs per move")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=100_000)
+    parser.add_argument("--spread-km", type=float, default=10.0)
+    parser.add_argument("--radii", type=float, nargs="+", default=[1, 2, 5, 10, 25, settings.MATCH_RADIUS_KM])
+    parser.add_argument("--limit", type=int, default=21)
+    parser.add_argument("--queries", type=int, default=500)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,120 @@
+"""Bulk GitHub enrichment: per-call AsyncClient vs the shared connection pool.
+
+Runs against a local TLS stub of the GitHub API, so every new connection
+pays a real TCP + TLS handshake. Each user costs the two repo listings
+enrichment used to make: top repos, then a wider page for languages.
+
+    cd backend
+    python -m benchmarks.bench_github_pool --users 200 --concurrency 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.infrastructure.github_client import GitHubClient
+from benchmarks.stub_server import StubResponse, StubServer, self_signed_context
+
+# A token of our own keeps the shared scheduler's anonymous quota (and its
+# ETag cache) out of a comparison of transports.
+TOKEN = "bench-token"
+
+
+def fake_repos(username: str, count: int = 10) -> list[dict]:
+    return [
+        {
+            "name": f"repo-{i}",
+            "full_name": f"{username}/repo-{i}",
+            "description": "stub repository",
+            "language": ["Python", "Dart", "Go", "Rust"][i % 4],
+            "stargazers_count": i,
+            "html_url": f"https://github.com/{username}/repo-{i}",
+            "pushed_at": "2024-01-01T00:00:00Z",
+        }
+        for i in range(count)
+    ]
+
+
+def github_handler(request):
+    parts = request.path.strip("/").split("/")
+    if len(parts) == 3 and parts[0] == "users" and parts[2] == "repos":
+        return StubResponse(body=fake_repos(parts[1]))
+    return StubResponse(status=404, body={"message": "Not Found"})
+
+
+async def enrich_all(make_client, users: list[str], concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(username: str) -> None:
+        async with sem:
+            async with make_client() as gh:
+                await gh.list_user_repos(username, limit=10)
+                await gh.list_user_repos(username, limit=20)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(u) for u in users))
+    return time.perf_counter() - start
+
+
+async def main(users: int, concurrency: int, latency: float) -> None:
+    server_ctx, client_ctx = self_signed_context()
+    server = await StubServer(github_handler, latency, server_ctx).start()
+    names = [f"dev{i}" for i in range(users)]
+
+    class PerCall:
+        """The old pattern: a fresh AsyncClient for every request."""
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return None
+
+        async def list_user_repos(self, username, limit=10):
+            async with httpx.AsyncClient(base_url=server.url, verify=client_ctx) as c:
+                return await GitHubClient(TOKEN, http_client=c).list_user_repos(username, limit)
+
+    pooled_http = httpx.AsyncClient(
+        base_url=server.url,
+        verify=client_ctx,
+        limits=httpx.Limits(
+            max_connections=settings.GITHUB_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.GITHUB_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.GITHUB_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+    shared = GitHubClient(TOKEN, http_client=pooled_http)
+
+    class Pooled:
+        async def __aenter__(self):
+            return shared
+
+        async def __aexit__(self, *exc):
+            return None
+
+    print(f"{users} users x 2 calls, concurrency={concurrency}, latency={latency * 1000:.0f}ms")
+    for label, factory in (("per-call client", PerCall), ("pooled client", Pooled)):
+        server.connections = server.requests = 0
+        elapsed = await enrich_all(factory, names, concurrency)
+        print(
+            f"  {label:<16} {elapsed * 1000:8.1f} ms total  "
+            f"{elapsed / users * 1000:6.2f} ms/user  "
+            f"{server.connections:4d} handshakes / {server.requests} requests"
+        )
+
+    await pooled_http.aclose()
+    await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.002, help="seconds per request")
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.concurrency, args.latency))
@@ -0,0 +1,132 @@
+"""Leaderboard latency: skip-list index vs a sorted list vs sorting per request.
+
+Loads profiles with random XP and tech stacks through a fake `xp_page`,
+then times the operations the leaderboard API does:
+
+  top      one page of the board at a random offset
+  position one user's position (the /me endpoint)
+  award    an XP change (as a catch-up applies it) that moves the user on every board
+
+for the `LeaderboardIndex`, for a plain sorted Python list kept with
+`bisect.insort` (O(n) inserts), and for sorting everything per request
+(what an un-indexed `order by xp` does). Pages and positions are checked
+against the per-request sort.
+
+    cd backend
+    python -m benchmarks.bench_leaderboard --profiles 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import random
+import statistics
+import time
+
+from app.infrastructure.leaderboard import LeaderboardIndex
+from app.infrastructure.supabase_repository import ProfileRepository
+
+TECHS = ["python", "go", "rust", "typescript", "java", "kotlin", "swift", "elixir"]
+
+
+def _us(timings: list[float]) -> str:
+    return f"{statistics.mean(timings) * 1e6:>10,.1f}"
+
+
+async def main(args: argparse.Namespace) -> None:
+    rng = random.Random(11)
+    rows = [
+        {
+            "id": f"{i:08x}-profile",
+            "xp": int(rng.paretovariate(1.2) * 50),
+            "tech_stack": rng.sample(TECHS, 3),
+        }
+        for i in range(args.profiles)
+    ]
+    xp = {r["id"]: r["xp"] for r in rows}
+
+    ids = [r["id"] for r in rows]
+
+    async def xp_page(limit, after_id=None):
+        start = 0 if after_id is None else bisect.bisect_right(ids, after_id)
+        return rows[start : start + limit]
+
+    ProfileRepository.xp_page = staticmethod(xp_page)
+    index = LeaderboardIndex()
+    t = time.perf_counter()
+    await index.load()
+    print(f"{args.profiles:,} profiles loaded into {index.stats()['technologies']} boards "
+          f"in {time.perf_counter() - t:.2f}s")
+
+    flat = sorted((-v, k) for k, v in xp.items())
+    flat_by_tech = {
+        tech: sorted((-r["xp"], r["id"]) for r in rows if tech in r["tech_stack"]) for tech in TECHS
+    }
+    techs_of = {r["id"]: r["tech_stack"] for r in rows}
+
+    def sort_page(offset: int, limit: int) -> list[str]:
+        return [k for _, k in sorted((-v, k) for k, v in xp.items())[offset : offset + limit]]
+
+    def sort_position(user_id: str) -> int:
+        mine = xp[user_id]
+        return 1 + sum(1 for v in xp.values() if v > mine)
+
+    offsets = [int(rng.paretovariate(1.0)) % args.profiles for _ in range(args.queries)]
+    users = rng.sample(list(xp), args.queries)
+    timings: dict[str, dict[str, list[float]]] = {
+        name: {"top": [], "position": [], "award": []} for name in ("index", "sorted list", "sort")
+    }
+    ok = True
+    for offset, user_id in zip(offsets, users):
+        t = time.perf_counter()
+        page = index.top(args.limit, offset)
+        timings["index"]["top"].append(time.perf_counter() - t)
+        t = time.perf_counter()
+        position = index.position(user_id)
+        timings["index"]["position"].append(time.perf_counter() - t)
+
+        t = time.perf_counter()
+        flat_page = [k for _, k in flat[offset : offset + args.limit]]
+        timings["sorted list"]["top"].append(time.perf_counter() - t)
+        t = time.perf_counter()
+        bisect.bisect_left(flat, (-xp[user_id], ""))
+        timings["sorted list"]["position"].append(time.perf_counter() - t)
+
+        if len(timings["sort"]["top"]) < args.sort_queries:
+            t = time.perf_counter()
+            expected = sort_page(offset, args.limit)
+            timings["sort"]["top"].append(time.perf_counter() - t)
+            t = time.perf_counter()
+            expected_position = sort_position(user_id)
+            timings["sort"]["position"].append(time.perf_counter() - t)
+            ok = ok and [u for _, u, _ in page] == expected == flat_page
+            ok = ok and position == (expected_position, xp[user_id])
+
+        delta = rng.randint(1, 200)
+        t = time.perf_counter()
+        index.upsert(user_id, xp[user_id] + delta, techs_of[user_id])
+        timings["index"]["award"].append(time.perf_counter() - t)
+        t = time.perf_counter()
+        for board in [flat] + [flat_by_tech[tech] for tech in techs_of[user_id]]:
+            board.pop(bisect.bisect_left(board, (-xp[user_id], user_id)))
+            bisect.insort(board, (-xp[user_id] - delta, user_id))
+        timings["sorted list"]["award"].append(time.perf_counter() - t)
+        xp[user_id] += delta
+
+    print(f"{'':>12} {'top µs':>10} {'position µs':>12} {'award µs':>10}")
+    for name, ops in timings.items():
+        award = _us(ops["award"]) if ops["award"] else f"{'-':>10}"
+        print(f"{name:>12} {_us(ops['top'])} {_us(ops['position']):>12} {award}")
+    print("award moves the user on the global board and on three technology boards")
+    print("check:", "ok" if ok else "MISMATCH")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=5_000)
+    parser.add_argument("--sort-queries", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
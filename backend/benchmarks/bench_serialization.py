@@ -0,0 +1,140 @@
+"""CPU per discover page: validated Pydantic responses vs the trusted path.
+
+Serves the same page of profile rows (each with a github_repos list) from
+a scratch FastAPI app three ways and reports process CPU per request:
+
+  before     [ProfileResponse(**p) ...] re-validated against response_model
+  validated  trusted_response with TRUSTED_SERIALIZATION off
+  trusted    trusted_response: one projection pass, orjson encoding
+
+It also checks that all three produce the same JSON (timestamps compared
+as instants).
+
+    cd backend
+    python -m benchmarks.bench_serialization --items 100 --repos 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.serialization import trusted_response
+from app.domain.schemas import DiscoverPageResponse, ProfileResponse
+
+LANGUAGES = ["Python", "Go", "Rust", "TypeScript", "Java", "Kotlin"]
+
+
+def make_rows(items: int, repos: int) -> list[dict]:
+    rng = random.Random(3)
+    now = datetime.now(timezone.utc)
+    rows = []
+    for n in range(items):
+        stamp = (now - timedelta(minutes=n)).isoformat()
+        rows.append({
+            "id": str(uuid.uuid4()),
+            "github_username": f"dev{n}",
+            "display_name": f"Developer {n}",
+            "bio": "Building things with code. " * 4,
+            "avatar_url": f"https://avatars.githubusercontent.com/u/{n}",
+            "tech_stack": rng.sample(LANGUAGES, 3),
+            "github_repos": [
+                {
+                    "name": f"project-{r}",
+                    "description": "A small tool that does one thing well.",
+                    "language": rng.choice(LANGUAGES),
+                    "stars": rng.randint(0, 5000),
+                    "url": f"https://github.com/dev{n}/project-{r}",
+                    "languages": {lang: rng.randint(100, 100_000) for lang in rng.sample(LANGUAGES, 2)},
+                }
+                for r in range(repos)
+            ],
+            "location_lat": 52.5 + rng.random(),
+            "location_lng": 13.4 + rng.random(),
+            "xp": rng.randint(0, 6000),
+            "rank": "Senior",
+            "created_at": stamp,
+            "updated_at": stamp,
+        })
+    return rows
+
+
+def build_app(rows: list[dict]) -> FastAPI:
+    app = FastAPI()
+    cursor = "eyJjIjoiMjAyNC0wMS0wMVQwMDowMDowMCIsImkiOiJ4In0"
+
+    @app.get("/before", response_model=DiscoverPageResponse)
+    async def before():
+        return DiscoverPageResponse(items=[ProfileResponse(**p) for p in rows], next_cursor=cursor)
+
+    @app.get("/after", response_model=DiscoverPageResponse)
+    async def after():
+        return trusted_response(DiscoverPageResponse, {"items": rows, "next_cursor": cursor})
+
+    return app
+
+
+def normalize(value):
+    if isinstance(value, dict):
+        return {k: normalize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [normalize(v) for v in value]
+    if isinstance(value, str) and len(value) >= 20 and value[4] == "-" and "T" in value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+    return value
+
+
+def measure(client: TestClient, path: str, requests: int) -> tuple[float, int, object]:
+    body = client.get(path).content  # warm up
+    start = time.process_time()
+    for _ in range(requests):
+        body = client.get(path).content
+    return (time.process_time() - start) / requests, len(body), normalize(json.loads(body))
+
+
+def main(args: argparse.Namespace) -> None:
+    rows = make_rows(args.items, args.repos)
+    client = TestClient(build_app(rows))
+    print(f"{args.items} profiles x {args.repos} repos, {args.requests} requests each")
+
+    results = {}
+    for label, path, trusted in (
+        ("before", "/before", True),
+        ("validated", "/after", False),
+        ("trusted", "/after", True),
+    ):
+        settings.TRUSTED_SERIALIZATION = trusted
+        results[label] = measure(client, path, args.requests)
+    settings.TRUSTED_SERIALIZATION = True
+
+    # Baseline: a request that serializes nothing (TestClient + routing cost).
+    empty = FastAPI()
+    empty.get("/")(lambda: None)
+    base, _, _ = measure(TestClient(empty), "/", args.requests)
+
+    for label, (cpu, size, _) in results.items():
+        print(
+            f"{label:>10}: {cpu * 1000:7.2f}ms CPU/request  "
+            f"({(cpu - base) * 1000:6.2f}ms over an empty request)  {size / 1024:6.1f}KB"
+        )
+    same = results["before"][2] == results["validated"][2] == results["trusted"][2]
+    print("identical payloads" if same else "PAYLOADS DIFFER")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--repos", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=300)
+    main(parser.parse_args())
@@ -0,0 +1,106 @@
+"""API cold start: import time of `main` against a budget.
+
+Runs `python -X importtime -c "import main"` in fresh interpreters and
+reports the median cumulative import time, the heaviest top-level
+packages, and whether any SDK that should load lazily (the Supabase
+stack) was imported anyway. A last run also times the lifespan start-up
+and the first request.
+
+Exits non-zero when the median is over budget or a deferred package was
+imported, so it can run as a CI check:
+
+    cd backend
+    python -m benchmarks.bench_startup --runs 7 --budget-ms 900
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+# Import-time budget for `import main`, measured under -X importtime
+# (which itself adds some overhead). Lower it as start-up gets faster.
+BUDGET_MS = 900.0
+
+# Packages that must not be imported until the first client is built.
+DEFERRED = ("supabase", "supabase_auth", "gotrue", "postgrest", "realtime", "storage3", "supafunc")
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+_READY_SCRIPT = """
+import time
+start = time.perf_counter()
+import main
+from fastapi.testclient import TestClient
+imported = time.perf_counter()
+with TestClient(main.app) as client:
+    ready = time.perf_counter()
+    client.get("/")
+    served = time.perf_counter()
+print(f"{(imported - start) * 1e3:.1f} {(ready - imported) * 1e3:.1f} {(served - ready) * 1e3:.1f}")
+"""
+
+
+def _env() -> dict[str, str]:
+    return {**os.environ, "PYTHONPATH": str(BACKEND), "PYTHONWARNINGS": "ignore"}
+
+
+def import_profile() -> tuple[float, Counter, set[str], int]:
+    """One fresh `import main`: (total ms, self ms per top-level package,
+    packages, modules imported)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND, env=_env(), capture_output=True, text=True, check=True,
+    )
+    total = 0.0
+    modules = 0
+    by_package: Counter = Counter()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        modules += 1
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+        by_package[name.split(".")[0]] += int(self_us) / 1000
+        if name == "main":
+            total = int(cumulative_us) / 1000
+    return total, by_package, set(by_package), modules
+
+
+def main(args: argparse.Namespace) -> int:
+    runs = [import_profile() for _ in range(args.runs)]
+    totals = [run[0] for run in runs]
+    median = statistics.median(totals)
+    _, by_package, packages, modules = runs[totals.index(min(totals, key=lambda t: abs(t - median)))]
+
+    print(f"import main: median {median:.0f}ms over {args.runs} runs "
+          f"(min {min(totals):.0f}ms, max {max(totals):.0f}ms), budget {args.budget_ms:.0f}ms")
+    print(f"{modules} modules imported")
+    print("heaviest packages (self time):")
+    for package, ms in by_package.most_common(args.top):
+        print(f"  {package:<24}{ms:7.1f}ms")
+
+    ready = subprocess.run(
+        [sys.executable, "-c", _READY_SCRIPT],
+        cwd=BACKEND, env=_env(), capture_output=True, text=True, check=True,
+    ).stdout.split()
+    print(f"import {ready[0]}ms, lifespan start-up {ready[1]}ms, first request {ready[2]}ms")
+
+    eager = sorted(packages.intersection(DEFERRED))
+    if eager:
+        print(f"FAIL: imported at start-up, should be deferred: {', '.join(eager)}")
+    if median > args.budget_ms:
+        print(f"FAIL: over budget by {median - args.budget_ms:.0f}ms")
+    return 1 if eager or median > args.budget_ms else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--top", type=int, default=12)
+    sys.exit(main(parser.parse_args()))
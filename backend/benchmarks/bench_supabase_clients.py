@@ -0,0 +1,72 @@
+"""Per-call cost of Supabase clients: create_client per call vs the registry.
+
+Runs a one-row PostgREST select against a local stub server three ways:
+
+  per-call   create_client(...) for every call (the old admin-client path)
+  registry   clients.admin, built once on the shared connection pool
+  per-user   clients.for_user(jwt), a fresh RLS client on the shared pool
+
+and reports wall time per call, the client-construction share of it, and
+how many TCP connections the stub accepted.
+
+    cd backend
+    python -m benchmarks.bench_supabase_clients --calls 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from supabase import create_client
+
+from app.core.config import settings
+from app.infrastructure.supabase_client import clients
+from benchmarks.stub_server import StubResponse, StubServer
+
+SERVICE_KEY = "service-role-key"
+
+
+def run(label: str, make_client, calls: int, server: StubServer, dispose=None) -> None:
+    server.connections = 0
+    build = total = 0.0
+    for _ in range(calls):
+        start = time.perf_counter()
+        client = make_client()
+        built = time.perf_counter()
+        client.table("profiles").select("id").limit(1).execute()
+        build += built - start
+        total += time.perf_counter() - start
+        if dispose:
+            dispose(client)
+    print(
+        f"{label:>9}: {total / calls * 1e3:7.3f}ms/call  "
+        f"({build / calls * 1e3:6.3f}ms building the client)  "
+        f"{server.connections} connections"
+    )
+
+
+def main(args: argparse.Namespace) -> None:
+    server = StubServer(lambda request: StubResponse(body=[{"id": "x"}])).start_in_thread()
+    settings.SUPABASE_URL = server.url
+    settings.SUPABASE_SERVICE_KEY = SERVICE_KEY
+    try:
+        print(f"{args.calls} selects against {server.url}")
+        run(
+            "per-call",
+            lambda: create_client(server.url, SERVICE_KEY),
+            args.calls,
+            server,
+            dispose=lambda client: client.postgrest.session.close(),
+        )
+        run("registry", lambda: clients.admin, args.calls, server)
+        run("per-user", lambda: clients.for_user("user-jwt"), args.calls, server)
+    finally:
+        clients.close()
+        server.stop_thread()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=300)
+    main(parser.parse_args())
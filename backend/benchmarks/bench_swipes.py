@@ -0,0 +1,128 @@
+"""Sustained swipe ingestion rate through SwipeService.
+
+Concurrent clients swipe on random profiles (a share of them likes) for a
+fixed duration. The `record_swipes` and `create_mutual_connection` RPCs are
+replaced with fakes that cost one database round-trip each, with at most
+SUPABASE_MAX_CONCURRENCY calls in flight, as run_sync allows. For contrast
+the same load is run with one awaited insert per swipe.
+
+    cd backend
+    python -m benchmarks.bench_swipes --clients 200 --seconds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+
+from app.core.config import settings
+from app.infrastructure.supabase_repository import (
+    ConnectionRepository,
+    SeenFilterRepository,
+    SwipeRepository,
+)
+from app.services import swipe_service
+from app.services.swipe_service import SwipeService, swipe_writer
+
+
+class FakeDatabase:
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.in_flight = asyncio.Semaphore(settings.SUPABASE_MAX_CONCURRENCY)
+        self.calls = 0
+        self.rows = 0
+        self.matches = 0
+
+    async def _round_trip(self) -> None:
+        async with self.in_flight:
+            self.calls += 1
+            await asyncio.sleep(self.rtt)
+
+    async def record_many(self, rows: list[dict]) -> None:
+        await self._round_trip()
+        self.rows += len(rows)
+
+    async def likers_of(self, user_id: str) -> list[str]:
+        await self._round_trip()
+        return []
+
+    async def seen_checkpoint(self, user_id: str) -> None:
+        return None
+
+    async def swiped_targets(self, user_id: str, limit: int, after_target: str | None = None) -> list[str]:
+        return []
+
+    async def create_mutual(self, requester_id: str, target_id: str) -> dict:
+        await self._round_trip()
+        self.matches += 1
+        return {"id": str(uuid.uuid4()), "requester_id": requester_id,
+                "target_id": target_id, "status": "accepted"}
+
+
+async def run(users: int, clients: int, seconds: float, like_ratio: float,
+              rtt: float, batched: bool) -> None:
+    db = FakeDatabase(rtt)
+    SwipeRepository.likers_of = staticmethod(db.likers_of)
+    ConnectionRepository.create_mutual = staticmethod(db.create_mutual)
+    # Every swiper starts with an empty seen-set.
+    SeenFilterRepository.get = staticmethod(db.seen_checkpoint)
+    SwipeRepository.targets_of = staticmethod(db.swiped_targets)
+    swipe_service.like_index = swipe_service.LikeIndex(settings.SWIPE_INDEX_MAX_USERS)
+    swipe_writer._flush_fn = db.record_many
+    if not batched:
+        async def direct(row: dict) -> None:
+            await db.record_many([row])
+        swipe_writer.submit = direct  # type: ignore[method-assign]
+
+    ids = [str(uuid.uuid4()) for _ in range(users)]
+    latencies: list[float] = []
+    deadline = time.perf_counter() + seconds
+
+    async def client(seed: int) -> None:
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            swiper, target = rng.sample(ids, 2)
+            direction = "like" if rng.random() < like_ratio else "pass"
+            start = time.perf_counter()
+            await SwipeService.swipe(swiper, target, direction)
+            latencies.append(time.perf_counter() - start)
+
+    await swipe_writer.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    await swipe_writer.stop()
+    if not batched:
+        del swipe_writer.submit
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)]
+    label = "batched" if batched else "per-swipe insert"
+    print(
+        f"{label:>17}: {len(latencies) / elapsed:9,.0f} swipes/s  "
+        f"p50 {statistics.median(latencies) * 1000:6.2f}ms  p99 {p99 * 1000:6.2f}ms  "
+        f"{db.calls:6,} db calls  {db.rows:7,} rows  {db.matches:5,} matches"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(
+        f"{args.users:,} users, {args.clients} clients, {args.seconds:.0f}s, "
+        f"{args.rtt * 1000:.0f}ms round-trip, {settings.SUPABASE_MAX_CONCURRENCY} in flight"
+    )
+    for batched in (False, True):
+        await run(args.users, args.clients, args.seconds, args.like_ratio, args.rtt, batched)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--like-ratio", type=float, default=0.4)
+    parser.add_argument("--rtt", type=float, default=0.01)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,74 @@
+"""Per-request tech-stack scoring cost at 10k / 100k / 1M profiles.
+
+Scores one viewer against every profile with the bit-packed Jaccard and
+the sparse weighted cosine from app.services.tech_similarity, and (at 10k)
+against a plain Python set loop for reference.
+
+    cd backend
+    python -m benchmarks.bench_tech_similarity --sizes 10000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from app.services.tech_similarity import TechMatrix, TechVocabulary
+
+
+def synthetic_stacks(n: int, vocab_size: int, rng: random.Random) -> list[list[str]]:
+    techs = [f"tech{i}" for i in range(vocab_size)]
+    # Skewed popularity, like real stacks: a few languages dominate.
+    popularity = [1.0 / (i + 1) for i in range(vocab_size)]
+    return [rng.choices(techs, popularity, k=rng.randint(2, 8)) for _ in range(n)]
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main(sizes: list[int], vocab_size: int, repeat: int) -> None:
+    rng = random.Random(42)
+    viewer = ["tech0", "tech3", "tech17", "tech42"]
+    viewer_weights = {t: 1.0 + i for i, t in enumerate(viewer)}
+
+    print(f"vocab={vocab_size}  median of {repeat} runs")
+    print(f"{'profiles':>10} {'build':>9} {'jaccard':>10} {'cosine':>10} {'python':>10} {'bits/row':>9}")
+    for n in sizes:
+        stacks = synthetic_stacks(n, vocab_size, rng)
+        weights = [{t: rng.uniform(1, 10) for t in stack} for stack in stacks]
+
+        start = time.perf_counter()
+        matrix = TechMatrix(TechVocabulary(), stacks, weights)
+        build = time.perf_counter() - start
+
+        jaccard = timed(lambda: matrix.jaccard(viewer), repeat)
+        cosine = timed(lambda: matrix.cosine(viewer_weights), repeat)
+
+        python = "-"
+        if n <= 10_000:
+            sets = [set(s) for s in stacks]
+            mine = set(viewer)
+            loop = timed(lambda: [len(mine & s) / len(mine | s) for s in sets], repeat)
+            python = f"{loop * 1000:8.2f}ms"
+
+        print(
+            f"{n:>10,} {build:8.2f}s {jaccard * 1000:8.2f}ms {cosine * 1000:8.2f}ms "
+            f"{python:>10} {matrix.words * 64:>9}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--vocab", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.sizes, args.vocab, args.repeat)
@@ -0,0 +1,429 @@
+"""In-memory stand-ins for Supabase (PostgREST + GoTrue) and the GitHub API.
+
+Both are `StubServer` handlers, so the app's real clients (supabase-py,
+postgrest-py, httpx) talk to them over sockets, with the server's
+injected latency. They implement just enough of each API for the paths
+the load test drives:
+
+  PostgREST  select with eq/neq/gt/gte/lt/lte/in/cs/ov/is and nested
+             or/and filters, order, limit/offset; insert/upsert, update,
+             delete; a few RPCs (others answer null)
+  GoTrue     PKCE code exchange, /user and an empty JWKS
+  GitHub     /users/{user}, /users/{user}/repos, /repos/{owner}/{repo}/languages
+
+`serve_in_subprocess` runs both in a child process, so the fakes' own
+CPU work doesn't compete with the app under test for the GIL. The seeded
+dataset is deterministic (`seed_users`), so the load generator can build
+the same users, tokens and OAuth codes on its side. `GET /__stats`
+returns per-endpoint call counts (`?reset=1` clears them).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import random
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, Callable
+
+from jose import jwt
+
+from benchmarks.stub_server import StubRequest, StubResponse, StubServer
+
+TECHS = ["Python", "Go", "Rust", "TypeScript", "Dart", "Kotlin", "Swift", "Elixir"]
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+_RESERVED = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+def seed_users(count: int, seed: int = 7) -> list[dict]:
+    """Deterministic auth users and their profile rows (newest first)."""
+    rng = random.Random(seed)
+    users = []
+    for i in range(count):
+        user_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        created = (EPOCH - timedelta(minutes=i)).isoformat()
+        techs = rng.sample(TECHS, rng.randint(1, 4))
+        users.append({
+            "id": user_id,
+            "email": f"dev{i}@example.com",
+            "github_username": f"dev{i}",
+            "code": f"oauth-code-{i}",
+            "profile": {
+                "id": user_id,
+                "github_username": f"dev{i}",
+                "display_name": f"Developer {i}",
+                "bio": "Writes code, drinks coffee.",
+                "avatar_url": f"https://avatars.example.com/u/{i}",
+                "tech_stack": techs,
+                "github_repos": [],
+                "location_lat": None,
+                "location_lng": None,
+                "xp": int(rng.paretovariate(1.2) * 20),
+                "rank": "Intern",
+                "created_at": created,
+                "updated_at": created,
+                "enriched_at": None,
+                "enrichment_hash": None,
+            },
+        })
+    return users
+
+
+def access_token(user: dict, secret: str, ttl: float = 6 * 3600) -> str:
+    """An HS256 Supabase-style access token for a seeded user."""
+    now = int(time.time())
+    return jwt.encode(
+        {
+            "sub": user["id"],
+            "email": user["email"],
+            "aud": "authenticated",
+            "role": "authenticated",
+            "iat": now,
+            "exp": now + int(ttl),
+            "user_metadata": {"user_name": user["github_username"]},
+        },
+        secret,
+        algorithm="HS256",
+    )
+
+
+# ── PostgREST filter grammar ─────────────────────────────────────
+
+
+def _split(text: str, sep: str = ",") -> list[str]:
+    """Split on top-level `sep`, respecting parentheses, braces and quotes."""
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, ch in enumerate(text):
+        if ch == '"':
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif ch in "({":
+            depth += 1
+        elif ch in ")}":
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [p for p in parts if p]
+
+
+def _unquote(value: str) -> str:
+    return value[1:-1] if len(value) >= 2 and value[0] == value[-1] == '"' else value
+
+
+def _coerce(raw: str, like: Any) -> Any:
+    if isinstance(like, bool):
+        return raw == "true"
+    if isinstance(like, (int, float)):
+        return float(raw)
+    return raw
+
+
+def _compile(column: str, expr: str) -> Callable[[dict], bool]:
+    """`op.value` (optionally `not.op.value`) against one column."""
+    negate = expr.startswith("not.")
+    if negate:
+        expr = expr[4:]
+    op, _, raw = expr.partition(".")
+    raw = _unquote(raw)
+    members = {_unquote(v) for v in _split(raw[1:-1])} if op in ("in", "cs", "ov") else set()
+
+    def test(row: dict) -> bool:
+        value = row.get(column)
+        if op == "is":
+            return value is None if raw == "null" else value == (raw == "true")
+        if op == "in":
+            return value is not None and str(value) in members
+        if op in ("cs", "ov"):
+            have = set(value or ())
+            return members <= have if op == "cs" else bool(members & have)
+        if value is None:
+            return False
+        other = _coerce(raw, value)
+        return {
+            "eq": value == other, "neq": value != other, "gt": value > other,
+            "gte": value >= other, "lt": value < other, "lte": value <= other,
+        }[op]
+
+    return (lambda row: not test(row)) if negate else test
+
+
+def _compile_group(kind: str, body: str) -> Callable[[dict], bool]:
+    """`or(...)` / `and(...)` body: comma-separated conditions or groups."""
+    tests = []
+    for item in _split(body):
+        head, _, rest = item.partition("(")
+        if head in ("or", "and") and item.endswith(")"):
+            tests.append(_compile_group(head, rest[:-1]))
+        else:
+            column, _, expr = item.partition(".")
+            tests.append(_compile(column, expr))
+    if kind == "or":
+        return lambda row: any(t(row) for t in tests)
+    return lambda row: all(t(row) for t in tests)
+
+
+def _filters(query: dict[str, list[str]]) -> list[Callable[[dict], bool]]:
+    tests = []
+    for key, values in query.items():
+        if key in _RESERVED:
+            continue
+        for value in values:
+            if key in ("or", "and"):
+                tests.append(_compile_group(key, value[1:-1]))
+            else:
+                tests.append(_compile(key, value))
+    return tests
+
+
+def _order(rows: list[dict], spec: list[str]) -> list[dict]:
+    terms = [t for part in spec for t in part.split(",") if t]
+    for term in reversed(terms):
+        column, *mods = term.split(".")
+        desc = "desc" in mods
+        rows.sort(key=lambda r: (r.get(column) is None, r.get(column) if r.get(column) is not None else 0), reverse=desc)
+    return rows
+
+
+def _project(row: dict, select: str) -> dict:
+    if select in ("", "*"):
+        return dict(row)
+    return {c: row.get(c) for c in (s.strip() for s in select.split(",")) if c}
+
+
+class FakeSupabase:
+    """PostgREST + GoTrue over in-memory tables."""
+
+    def __init__(self, users: list[dict], jwt_secret: str):
+        self.jwt_secret = jwt_secret
+        self.tables: dict[str, list[dict]] = defaultdict(list)
+        self.tables["profiles"] = [dict(u["profile"]) for u in users]
+        self.users = {u["id"]: u for u in users}
+        self.codes = {u["code"]: u for u in users}
+        self.calls: Counter = Counter()
+        # Sorted copies of tables per order spec, dropped on every write.
+        self._sorted: dict[tuple[str, tuple[str, ...]], list[dict]] = {}
+        self.rpcs: dict[str, Callable[[dict], Any]] = {
+            "record_swipes": self._record_swipes,
+        }
+
+    def __call__(self, request: StubRequest) -> StubResponse:
+        if request.path == "/__stats":
+            return _stats(self.calls, request)
+        if request.path.startswith("/auth/v1/"):
+            return self._auth(request, request.path.removeprefix("/auth/v1/"))
+        if request.path.startswith("/rest/v1/rpc/"):
+            name = request.path.removeprefix("/rest/v1/rpc/")
+            self.calls[f"rpc:{name}"] += 1
+            handler = self.rpcs.get(name)
+            return StubResponse(body=handler(request.json() or {}) if handler else None)
+        if request.path.startswith("/rest/v1/"):
+            table = request.path.removeprefix("/rest/v1/")
+            self.calls[f"{table}.{request.method}"] += 1
+            return self._rest(request, table)
+        return StubResponse(status=404, body={"message": "not found"})
+
+    # ── PostgREST ────────────────────────────────────────────────
+
+    def _rest(self, request: StubRequest, table: str) -> StubResponse:
+        rows = self.tables[table]
+        tests = _filters(request.query)
+        select = request.query.get("select", ["*"])[0]
+
+        if request.method == "GET":
+            if "order" in request.query:
+                key = (table, tuple(request.query["order"]))
+                if key not in self._sorted:
+                    self._sorted[key] = _order(list(rows), request.query["order"])
+                rows = self._sorted[key]
+            offset = int(request.query.get("offset", ["0"])[0])
+            stop = offset + int(request.query["limit"][0]) if "limit" in request.query else None
+            matched = islice((r for r in rows if all(t(r) for t in tests)), offset, stop)
+            return StubResponse(body=[_project(r, select) for r in matched])
+
+        self._sorted = {k: v for k, v in self._sorted.items() if k[0] != table}
+        matched = [r for r in rows if all(t(r) for t in tests)]
+
+        if request.method == "PATCH":
+            changes = request.json() or {}
+            now = datetime.now(timezone.utc).isoformat()
+            for row in matched:
+                row.update(changes)
+                if "updated_at" in row:
+                    row["updated_at"] = now
+            return StubResponse(body=[dict(r) for r in matched])
+
+        if request.method == "DELETE":
+            keep = [r for r in rows if r not in matched]
+            self.tables[table] = keep
+            return StubResponse(body=[dict(r) for r in matched])
+
+        if request.method == "POST":
+            body = request.json()
+            new_rows = body if isinstance(body, list) else [body]
+            conflict = request.query.get("on_conflict", [None])[0]
+            keys = conflict.split(",") if conflict else []
+            written = []
+            for new in new_rows:
+                existing = next(
+                    (r for r in rows if keys and all(r.get(k) == new.get(k) for k in keys)), None
+                )
+                if existing is not None:
+                    existing.update(new)
+                    written.append(dict(existing))
+                else:
+                    rows.append(dict(new))
+                    written.append(dict(new))
+            return StubResponse(status=201, body=written)
+
+        return StubResponse(status=405, body={"message": "method not allowed"})
+
+    def _record_swipes(self, params: dict) -> None:
+        self._sorted.clear()
+        now = datetime.now(timezone.utc).isoformat()
+        self.tables["swipes"].extend({**s, "created_at": now} for s in params.get("p_swipes", []))
+
+    # ── GoTrue ───────────────────────────────────────────────────
+
+    def _auth(self, request: StubRequest, path: str) -> StubResponse:
+        self.calls[f"auth:{path}"] += 1
+        if path == "token":
+            user = self.codes.get((request.json() or {}).get("auth_code"))
+            if user is None:
+                return StubResponse(status=400, body={"error": "invalid_grant", "error_description": "bad code"})
+            return StubResponse(body={
+                "access_token": access_token(user, self.jwt_secret, ttl=3600),
+                "token_type": "bearer",
+                "expires_in": 3600,
+                "expires_at": int(time.time()) + 3600,
+                "refresh_token": f"refresh-{user['id']}",
+                "user": _auth_user(user),
+            })
+        if path == "user":
+            token = request.headers.get("authorization", "").removeprefix("Bearer ")
+            try:
+                claims = jwt.decode(token, self.jwt_secret, algorithms=["HS256"], audience="authenticated")
+            except Exception:
+                return StubResponse(status=401, body={"message": "invalid JWT"})
+            user = self.users.get(claims["sub"])
+            if user is None:
+                return StubResponse(status=404, body={"message": "user not found"})
+            return StubResponse(body=_auth_user(user))
+        if path == ".well-known/jwks.json":
+            return StubResponse(body={"keys": []})
+        return StubResponse(status=404, body={"message": "not found"})
+
+
+def _auth_user(user: dict) -> dict:
+    return {
+        "id": user["id"],
+        "aud": "authenticated",
+        "role": "authenticated",
+        "email": user["email"],
+        "app_metadata": {"provider": "github"},
+        "user_metadata": {
+            "user_name": user["github_username"],
+            "full_name": user["profile"]["display_name"],
+            "avatar_url": user["profile"]["avatar_url"],
+        },
+        "created_at": user["profile"]["created_at"],
+    }
+
+
+class FakeGitHub:
+    """GitHub REST endpoints used by enrichment, with generous rate-limit headers."""
+
+    def __init__(self, repos_per_user: int = 10):
+        self.repos_per_user = repos_per_user
+        self.calls: Counter = Counter()
+
+    def __call__(self, request: StubRequest) -> StubResponse:
+        if request.path == "/__stats":
+            return _stats(self.calls, request)
+        headers = {
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": "4999",
+            "X-RateLimit-Reset": str(int(time.time()) + 3600),
+        }
+        parts = request.path.strip("/").split("/")
+        if parts[0] == "users" and len(parts) == 3 and parts[2] == "repos":
+            self.calls["/users/{user}/repos"] += 1
+            return StubResponse(body=self._repos(parts[1]), headers=headers)
+        if parts[0] == "users" and len(parts) == 2:
+            self.calls["/users/{user}"] += 1
+            return StubResponse(body={"login": parts[1], "public_repos": self.repos_per_user}, headers=headers)
+        if parts[0] == "repos" and len(parts) == 4 and parts[3] == "languages":
+            self.calls["/repos/{owner}/{repo}/languages"] += 1
+            index = int(parts[2].rsplit("-", 1)[-1]) if parts[2][-1].isdigit() else 0
+            return StubResponse(body={TECHS[index % len(TECHS)]: 10_000 + index}, headers=headers)
+        self.calls["404"] += 1
+        return StubResponse(status=404, body={"message": "Not Found"}, headers=headers)
+
+    def _repos(self, username: str) -> list[dict]:
+        return [
+            {
+                "name": f"repo-{i}",
+                "full_name": f"{username}/repo-{i}",
+                "description": "stub repository",
+                "language": TECHS[(len(username) + i) % len(TECHS)],
+                "stargazers_count": i,
+                "html_url": f"https://github.com/{username}/repo-{i}",
+                "pushed_at": "2026-01-01T00:00:00Z",
+            }
+            for i in range(self.repos_per_user)
+        ]
+
+
+def _stats(calls: Counter, request: StubRequest) -> StubResponse:
+    body = dict(calls)
+    if request.query.get("reset") == ["1"]:
+        calls.clear()
+    return StubResponse(body=body)
+
+
+# ── Child process ────────────────────────────────────────────────
+
+
+def _serve(conn, users: int, seed: int, jwt_secret: str, supabase_latency: float, github_latency: float) -> None:
+    async def run() -> None:
+        supabase = await StubServer(
+            FakeSupabase(seed_users(users, seed), jwt_secret), latency=supabase_latency
+        ).start()
+        github = await StubServer(FakeGitHub(), latency=github_latency).start()
+        conn.send((supabase.url, github.url))
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+def serve_in_subprocess(
+    users: int,
+    seed: int,
+    jwt_secret: str,
+    supabase_latency: float = 0.0,
+    github_latency: float = 0.0,
+) -> tuple[multiprocessing.Process, str, str]:
+    """Start both fakes in a child process; returns (process, supabase_url, github_url)."""
+    ctx = multiprocessing.get_context("spawn")
+    parent, child = ctx.Pipe()
+    process = ctx.Process(
+        target=_serve,
+        args=(child, users, seed, jwt_secret, supabase_latency, github_latency),
+        daemon=True,
+    )
+    process.start()
+    supabase_url, github_url = parent.recv()
+    return process, supabase_url, github_url
+
+
+def fetch_stats(url: str, reset: bool = False) -> dict[str, int]:
+    import httpx
+
+    return httpx.get(f"{url}/__stats", params={"reset": "1"} if reset else None).json()
+
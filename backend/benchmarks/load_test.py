@@ -0,0 +1,332 @@
+"""Load test of the API against local Supabase and GitHub stand-ins.
+
+Starts the fakes from `benchmarks.fake_services` in a child process
+(with optional injected latency), points the app at them, runs its
+lifespan and drives it in-process through httpx's ASGI transport with
+`--concurrency` workers per scenario:
+
+  auth_me              GET /api/v1/auth/me (local JWT verification + profile cache)
+  auth_me_strict       the same with AUTH_VERIFY_MODE=strict (GoTrue /user per call)
+  discover             GET /api/v1/profiles/ anonymous, sometimes tech-filtered
+  discover_viewer      the same signed in (self and seen-set filtering)
+  profile_by_username  GET /api/v1/profiles/{username}, Zipf-distributed usernames
+  oauth_callback       POST /api/v1/auth/callback (code exchange + enrichment enqueue)
+  enrichment           ProfileService.enrich_from_github (GitHub fetch + profile write)
+
+For each it reports throughput, p50/p95/p99 latency, errors and upstream
+calls per operation, and compares with the stored baseline. Baselines
+are machine-specific: record one on the machine that will run the check,
+and use --repeat 3 for both, since single runs vary by 20% or more.
+
+    cd backend
+    python -m benchmarks.load_test                          # compare with the baseline
+    python -m benchmarks.load_test --scenarios discover auth_me --duration 10
+    python -m benchmarks.load_test --supabase-latency-ms 20 --github-latency-ms 80
+    python -m benchmarks.load_test --repeat 3 --save-baseline   # record a new baseline
+    python -m benchmarks.load_test --repeat 3 --check           # exit 1 on regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import httpx
+
+from benchmarks.fake_services import access_token, fetch_stats, seed_users, serve_in_subprocess
+
+JWT_SECRET = "load-test-jwt-secret-with-enough-bytes"
+BASELINE = Path(__file__).resolve().parent / "baselines" / "load_test.json"
+TECH_FILTERS = [None, None, None, ["Python"], ["Go", "Rust"]]
+
+
+@dataclass
+class World:
+    """The seeded users as seen from the load generator."""
+
+    users: list[dict]
+    tokens: list[str]
+    rng: random.Random = field(default_factory=lambda: random.Random(3))
+
+    def user_index(self) -> int:
+        return self.rng.randrange(len(self.users))
+
+    def popular_index(self) -> int:
+        """Zipf-ish: a few profiles get most of the lookups."""
+        return min(int(self.rng.paretovariate(1.1)) - 1, len(self.users) - 1)
+
+
+Operation = Callable[[httpx.AsyncClient, World], Awaitable[int]]
+
+
+def _bearer(world: World, index: int) -> dict[str, str]:
+    return {"Authorization": f"Bearer {world.tokens[index]}"}
+
+
+async def auth_me(client: httpx.AsyncClient, world: World) -> int:
+    return (await client.get("/api/v1/auth/me", headers=_bearer(world, world.user_index()))).status_code
+
+
+async def discover(client: httpx.AsyncClient, world: World) -> int:
+    params: dict = {"limit": 20}
+    techs = world.rng.choice(TECH_FILTERS)
+    if techs:
+        params["tech"] = techs
+        params["match"] = "any"
+    return (await client.get("/api/v1/profiles/", params=params)).status_code
+
+
+async def discover_viewer(client: httpx.AsyncClient, world: World) -> int:
+    index = world.user_index()
+    resp = await client.get("/api/v1/profiles/", params={"limit": 20}, headers=_bearer(world, index))
+    return resp.status_code
+
+
+async def profile_by_username(client: httpx.AsyncClient, world: World) -> int:
+    username = world.users[world.popular_index()]["github_username"]
+    return (await client.get(f"/api/v1/profiles/{username}")).status_code
+
+
+async def oauth_callback(client: httpx.AsyncClient, world: World) -> int:
+    code = world.users[world.user_index()]["code"]
+    return (await client.post("/api/v1/auth/callback", json={"code": code})).status_code
+
+
+async def enrichment(client: httpx.AsyncClient, world: World) -> int:
+    from app.services.profile_service import ProfileService
+
+    user = world.users[world.user_index()]
+    await ProfileService.enrich_from_github(user["id"], user["github_username"])
+    return 200
+
+
+SCENARIOS: dict[str, Operation] = {
+    "auth_me": auth_me,
+    "auth_me_strict": auth_me,
+    "discover": discover,
+    "discover_viewer": discover_viewer,
+    "profile_by_username": profile_by_username,
+    "oauth_callback": oauth_callback,
+    "enrichment": enrichment,
+}
+
+
+@dataclass
+class Result:
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    upstream_per_op: dict[str, float]
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    world: World,
+    operation: Operation,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    stats_urls: dict[str, str],
+) -> Result:
+    async def drive(seconds: float, latencies: list[float] | None, errors: list[int]) -> None:
+        deadline = time.perf_counter() + seconds
+
+        async def worker() -> None:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    status = await operation(client, world)
+                except Exception:
+                    status = 599
+                if latencies is not None:
+                    latencies.append(time.perf_counter() - start)
+                    if status >= 400:
+                        errors.append(status)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    await drive(warmup, None, [])
+    await asyncio.sleep(0.2)  # let background writes from the warm-up settle
+    for url in stats_urls.values():
+        await asyncio.to_thread(fetch_stats, url, True)
+
+    latencies: list[float] = []
+    errors: list[int] = []
+    start = time.perf_counter()
+    await drive(duration, latencies, errors)
+    elapsed = time.perf_counter() - start
+
+    upstream: dict[str, float] = {}
+    for service, url in stats_urls.items():
+        for endpoint, count in (await asyncio.to_thread(fetch_stats, url, True)).items():
+            upstream[f"{service} {endpoint}"] = round(count / max(len(latencies), 1), 3)
+
+    latencies.sort()
+    return Result(
+        requests=len(latencies),
+        errors=len(errors),
+        rps=round(len(latencies) / elapsed, 1),
+        p50_ms=round(_percentile(latencies, 0.50) * 1e3, 2),
+        p95_ms=round(_percentile(latencies, 0.95) * 1e3, 2),
+        p99_ms=round(_percentile(latencies, 0.99) * 1e3, 2),
+        upstream_per_op=dict(sorted(upstream.items())),
+    )
+
+
+def _configure_app(supabase_url: str, github_url: str) -> None:
+    """Point the app's settings at the fakes; must run before `import main`."""
+    os.environ.update({
+        "SUPABASE_URL": supabase_url,
+        "SUPABASE_KEY": "anon-key",
+        "SUPABASE_SERVICE_KEY": "service-role-key",
+        "SUPABASE_JWT_SECRET": JWT_SECRET,
+        "SUPABASE_JWKS_URL": f"{supabase_url}/auth/v1/.well-known/jwks.json",
+        "AUTH_VERIFY_MODE": "local",
+        "GITHUB_API_URL": github_url,
+        "GITHUB_TOKENS": "load-test-token-1,load-test-token-2",
+        "GITHUB_HTTP2": "false",
+        "CACHE_BACKEND": "memory",
+        "PUBSUB_BACKEND": "memory",
+    })
+
+
+def _compare(name: str, result: Result, baseline: dict | None, tolerance: float) -> list[str]:
+    """Regressions of `result` against its baseline entry, beyond `tolerance`."""
+    if not baseline:
+        return []
+    problems = []
+    if result.rps < baseline["rps"] * (1 - tolerance):
+        problems.append(f"{name}: throughput {result.rps:.0f}/s vs baseline {baseline['rps']:.0f}/s")
+    # p99 is reported but not gated: a few hundred samples make it too noisy.
+    if result.p95_ms > baseline["p95_ms"] * (1 + tolerance):
+        problems.append(f"{name}: p95 {result.p95_ms:.1f}ms vs baseline {baseline['p95_ms']:.1f}ms")
+    if result.errors and not baseline.get("errors"):
+        problems.append(f"{name}: {result.errors} errors (baseline had none)")
+    return problems
+
+
+def _delta(value: float, base: float | None) -> str:
+    if not base:
+        return ""
+    return f"{(value - base) / base * 100:+5.0f}%"
+
+
+async def main(args: argparse.Namespace) -> int:
+    process, supabase_url, github_url = serve_in_subprocess(
+        args.users,
+        args.seed,
+        JWT_SECRET,
+        supabase_latency=args.supabase_latency_ms / 1e3,
+        github_latency=args.github_latency_ms / 1e3,
+    )
+    _configure_app(supabase_url, github_url)
+    import main as app_main
+    from app.core.config import settings
+    from app.services.profile_service import enrichment_queue
+
+    users = seed_users(args.users, args.seed)
+    world = World(users, [access_token(u, JWT_SECRET) for u in users])
+    stats_urls = {"supabase": supabase_url, "github": github_url}
+
+    baseline_doc = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    baseline = baseline_doc.get("results", {})
+    results: dict[str, Result] = {}
+    print(
+        f"{args.users:,} users, concurrency {args.concurrency}, {args.duration:g}s per scenario, "
+        f"latency supabase {args.supabase_latency_ms:g}ms github {args.github_latency_ms:g}ms"
+    )
+    print(f"{'scenario':<20} {'req':>7} {'err':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  vs baseline (req/s, p95)")
+    try:
+        transport = httpx.ASGITransport(app=app_main.app)
+        async with app_main.app.router.lifespan_context(app_main.app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://load-test") as client:
+                for name in args.scenarios:
+                    mode = settings.AUTH_VERIFY_MODE
+                    if name == "auth_me_strict":
+                        settings.AUTH_VERIFY_MODE = "strict"
+                    runs = []
+                    try:
+                        for _ in range(args.repeat):
+                            runs.append(await run_scenario(
+                                client, world, SCENARIOS[name], args.concurrency,
+                                args.duration, args.warmup, stats_urls,
+                            ))
+                            # Jobs a run enqueued (oauth_callback's enrichments) would
+                            # otherwise compete with the next one.
+                            await asyncio.wait_for(enrichment_queue.join(), timeout=120)
+                    finally:
+                        settings.AUTH_VERIFY_MODE = mode
+                    result = sorted(runs, key=lambda r: r.rps)[len(runs) // 2]
+                    results[name] = result
+                    base = baseline.get(name, {})
+                    print(
+                        f"{name:<20} {result.requests:>7,} {result.errors:>5} {result.rps:>8,.0f} "
+                        f"{result.p50_ms:>8.2f} {result.p95_ms:>8.2f} {result.p99_ms:>8.2f}  "
+                        f"{_delta(result.rps, base.get('rps')):>6} {_delta(result.p95_ms, base.get('p95_ms')):>6}"
+                    )
+                    if args.verbose:
+                        for endpoint, per_op in result.upstream_per_op.items():
+                            print(f"{'':<22}{endpoint}: {per_op:g} per op")
+    finally:
+        process.terminate()
+
+    if args.save_baseline:
+        BASELINE.parent.mkdir(exist_ok=True)
+        doc = {
+            "options": {
+                "users": args.users,
+                "concurrency": args.concurrency,
+                "duration": args.duration,
+                "supabase_latency_ms": args.supabase_latency_ms,
+                "github_latency_ms": args.github_latency_ms,
+            },
+            "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+            "results": {**baseline, **{name: asdict(r) for name, r in results.items()}},
+        }
+        BASELINE.write_text(json.dumps(doc, indent=2) + "\n")
+        print(f"baseline written to {BASELINE.relative_to(Path.cwd()) if BASELINE.is_relative_to(Path.cwd()) else BASELINE}")
+        return 0
+
+    options = baseline_doc.get("options", {})
+    if options and any(options.get(k) != getattr(args, k) for k in options):
+        print("note: options differ from the baseline's; comparisons are indicative only")
+    problems = [p for name, r in results.items() for p in _compare(name, r, baseline.get(name), args.tolerance)]
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    return 1 if problems and args.check else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds measured per scenario")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds before each scenario")
+    parser.add_argument("--supabase-latency-ms", type=float, default=2.0)
+    parser.add_argument("--github-latency-ms", type=float, default=20.0)
+    parser.add_argument("--repeat", type=int, default=1, help="runs per scenario; the median by throughput is kept")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="exit 1 when a scenario regressed")
+    parser.add_argument("--verbose", "-v", action="store_true", help="also print upstream calls per operation")
+    sys.exit(asyncio.run(main(parser.parse_args())))
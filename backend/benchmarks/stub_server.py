@@ -0,0 +1,198 @@
+"""Minimal in-process HTTP/1.1 server used as a stand-in for remote APIs.
+
+Supports keep-alive, optional TLS and injected latency, and counts accepted
+connections so benchmarks can report how many handshakes a client paid for.
+It can run on the caller's event loop (`await server.start()`) or on a
+background thread (`server.start_in_thread()`) for synchronous clients.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import inspect
+import json
+import ssl
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Union
+from urllib.parse import parse_qs, urlsplit
+
+
+@dataclass
+class StubRequest:
+    method: str
+    path: str
+    query: dict[str, list[str]]
+    headers: dict[str, str]
+    body: bytes
+
+    def json(self):
+        return json.loads(self.body or b"null")
+
+
+@dataclass
+class StubResponse:
+    status: int = 200
+    body: object = None
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+Handler = Callable[[StubRequest], Union[StubResponse, Awaitable[StubResponse]]]
+
+_REASONS = {200: "OK", 201: "Created", 204: "No Content", 304: "Not Modified",
+            400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+            404: "Not Found", 406: "Not Acceptable", 429: "Too Many Requests"}
+
+
+def self_signed_context() -> tuple[ssl.SSLContext, ssl.SSLContext]:
+    """Return (server, client) SSL contexts for a throwaway localhost cert."""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName([x509.DNSName("localhost")]), critical=False
+        )
+        .sign(key, hashes.SHA256())
+    )
+    with tempfile.NamedTemporaryFile("wb", suffix=".pem", delete=False) as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+        f.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+        pem = f.name
+
+    server_ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    server_ctx.load_cert_chain(pem)
+    client_ctx = ssl.create_default_context(cafile=pem)
+    return server_ctx, client_ctx
+
+
+class StubServer:
+    """Serves `handler` on 127.0.0.1 with an optional per-request delay."""
+
+    def __init__(
+        self,
+        handler: Handler,
+        latency: float = 0.0,
+        ssl_context: ssl.SSLContext | None = None,
+    ):
+        self.handler = handler
+        self.latency = latency
+        self.ssl_context = ssl_context
+        self.connections = 0
+        self.requests = 0
+        self._server: asyncio.base_events.Server | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self.port = 0
+
+    @property
+    def url(self) -> str:
+        scheme = "https" if self.ssl_context else "http"
+        host = "localhost" if self.ssl_context else "127.0.0.1"
+        return f"{scheme}://{host}:{self.port}"
+
+    async def start(self) -> "StubServer":
+        self._server = await asyncio.start_server(
+            self._serve, "127.0.0.1", 0, ssl=self.ssl_context
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def start_in_thread(self) -> "StubServer":
+        ready = threading.Event()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop_thread(self) -> None:
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()  # type: ignore[union-attr]
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = lines[0].split(" ", 2)
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        k, v = line.split(":", 1)
+                        headers[k.strip().lower()] = v.strip()
+                body = b""
+                if "content-length" in headers:
+                    body = await reader.readexactly(int(headers["content-length"]))
+
+                parts = urlsplit(target)
+                request = StubRequest(
+                    method, parts.path, parse_qs(parts.query), headers, body
+                )
+                self.requests += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                response = self.handler(request)
+                if inspect.isawaitable(response):
+                    response = await response
+
+                writer.write(self._encode(response))
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _encode(response: StubResponse) -> bytes:
+        if response.body is None:
+            payload = b""
+        elif isinstance(response.body, bytes):
+            payload = response.body
+        else:
+            payload = json.dumps(response.body).encode()
+        headers = {"content-type": "application/json", **response.headers}
+        headers["content-length"] = str(len(payload))
+        reason = _REASONS.get(response.status, "OK")
+        head = f"HTTP/1.1 {response.status} {reason}\r\n" + "".join(
+            f"{k}: {v}\r\n" for k, v in headers.items()
+        )
+        return head.encode("latin-1") + b"\r\n" + payload
@@ -1,12 +1,57 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1 import auth, matches, chat, profiles
-from app.infrastructure.supabase_client import supabase
+from fastapi.responses import JSONResponse
+from app.api import health, metrics
+from app.api.v1 import auth, matches, chat, leaderboard, profiles
+from app.core.config import settings
+from app.core.middleware import MetricsMiddleware
+from app.infrastructure import github_client, supabase_client, supabase_repository
+from app.infrastructure.geo_index import geo_index
+from app.infrastructure.leaderboard import leaderboard as leaderboard_index
+from app.infrastructure.seen_set import seen_set
+from app.services.chat_hub import chat_hub
+from app.services.chat_service import message_writer
+from app.services.health_service import health_monitor
+from app.services.matching_service import pool_refresh_queue
+from app.services.profile_service import enrichment_queue
+from app.services.swipe_service import swipe_writer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await github_client.startup()
+    await enrichment_queue.start()
+    await pool_refresh_queue.start()
+    await message_writer.start()
+    await swipe_writer.start()
+    await seen_set.start()
+    await leaderboard_index.start()
+    await chat_hub.start()
+    if settings.SUPABASE_WARM_ON_STARTUP:
+        supabase_client.warm_up_in_background()
+    await health_monitor.start()
+    yield
+    await health_monitor.stop()
+    await chat_hub.stop()
+    await leaderboard_index.stop()
+    await swipe_writer.stop()
+    await seen_set.stop()
+    await message_writer.stop()
+    await geo_index.stop()
+    await pool_refresh_queue.stop()
+    await enrichment_queue.stop()
+    await github_client.shutdown()
+    supabase_repository.shutdown()
+    supabase_client.clients.close()
+
 
 app = FastAPI(
     title="Dev Dating API",
     description="Backend API for developer dating app",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -17,31 +62,24 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 # Include routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(profiles.router, prefix="/api/v1/profiles", tags=["profiles"])
 app.include_router(matches.router, prefix="/api/v1/matches", tags=["matches"])
 app.include_router(chat.router, prefix="/api/v1/chat", tags=["chat"])
+app.include_router(leaderboard.router, prefix="/api/v1/leaderboard", tags=["leaderboard"])
+app.include_router(health.router, tags=["health"])
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
+
+
+@app.exception_handler(supabase_repository.QueryTimeoutError)
+async def query_timeout_handler(request: Request, exc: Exception):
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
 
 
 @app.get("/")
 async def root():
     return {"message": "Dev Dating API is running"}
-
-
-@app.get("/health")
-async def health_check():
-    """Health check that also verifies the Supabase connection."""
-    try:
-        # Try a lightweight query to confirm Supabase is reachable
-        result = supabase.table("_health_check").select("*").limit(1).execute()
-        supabase_status = "connected"
-    except Exception as e:
-        # Even if the table doesn't exist, a 404/relation error means Supabase IS reachable
-        error_msg = str(e)
-        if "relation" in error_msg or "does not exist" in error_msg:
-            supabase_status = "connected"
-        else:
-            supabase_status = f"error: {error_msg}"
-    return {"status": "healthy", "supabase": supabase_status}
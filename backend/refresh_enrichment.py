@@ -0,0 +1,59 @@
+"""Re-enrich stale profiles from GitHub (run from cron or a scheduled job).
+
+    cd backend
+    python refresh_enrichment.py                  # resume or start a pass
+    python refresh_enrichment.py --restart --max-age-hours 24
+    python refresh_enrichment.py --limit 1000 --dry-run
+
+An interrupted run resumes from the checkpoint file on the next start.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from datetime import timedelta
+
+from app.core.config import settings
+from app.infrastructure import github_client, supabase_client, supabase_repository
+from app.services.enrichment_refresh import EnrichmentRefresher
+
+
+async def main(args: argparse.Namespace) -> None:
+    refresher = EnrichmentRefresher(
+        checkpoint_path=args.checkpoint,
+        max_age=timedelta(hours=args.max_age_hours),
+        page_size=args.page_size,
+        concurrency=args.concurrency,
+        max_profiles=args.limit,
+        dry_run=args.dry_run,
+    )
+    if settings.CACHE_BACKEND != "redis" and not args.dry_run:
+        logging.warning(
+            "CACHE_BACKEND=%s: API workers keep cached copies of refreshed "
+            "profiles for up to %gs; use redis to invalidate them immediately",
+            settings.CACHE_BACKEND,
+            settings.PROFILE_CACHE_TTL_SECONDS,
+        )
+    await github_client.startup()
+    try:
+        stats = await refresher.run(resume=not args.restart)
+    finally:
+        await github_client.shutdown()
+        supabase_repository.shutdown()
+        supabase_client.clients.close()
+    print(" ".join(f"{k}={v}" for k, v in stats.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-age-hours", type=float, default=settings.ENRICH_REFRESH_MAX_AGE_HOURS)
+    parser.add_argument("--page-size", type=int, default=settings.ENRICH_REFRESH_PAGE_SIZE)
+    parser.add_argument("--concurrency", type=int, default=settings.ENRICH_REFRESH_CONCURRENCY)
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many profiles")
+    parser.add_argument("--checkpoint", default=settings.ENRICH_REFRESH_CHECKPOINT)
+    parser.add_argument("--restart", action="store_true", help="ignore any saved checkpoint")
+    parser.add_argument("--dry-run", action="store_true", help="fetch and compare, write nothing")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,8 @@
+-- ============================================================
+-- DevDate: GitHub enrichment — weighted tech stack
+-- ============================================================
+
+-- Language -> byte count across the user's recent repos, written when
+-- ENRICH_LANGUAGE_BYTES is on. tech_stack stays the ordered language list.
+alter table public.profiles
+  add column if not exists tech_weights jsonb default '{}';
@@ -0,0 +1,13 @@
+-- ============================================================
+-- DevDate: Indexes for match candidate generation
+-- ============================================================
+
+-- tech_stack && '{...}' (candidate source: shared technologies)
+create index if not exists idx_profiles_tech_stack
+  on public.profiles using gin (tech_stack);
+
+-- xp between a and b (candidate source: similar experience)
+create index if not exists idx_profiles_xp on public.profiles(xp);
+
+-- updated_at > last sync (incremental pool refresh)
+create index if not exists idx_profiles_updated_at on public.profiles(updated_at);
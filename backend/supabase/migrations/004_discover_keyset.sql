@@ -0,0 +1,78 @@
+-- ============================================================
+-- DevDate: Keyset-paginated discovery
+-- ============================================================
+
+-- Stable feed order: newest first, id as tie-breaker.
+create index if not exists idx_profiles_created_id
+  on public.profiles (created_at desc, id desc);
+
+-- Spatial index for the radius queries below.
+create index if not exists idx_profiles_location
+  on public.profiles using gist (location);
+
+-- ── nearby_profiles: caller-controlled result cap ──────────
+-- Same contract as before (returns whole rows, nearest first) but the
+-- hard-coded `limit 50` becomes `max_results`, defaulting to 50.
+drop function if exists public.nearby_profiles(double precision, double precision, double precision, text);
+
+create or replace function public.nearby_profiles(
+  lat double precision,
+  lng double precision,
+  radius_km double precision default 50,
+  filter_tech text default null,
+  max_results integer default 50
+)
+returns setof public.profiles as $$
+begin
+  return query
+    select *
+    from public.profiles p
+    where
+      p.location is not null
+      and ST_DWithin(
+        p.location,
+        ST_SetSRID(ST_MakePoint(lng, lat), 4326)::geography,
+        radius_km * 1000
+      )
+      and (filter_tech is null or filter_tech = any(p.tech_stack))
+    order by p.location <-> ST_SetSRID(ST_MakePoint(lng, lat), 4326)::geography
+    limit least(max_results, 1000);
+end;
+$$ language plpgsql security definer;
+
+-- ── nearby_profiles_page: keyset page of (id, distance) ────
+-- Pages by (distance_m, id) so deep pages cost the same as the first.
+-- Returns ids only; the API fetches the projected columns it needs.
+-- The cap leaves room for discover's look-ahead row (and its over-fetch
+-- when skipping swiped profiles) at the API's largest page size.
+create or replace function public.nearby_profiles_page(
+  lat double precision,
+  lng double precision,
+  radius_km double precision default 50,
+  filter_techs text[] default null,
+  match_all boolean default true,
+  after_distance_m double precision default null,
+  after_id uuid default null,
+  max_results integer default 20
+)
+returns table (id uuid, distance_m double precision) as $$
+  with origin as (
+    select ST_SetSRID(ST_MakePoint(lng, lat), 4326)::geography as g
+  )
+  select p.id, ST_Distance(p.location, origin.g) as distance_m
+  from public.profiles p, origin
+  where
+    p.location is not null
+    and ST_DWithin(p.location, origin.g, radius_km * 1000)
+    and (
+      filter_techs is null
+      or (match_all and p.tech_stack @> filter_techs)
+      or (not match_all and p.tech_stack && filter_techs)
+    )
+    and (
+      after_distance_m is null
+      or (ST_Distance(p.location, origin.g), p.id) > (after_distance_m, after_id)
+    )
+  order by distance_m, p.id
+  limit least(max_results, 500);
+$$ language sql stable security definer;
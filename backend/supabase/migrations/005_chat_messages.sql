@@ -0,0 +1,115 @@
+-- ============================================================
+-- DevDate: Chat messages
+-- ============================================================
+-- A conversation is an accepted connection; messages hang off
+-- connections.id. History is read with a (created_at, id) keyset, so
+-- the composite index keeps every page an index range scan no matter
+-- how long the conversation is.
+
+create table if not exists public.messages (
+  id               uuid primary key,  -- generated by the API before the batched insert
+  conversation_id  uuid references public.connections(id) on delete cascade not null,
+  sender_id        uuid references public.profiles(id) on delete cascade not null,
+  content          text not null check (char_length(content) between 1 and 4000),
+  created_at       timestamptz not null default now()
+);
+
+create index if not exists idx_messages_conversation_created
+  on public.messages (conversation_id, created_at desc, id desc);
+
+alter table public.messages enable row level security;
+
+-- Participants of an accepted connection can read its messages
+create policy "messages_select_participant"
+  on public.messages for select
+  using (
+    exists (
+      select 1 from public.connections c
+      where c.id = conversation_id
+        and c.status = 'accepted'
+        and auth.uid() in (c.requester_id, c.target_id)
+    )
+  );
+
+-- Participants can only post as themselves
+create policy "messages_insert_participant"
+  on public.messages for insert
+  with check (
+    auth.uid() = sender_id
+    and exists (
+      select 1 from public.connections c
+      where c.id = conversation_id
+        and c.status = 'accepted'
+        and auth.uid() in (c.requester_id, c.target_id)
+    )
+  );
+
+
+-- ── Read markers (unread counts) ───────────────────────────
+create table if not exists public.conversation_reads (
+  conversation_id  uuid references public.connections(id) on delete cascade not null,
+  user_id          uuid references public.profiles(id) on delete cascade not null,
+  last_read_at     timestamptz not null default now(),
+  primary key (conversation_id, user_id)
+);
+
+alter table public.conversation_reads enable row level security;
+
+create policy "conversation_reads_own"
+  on public.conversation_reads for all
+  using (auth.uid() = user_id)
+  with check (auth.uid() = user_id);
+
+
+-- ── conversation_summaries: inbox in one round-trip ─────────
+-- Every accepted connection of the user with the other participant, the
+-- latest message and the number of messages from the other side since
+-- the user's read marker (capped at 100). Each lateral subquery is a
+-- short range scan on idx_messages_conversation_created.
+create or replace function public.conversation_summaries(
+  p_user_id uuid,
+  max_results integer default 50
+)
+returns table (
+  conversation_id    uuid,
+  other_user_id      uuid,
+  last_message_id    uuid,
+  last_sender_id     uuid,
+  last_content       text,
+  last_message_at    timestamptz,
+  unread_count       integer
+) as $$
+  select
+    c.id,
+    case when c.requester_id = p_user_id then c.target_id else c.requester_id end,
+    m.id,
+    m.sender_id,
+    m.content,
+    m.created_at,
+    coalesce(u.n, 0)::integer
+  from public.connections c
+  left join public.conversation_reads r
+    on r.conversation_id = c.id and r.user_id = p_user_id
+  left join lateral (
+    select id, sender_id, content, created_at
+    from public.messages
+    where conversation_id = c.id
+    order by created_at desc, id desc
+    limit 1
+  ) m on true
+  left join lateral (
+    select count(*) as n
+    from (
+      select 1
+      from public.messages
+      where conversation_id = c.id
+        and sender_id <> p_user_id
+        and created_at > coalesce(r.last_read_at, '-infinity'::timestamptz)
+      limit 100  -- clients show "99+"; keeps the count bounded
+    ) unread
+  ) u on true
+  where c.status = 'accepted'
+    and p_user_id in (c.requester_id, c.target_id)
+  order by coalesce(m.created_at, c.updated_at) desc
+  limit max_results;
+$$ language sql stable;
@@ -0,0 +1,89 @@
+-- ============================================================
+-- DevDate: Swipes and mutual matches
+-- ============================================================
+-- One row per (swiper, target); re-swiping overwrites the direction, so
+-- client retries and batch replays are idempotent. The API writes
+-- swipes in batches through record_swipes() and detects mutual likes in
+-- memory; record_swipes() also creates any match the API could not see
+-- (both likes landing on different workers at once).
+
+create table if not exists public.swipes (
+  swiper_id   uuid references public.profiles(id) on delete cascade not null,
+  target_id   uuid references public.profiles(id) on delete cascade not null,
+  direction   text not null check (direction in ('like', 'pass')),
+  created_at  timestamptz not null default now(),
+  primary key (swiper_id, target_id),
+  check (swiper_id <> target_id)
+);
+
+-- "Who liked me": loads the API's reverse-like index for a user.
+create index if not exists idx_swipes_likes_received
+  on public.swipes (target_id, swiper_id) where direction = 'like';
+
+alter table public.swipes enable row level security;
+
+-- Users can see their own swipes (never who passed on them)
+create policy "swipes_select_own"
+  on public.swipes for select
+  using (auth.uid() = swiper_id);
+
+
+-- ── One connection per pair of users ───────────────────────
+create unique index if not exists idx_connections_pair
+  on public.connections (least(requester_id, target_id), greatest(requester_id, target_id));
+
+
+-- ── create_mutual_connection: idempotent match ─────────────
+-- Accepts an existing request between the pair, or creates an accepted
+-- connection; returns the row either way.
+create or replace function public.create_mutual_connection(
+  p_requester uuid,
+  p_target uuid
+)
+returns setof public.connections as $$
+  insert into public.connections (requester_id, target_id, status)
+  values (p_requester, p_target, 'accepted')
+  on conflict ((least(requester_id, target_id)), (greatest(requester_id, target_id)))
+  do update set status = 'accepted'
+  returning *;
+$$ language sql volatile security definer;
+
+
+-- ── record_swipes: batched upsert ──────────────────────────
+-- p_swipes is a JSON array of {swiper_id, target_id, direction, created_at}.
+-- Swipes on deleted profiles are dropped instead of failing the batch;
+-- the latest swipe wins when a pair appears twice.
+create or replace function public.record_swipes(p_swipes jsonb)
+returns integer as $$
+declare
+  written integer;
+begin
+  insert into public.swipes (swiper_id, target_id, direction, created_at)
+  select distinct on (s.swiper_id, s.target_id)
+    s.swiper_id, s.target_id, s.direction, s.created_at
+  from jsonb_to_recordset(p_swipes)
+    as s(swiper_id uuid, target_id uuid, direction text, created_at timestamptz)
+  join public.profiles p on p.id = s.target_id
+  where s.swiper_id <> s.target_id
+  order by s.swiper_id, s.target_id, s.created_at desc
+  on conflict (swiper_id, target_id)
+  do update set direction = excluded.direction, created_at = excluded.created_at;
+  get diagnostics written = row_count;
+
+  -- Backstop for mutual likes the API's in-memory index missed.
+  insert into public.connections (requester_id, target_id, status)
+  select distinct o.swiper_id, s.swiper_id, 'accepted'
+  from jsonb_to_recordset(p_swipes) as s(swiper_id uuid, target_id uuid, direction text)
+  join public.swipes o
+    on o.swiper_id = s.target_id and o.target_id = s.swiper_id and o.direction = 'like'
+  where s.direction = 'like'
+  on conflict ((least(requester_id, target_id)), (greatest(requester_id, target_id)))
+  do nothing;
+
+  return written;
+end;
+$$ language plpgsql volatile security definer;
+
+-- Service-role only: these bypass RLS.
+revoke execute on function public.create_mutual_connection(uuid, uuid) from public, anon, authenticated;
+revoke execute on function public.record_swipes(jsonb) from public, anon, authenticated;
@@ -0,0 +1,22 @@
+-- ============================================================
+-- DevDate: Persisted seen-set filters
+-- ============================================================
+-- The API keeps a per-user Bloom filter of swiped profiles in memory
+-- and checkpoints it here. A worker that doesn't have a user's filter
+-- loads this row and replays swipes newer than synced_at; without a row
+-- it rebuilds the filter from `swipes`.
+
+create table if not exists public.seen_filters (
+  user_id     uuid primary key references public.profiles(id) on delete cascade,
+  filter      bytea not null,
+  item_count  integer not null default 0,
+  synced_at   timestamptz not null,  -- swipes after this are not in `filter`
+  updated_at  timestamptz not null default now()
+);
+
+alter table public.seen_filters enable row level security;
+-- No policies: only the service role reads or writes filters.
+
+-- Replaying a user's recent swipes on load.
+create index if not exists idx_swipes_swiper_created
+  on public.swipes (swiper_id, created_at);
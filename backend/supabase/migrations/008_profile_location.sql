@@ -0,0 +1,110 @@
+-- ============================================================
+-- DevDate: Profile location write path and geo-index loading
+-- ============================================================
+-- The API writes location_lat/location_lng (ProfileUpdateRequest); the
+-- PostGIS `location` column the radius queries use is derived from them
+-- by a trigger, so every writer keeps the two in step.
+
+create extension if not exists postgis;
+
+alter table public.profiles add column if not exists location_lat float8;
+alter table public.profiles add column if not exists location_lng float8;
+alter table public.profiles add column if not exists location geography(Point, 4326);
+
+alter table public.profiles drop constraint if exists profiles_location_range;
+alter table public.profiles add constraint profiles_location_range check (
+  (location_lat is null or location_lat between -90 and 90)
+  and (location_lng is null or location_lng between -180 and 180)
+);
+
+-- ── sync_profile_location() ────────────────────────────────
+create or replace function public.sync_profile_location()
+returns trigger as $$
+begin
+  if new.location_lat is null or new.location_lng is null then
+    new.location := null;
+  else
+    new.location := ST_SetSRID(ST_MakePoint(new.location_lng, new.location_lat), 4326)::geography;
+  end if;
+  return new;
+end;
+$$ language plpgsql;
+
+drop trigger if exists profiles_sync_location on public.profiles;
+create trigger profiles_sync_location
+  before insert or update of location_lat, location_lng on public.profiles
+  for each row execute function public.sync_profile_location();
+
+-- Backfill rows written before the trigger existed.
+update public.profiles
+set location = ST_SetSRID(ST_MakePoint(location_lng, location_lat), 4326)::geography
+where location_lat is not null and location_lng is not null and location is null;
+
+create index if not exists idx_profiles_location
+  on public.profiles using gist (location);
+
+
+-- ── nearby_profiles_page: sphere distances ─────────────────
+-- Same contract as 004, but distances are measured on the mean-radius
+-- sphere (use_spheroid => false) so they match the API's in-memory geo
+-- index and a cursor from either source pages the other. The cap stays
+-- at 500 so discover can over-fetch when it skips swiped profiles.
+create or replace function public.nearby_profiles_page(
+  lat double precision,
+  lng double precision,
+  radius_km double precision default 50,
+  filter_techs text[] default null,
+  match_all boolean default true,
+  after_distance_m double precision default null,
+  after_id uuid default null,
+  max_results integer default 20
+)
+returns table (id uuid, distance_m double precision) as $$
+  with origin as (
+    select ST_SetSRID(ST_MakePoint(lng, lat), 4326)::geography as g
+  )
+  select p.id, ST_Distance(p.location, origin.g, false) as distance_m
+  from public.profiles p, origin
+  where
+    p.location is not null
+    and ST_DWithin(p.location, origin.g, radius_km * 1000, false)
+    and (
+      filter_techs is null
+      or (match_all and p.tech_stack @> filter_techs)
+      or (not match_all and p.tech_stack && filter_techs)
+    )
+    and (
+      after_distance_m is null
+      or (ST_Distance(p.location, origin.g, false), p.id) > (after_distance_m, after_id)
+    )
+  order by distance_m, p.id
+  limit least(max_results, 500);
+$$ language sql stable security definer;
+
+
+-- ── profile_points_in_box: warm the API's geo index ────────
+-- Every located profile inside a lat/lng box, keyset-paged by id.
+create or replace function public.profile_points_in_box(
+  min_lat double precision,
+  min_lng double precision,
+  max_lat double precision,
+  max_lng double precision,
+  after_id uuid default null,
+  max_results integer default 1000
+)
+returns table (
+  id uuid,
+  location_lat double precision,
+  location_lng double precision,
+  tech_stack text[]
+) as $$
+  select p.id, p.location_lat, p.location_lng, p.tech_stack
+  from public.profiles p
+  where
+    p.location && ST_MakeEnvelope(min_lng, min_lat, max_lng, max_lat, 4326)::geography
+    and p.location_lat between min_lat and max_lat
+    and p.location_lng between min_lng and max_lng
+    and (after_id is null or p.id > after_id)
+  order by p.id
+  limit least(max_results, 5000);
+$$ language sql stable security definer;
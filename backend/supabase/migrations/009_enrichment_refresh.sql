@@ -0,0 +1,101 @@
+-- ============================================================
+-- DevDate: Scheduled GitHub re-enrichment
+-- ============================================================
+-- The refresher (refresh_enrichment.py) walks profiles stalest first,
+-- re-derives github_repos / tech_stack / tech_weights, and writes back
+-- only rows whose content hash changed. Unchanged rows just get a new
+-- enriched_at so they move to the back of the queue.
+
+alter table public.profiles add column if not exists enriched_at timestamptz;
+alter table public.profiles add column if not exists enrichment_hash text;
+
+-- Stalest first; never-enriched (null) rows sort before everything.
+create index if not exists idx_profiles_enriched_at
+  on public.profiles ((coalesce(enriched_at, '-infinity'::timestamptz)), id);
+
+
+-- ── set_profile_updated_at() ───────────────────────────────
+-- Like set_updated_at(), but refresher bookkeeping alone (enriched_at,
+-- enrichment_hash) isn't a profile change: updated_at drives ETags, so
+-- bumping it would invalidate every client's cached copy for nothing.
+create or replace function public.set_profile_updated_at()
+returns trigger as $$
+begin
+  if (to_jsonb(new) - 'updated_at' - 'enriched_at' - 'enrichment_hash')
+     is distinct from (to_jsonb(old) - 'updated_at' - 'enriched_at' - 'enrichment_hash') then
+    new.updated_at = now();
+  end if;
+  return new;
+end;
+$$ language plpgsql;
+
+-- Replaces 001's unconditional profiles_updated_at trigger; leaving it in
+-- place would still bump updated_at on every refresher write.
+drop trigger if exists profiles_updated_at on public.profiles;
+drop trigger if exists profiles_set_updated_at on public.profiles;
+create trigger profiles_set_updated_at
+  before update on public.profiles
+  for each row execute function public.set_profile_updated_at();
+
+
+-- ── stale_profiles_page: refresher keyset walk ─────────────
+-- Profiles last enriched before `stale_before` (or never), ordered by
+-- (enriched_at nulls first, id). `after_enriched_at` / `after_id` is the
+-- last row of the previous page; pass after_id = null for the first page.
+create or replace function public.stale_profiles_page(
+  stale_before timestamptz,
+  after_enriched_at timestamptz default null,
+  after_id uuid default null,
+  max_results integer default 500
+)
+returns table (
+  id uuid,
+  github_username text,
+  enriched_at timestamptz,
+  enrichment_hash text
+) as $$
+  select p.id, p.github_username, p.enriched_at, p.enrichment_hash
+  from public.profiles p
+  where coalesce(p.enriched_at, '-infinity') < stale_before
+    and (
+      after_id is null
+      or (coalesce(p.enriched_at, '-infinity'), p.id)
+         > (coalesce(after_enriched_at, '-infinity'), after_id)
+    )
+  order by coalesce(p.enriched_at, '-infinity'), p.id
+  limit least(greatest(max_results, 1), 5000);
+$$ language sql stable security definer;
+
+
+-- ── apply_profile_enrichment: batched write-back ───────────
+-- p_rows is a JSON array of {id, enriched_at, enrichment_hash?,
+-- github_repos?, tech_stack?, tech_weights?}; omitted fields keep their
+-- current value, so "unchanged" rows carry only id and enriched_at.
+create or replace function public.apply_profile_enrichment(p_rows jsonb)
+returns integer as $$
+declare
+  written integer;
+begin
+  update public.profiles p set
+    github_repos    = coalesce(r.github_repos, p.github_repos),
+    tech_stack      = coalesce(r.tech_stack, p.tech_stack),
+    tech_weights    = coalesce(r.tech_weights, p.tech_weights),
+    enrichment_hash = coalesce(r.enrichment_hash, p.enrichment_hash),
+    enriched_at     = r.enriched_at
+  from jsonb_to_recordset(p_rows) as r(
+    id uuid,
+    enriched_at timestamptz,
+    enrichment_hash text,
+    github_repos jsonb,
+    tech_stack text[],
+    tech_weights jsonb
+  )
+  where p.id = r.id;
+  get diagnostics written = row_count;
+  return written;
+end;
+$$ language plpgsql volatile security definer;
+
+-- Service-role only: these bypass RLS.
+revoke execute on function public.stale_profiles_page(timestamptz, timestamptz, uuid, integer) from public, anon, authenticated;
+revoke execute on function public.apply_profile_enrichment(jsonb) from public, anon, authenticated;
@@ -0,0 +1,30 @@
+-- ============================================================
+-- DevDate: Leaderboards — catch-up index and rank tiers
+-- ============================================================
+-- The API keeps global and per-technology leaderboards in memory. It
+-- loads them once, then catches up on profiles whose updated_at moved
+-- (XP from triggers included) and periodically reconciles in full.
+
+-- Catch-up reads: (updated_at, id) keyset from a recent mark.
+create index if not exists idx_profiles_updated_id
+  on public.profiles (updated_at, id);
+
+
+-- ── recompute_profile_ranks: tier repair ───────────────────
+-- Fixes any rank that drifted from calculate_rank(xp) (direct edits,
+-- threshold changes); rows already correct are not touched.
+create or replace function public.recompute_profile_ranks()
+returns integer as $$
+declare
+  written integer;
+begin
+  update public.profiles
+  set rank = public.calculate_rank(coalesce(xp, 0))
+  where rank is distinct from public.calculate_rank(coalesce(xp, 0));
+  get diagnostics written = row_count;
+  return written;
+end;
+$$ language plpgsql volatile security definer;
+
+-- Service-role only: bypasses RLS.
+revoke execute on function public.recompute_profile_ranks() from public, anon, authenticated;
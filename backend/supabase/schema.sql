@@ -3,6 +3,9 @@
 -- Run in Supabase SQL Editor (Dashboard > SQL > New Query)
 -- ============================================================
 
+-- PostGIS for the profile `location` column and radius queries
+create extension if not exists postgis;
+
 -- ────────────────────────────────────────────────────────────
 -- 1. PROFILES
 -- ────────────────────────────────────────────────────────────
@@ -14,10 +17,14 @@ create table if not exists public.profiles (
   avatar_url      text,
   tech_stack      text[] default '{}',
   github_repos    jsonb default '[]',
-  location_lat    float8,
-  location_lng    float8,
+  tech_weights    jsonb default '{}',
+  location_lat    float8 check (location_lat between -90 and 90),
+  location_lng    float8 check (location_lng between -180 and 180),
+  location        geography(Point, 4326),  -- kept in step with lat/lng by trigger
   xp              integer default 0,
   rank            text default 'Intern',
+  enriched_at     timestamptz,             -- last GitHub refresh (refresh_enrichment.py)
+  enrichment_hash text,                    -- hash of the derived GitHub fields
   created_at      timestamptz default now(),
   updated_at      timestamptz default now()
 );
@@ -33,6 +40,24 @@ create policy "profiles_insert_own"
 create policy "profiles_update_own"
   on public.profiles for update using (auth.uid() = id);
 
+-- Match candidate generation
+create index if not exists idx_profiles_tech_stack on public.profiles using gin (tech_stack);
+create index if not exists idx_profiles_xp on public.profiles(xp);
+create index if not exists idx_profiles_updated_at on public.profiles(updated_at);
+
+-- Keyset-paginated discovery feed
+create index if not exists idx_profiles_created_id on public.profiles (created_at desc, id desc);
+
+-- Radius queries (nearby_profiles_page) and geo-index loading
+create index if not exists idx_profiles_location on public.profiles using gist (location);
+
+-- Stalest-first GitHub re-enrichment (stale_profiles_page)
+create index if not exists idx_profiles_enriched_at
+  on public.profiles ((coalesce(enriched_at, '-infinity'::timestamptz)), id);
+
+-- Leaderboard catch-up (profiles changed since a mark)
+create index if not exists idx_profiles_updated_id on public.profiles (updated_at, id);
+
 
 -- ────────────────────────────────────────────────────────────
 -- 2. CONNECTIONS
@@ -50,6 +75,10 @@ create table if not exists public.connections (
 create index if not exists idx_connections_requester on public.connections(requester_id);
 create index if not exists idx_connections_target on public.connections(target_id);
 
+-- One connection per pair of users (mutual matches upsert on this)
+create unique index if not exists idx_connections_pair
+  on public.connections (least(requester_id, target_id), greatest(requester_id, target_id));
+
 alter table public.connections enable row level security;
 
 -- Users can see connections they are involved in
@@ -224,6 +253,103 @@ create policy "stars_delete_own"
   using (auth.uid() = user_id);
 
 
+-- ────────────────────────────────────────────────────────────
+-- 7. CHAT MESSAGES (conversation = accepted connection)
+-- ────────────────────────────────────────────────────────────
+create table if not exists public.messages (
+  id               uuid primary key,  -- generated by the API before the batched insert
+  conversation_id  uuid references public.connections(id) on delete cascade not null,
+  sender_id        uuid references public.profiles(id) on delete cascade not null,
+  content          text not null check (char_length(content) between 1 and 4000),
+  created_at       timestamptz not null default now()
+);
+
+-- Keyset-paginated history
+create index if not exists idx_messages_conversation_created
+  on public.messages (conversation_id, created_at desc, id desc);
+
+alter table public.messages enable row level security;
+
+-- Participants of an accepted connection can read its messages
+create policy "messages_select_participant"
+  on public.messages for select
+  using (
+    exists (
+      select 1 from public.connections c
+      where c.id = conversation_id
+        and c.status = 'accepted'
+        and auth.uid() in (c.requester_id, c.target_id)
+    )
+  );
+
+-- Participants can only post as themselves
+create policy "messages_insert_participant"
+  on public.messages for insert
+  with check (
+    auth.uid() = sender_id
+    and exists (
+      select 1 from public.connections c
+      where c.id = conversation_id
+        and c.status = 'accepted'
+        and auth.uid() in (c.requester_id, c.target_id)
+    )
+  );
+
+-- Read markers for unread counts
+create table if not exists public.conversation_reads (
+  conversation_id  uuid references public.connections(id) on delete cascade not null,
+  user_id          uuid references public.profiles(id) on delete cascade not null,
+  last_read_at     timestamptz not null default now(),
+  primary key (conversation_id, user_id)
+);
+
+alter table public.conversation_reads enable row level security;
+
+create policy "conversation_reads_own"
+  on public.conversation_reads for all
+  using (auth.uid() = user_id)
+  with check (auth.uid() = user_id);
+
+
+-- ────────────────────────────────────────────────────────────
+-- 8. SWIPES (written in batches via record_swipes())
+-- ────────────────────────────────────────────────────────────
+create table if not exists public.swipes (
+  swiper_id   uuid references public.profiles(id) on delete cascade not null,
+  target_id   uuid references public.profiles(id) on delete cascade not null,
+  direction   text not null check (direction in ('like', 'pass')),
+  created_at  timestamptz not null default now(),
+  primary key (swiper_id, target_id),
+  check (swiper_id <> target_id)
+);
+
+-- "Who liked me" (reverse-like index)
+create index if not exists idx_swipes_likes_received
+  on public.swipes (target_id, swiper_id) where direction = 'like';
+
+alter table public.swipes enable row level security;
+
+-- Users can see their own swipes (never who passed on them)
+create policy "swipes_select_own"
+  on public.swipes for select
+  using (auth.uid() = swiper_id);
+
+-- Replaying a user's recent swipes into their seen filter
+create index if not exists idx_swipes_swiper_created
+  on public.swipes (swiper_id, created_at);
+
+-- Checkpointed per-user Bloom filters of swiped profiles (service role only)
+create table if not exists public.seen_filters (
+  user_id     uuid primary key references public.profiles(id) on delete cascade,
+  filter      bytea not null,
+  item_count  integer not null default 0,
+  synced_at   timestamptz not null,  -- swipes after this are not in `filter`
+  updated_at  timestamptz not null default now()
+);
+
+alter table public.seen_filters enable row level security;
+
+
 -- ════════════════════════════════════════════════════════════
 -- FUNCTIONS & TRIGGERS
 -- ════════════════════════════════════════════════════════════
@@ -252,11 +378,45 @@ begin
 end;
 $$ language plpgsql;
 
+-- ── set_profile_updated_at() ───────────────────────────────
+-- Refresher bookkeeping alone (enriched_at, enrichment_hash) doesn't
+-- bump updated_at, which profile ETags are derived from.
+create or replace function public.set_profile_updated_at()
+returns trigger as $$
+begin
+  if (to_jsonb(new) - 'updated_at' - 'enriched_at' - 'enrichment_hash')
+     is distinct from (to_jsonb(old) - 'updated_at' - 'enriched_at' - 'enrichment_hash') then
+    new.updated_at = now();
+  end if;
+  return new;
+end;
+$$ language plpgsql;
+
 -- Apply updated_at triggers to all tables with that column
+drop trigger if exists profiles_updated_at on public.profiles;  -- 001's unconditional one
 drop trigger if exists profiles_set_updated_at on public.profiles;
 create trigger profiles_set_updated_at
   before update on public.profiles
-  for each row execute function public.set_updated_at();
+  for each row execute function public.set_profile_updated_at();
+
+-- ── sync_profile_location() ────────────────────────────────
+-- Derives the PostGIS `location` from location_lat/location_lng.
+create or replace function public.sync_profile_location()
+returns trigger as $$
+begin
+  if new.location_lat is null or new.location_lng is null then
+    new.location := null;
+  else
+    new.location := ST_SetSRID(ST_MakePoint(new.location_lng, new.location_lat), 4326)::geography;
+  end if;
+  return new;
+end;
+$$ language plpgsql;
+
+drop trigger if exists profiles_sync_location on public.profiles;
+create trigger profiles_sync_location
+  before insert or update of location_lat, location_lng on public.profiles
+  for each row execute function public.sync_profile_location();
 
 drop trigger if exists connections_set_updated_at on public.connections;
 create trigger connections_set_updated_at